@@ -10,12 +10,16 @@ import uvicorn
 from app.config import Config, get_config
 from app.errors.base import ApplicationError
 from app.errors.token import TokenInvalid
+from app.middlewares.compression import CompressionMiddleware
+from app.middlewares.conditional import ETagMiddleware
 from app.routes.balance import balance_router
 from app.routes.currency_exchange import currency_exchange_router
+from app.routes.dashboard import dashboard_router
 from app.routes.deposit_provider_callbacks import deposit_provider_callbacks_router
 from app.routes.deposits import deposits_router
 from app.routes.donation import donation_router
 from app.routes.entity import entity_router
+from app.routes.events import events_router
 from app.routes.fee import router as fee_router
 from app.routes.invoice import invoice_router
 from app.routes.keepz import keepz_router
@@ -33,10 +37,12 @@ from app.tasks.auto_exchange import schedule_auto_exchange
 from app.tasks.balance_reminder import schedule_balance_reminders
 from app.tasks.invoice_auto_pay import schedule_invoice_auto_pay
 from app.tasks.keepz_payments_poll import schedule_keepz_poll
+from app.tasks.notification_dispatch import schedule_notification_dispatch
 from app.tasks.stripe_entity_authorizations_charge import (
     schedule_stripe_entity_authorization_charges,
 )
 from app.tasks.stripe_payments_poll import schedule_stripe_poll
+from app.tasks.webhook_inbox import schedule_webhook_inbox
 from fastapi import FastAPI, Request
 from fastapi.exceptions import ResponseValidationError
 from fastapi.middleware.cors import CORSMiddleware
@@ -60,6 +66,10 @@ async def lifespan(app: FastAPI):
     )
     app.state.auto_exchange_task = asyncio.create_task(schedule_auto_exchange())
     app.state.balance_reminder_task = asyncio.create_task(schedule_balance_reminders())
+    app.state.notification_dispatch_task = asyncio.create_task(
+        schedule_notification_dispatch()
+    )
+    app.state.webhook_inbox_task = asyncio.create_task(schedule_webhook_inbox())
     try:
         yield
     finally:
@@ -70,6 +80,8 @@ async def lifespan(app: FastAPI):
             "stripe_entity_charge_task",
             "auto_exchange_task",
             "balance_reminder_task",
+            "notification_dispatch_task",
+            "webhook_inbox_task",
         ):
             task = getattr(app.state, task_name, None)
             if task is not None:
@@ -79,6 +91,13 @@ async def lifespan(app: FastAPI):
 
 
 app = FastAPI(title=config.app_name, version=config.app_version, lifespan=lifespan)
+app.add_middleware(ETagMiddleware)
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=config.compression_minimum_size,
+    gzip_level=config.compression_gzip_level,
+    brotli_quality=config.compression_brotli_quality,
+)
 app.add_middleware(
     CORSMiddleware,
     allow_credentials=True,
@@ -134,6 +153,7 @@ def database_exception_handler(request: Request, exc: SQLAlchemyError):
 
 app.include_router(token_router)
 app.include_router(entity_router)
+app.include_router(events_router)
 app.include_router(tag_router)
 app.include_router(transaction_router)
 app.include_router(balance_router)
@@ -150,6 +170,7 @@ app.include_router(tasks_router)
 app.include_router(fee_router)
 app.include_router(stats_router)
 app.include_router(treasury_router)
+app.include_router(dashboard_router)
 
 
 @app.middleware("http")
@@ -77,6 +77,14 @@ class Config:
     stripe_poll_interval_seconds: int = field(
         default=int(getenv("REFINANCE_STRIPE_POLL_INTERVAL_SECONDS", "60"))
     )
+    # Stripe API calls in flight at once while polling pending deposits
+    stripe_poll_concurrency: int = field(
+        default=int(getenv("REFINANCE_STRIPE_POLL_CONCURRENCY", "8"))
+    )
+    # upper bound of the per-deposit/subscription poll back-off
+    stripe_poll_max_interval_seconds: int = field(
+        default=int(getenv("REFINANCE_STRIPE_POLL_MAX_INTERVAL_SECONDS", "21600"))
+    )
     stripe_authorization_max_consecutive_errors: int = field(
         default=int(
             getenv("REFINANCE_STRIPE_AUTHORIZATION_MAX_CONSECUTIVE_ERRORS", "3")
@@ -94,6 +102,10 @@ class Config:
     stripe_entity_charge_minute: int = field(
         default=int(getenv("REFINANCE_STRIPE_ENTITY_CHARGE_MINUTE", "0"))
     )
+    # entities charged at once by the recurring entity_dynamic run
+    stripe_entity_charge_concurrency: int = field(
+        default=int(getenv("REFINANCE_STRIPE_ENTITY_CHARGE_CONCURRENCY", "8"))
+    )
     stripe_guest_charge_enabled: bool = field(
         default=_env_bool("REFINANCE_STRIPE_GUEST_CHARGE_ENABLED", True)
     )
@@ -128,6 +140,20 @@ class Config:
     donation_max_amount: Decimal = field(
         default=Decimal(getenv("REFINANCE_DONATION_MAX_AMOUNT") or "3000")
     )
+    # responses smaller than this many bytes are sent uncompressed
+    compression_minimum_size: int = field(
+        default=int(getenv("REFINANCE_COMPRESSION_MINIMUM_SIZE", "1024"))
+    )
+    compression_gzip_level: int = field(
+        default=int(getenv("REFINANCE_COMPRESSION_GZIP_LEVEL", "6"))
+    )
+    compression_brotli_quality: int = field(
+        default=int(getenv("REFINANCE_COMPRESSION_BROTLI_QUALITY", "5"))
+    )
+    # comment lines sent on idle /events streams to keep proxies from closing them
+    events_heartbeat_seconds: float = field(
+        default=float(getenv("REFINANCE_EVENTS_HEARTBEAT_SECONDS", "15"))
+    )
 
     @property
     def database_url(self) -> str:
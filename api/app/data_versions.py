@@ -0,0 +1,67 @@
+"""Per-subject data versions used to build response ETags.
+
+A version is a process-wide counter per subject (``"entity:5"``,
+``"treasury:2"``) that is bumped whenever data of that subject changes, on the
+same paths that drop the balance caches. ``ALL`` is bumped after every
+committed write, so responses that depend on arbitrary data (transaction
+pages, fees) can be versioned too.
+
+Subject bumps happen immediately and once more after the surrounding
+transaction commits, so an ETag computed while the change was still
+uncommitted never outlives it. Versions live in process memory like the
+balance and stats caches; they restart from zero with the process, which is
+why ETags also include a per-process token.
+"""
+
+import threading
+from secrets import token_hex
+
+from sqlalchemy import event
+from sqlalchemy.orm import ORMExecuteState, Session
+
+ALL = "all"
+
+_SESSION_KEY = "data_versions"
+
+
+class DataVersions:
+    boot_token: str = token_hex(4)
+    _versions: dict[str, int] = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def bump(cls, *subjects: str, db: Session | None = None) -> None:
+        """Mark *subjects* changed; with *db*, again once it commits."""
+        with cls._lock:
+            for subject in subjects:
+                cls._versions[subject] = cls._versions.get(subject, 0) + 1
+        if db is not None:
+            db.info.setdefault(_SESSION_KEY, set()).update(subjects)
+
+    @classmethod
+    def get(cls, *subjects: str) -> tuple[int, ...]:
+        with cls._lock:
+            return tuple(cls._versions.get(subject, 0) for subject in subjects)
+
+
+@event.listens_for(Session, "after_flush")
+def _remember_flush(session: Session, flush_context) -> None:
+    session.info.setdefault(_SESSION_KEY, set()).add(ALL)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _remember_statement(orm_execute_state: ORMExecuteState) -> None:
+    # bulk INSERT/UPDATE/DELETE statements bypass the flush
+    if (
+        orm_execute_state.is_insert
+        or orm_execute_state.is_update
+        or orm_execute_state.is_delete
+    ):
+        orm_execute_state.session.info.setdefault(_SESSION_KEY, set()).add(ALL)
+
+
+@event.listens_for(Session, "after_commit")
+def _bump_committed(session: Session) -> None:
+    subjects = session.info.pop(_SESSION_KEY, None)
+    if subjects:
+        DataVersions.bump(*subjects)
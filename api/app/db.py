@@ -5,7 +5,11 @@ from typing import Any, Generator, List, Type
 
 from app.config import Config, get_config
 from app.models.base import BaseModel
+from app.models.invoice_amount_option import invoice_amount_options  # noqa: F401
+from app.models.notification_outbox import NotificationOutbox  # noqa: F401
+from app.models.pos_sale import POSSale  # noqa: F401
 from app.models.stripe_authorization import StripeAuthorization  # noqa: F401
+from app.models.webhook_inbox import WebhookInbox  # noqa: F401
 from app.seeding import SEEDING
 from fastapi import Depends
 from sqlalchemy import Engine, create_engine, text
@@ -44,6 +48,7 @@ class DatabaseConnection:
     def create_tables(self) -> None:
         """Create all database tables defined in models."""
         logger.info("Creating database tables...")
+        self._create_extensions()
         BaseModel.metadata.create_all(bind=self.engine)
         # ``create_all`` skips an existing table as a unit, including indexes added
         # after that table was first deployed. Create declared indexes separately so
@@ -53,6 +58,16 @@ class DatabaseConnection:
                 index.create(bind=self.engine, checkfirst=True)
         logger.info("Database tables created.")
 
+    def _create_extensions(self) -> None:
+        """Install optional Postgres extensions some indexes depend on."""
+        if self.engine.dialect.name != "postgresql":
+            return
+        try:
+            with self.engine.begin() as conn:
+                conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+        except SQLAlchemyError as e:
+            logger.warning("pg_trgm unavailable, entity search runs unindexed: %s", e)
+
     def drop_tables(self) -> None:
         """Drop all database tables."""
         logger.info("Dropping database tables...")
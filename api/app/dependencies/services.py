@@ -33,6 +33,8 @@ class ServiceContainer:
         self._token_service = None
         self._notification_service = None
         self._entity_owed_service = None
+        self._webhook_inbox_service = None
+        self._dashboard_service = None
 
     @property
     def tag_service(self):
@@ -199,9 +201,8 @@ class ServiceContainer:
             self._stripe_authorization_service = StripeAuthorizationService(
                 db=self.db,
                 stripe_service=self.stripe_service,
-                currency_exchange_service=self.currency_exchange_service,
                 deposit_service=self.deposit_service,
-                balance_service=self.balance_service,
+                entity_owed_service=self.entity_owed_service,
                 config=self.config,
             )
         return self._stripe_authorization_service
@@ -212,10 +213,12 @@ class ServiceContainer:
             from app.services.pos import POSService
 
             self._pos_service = POSService(
+                db=self.db,
                 entity_service=self.entity_service,
                 transaction_service=self.transaction_service,
                 balance_service=self.balance_service,
                 invoice_service=self.invoice_service,
+                config=self.config,
             )
         return self._pos_service
 
@@ -286,9 +289,33 @@ class ServiceContainer:
         if self._notification_service is None:
             from app.services.notification import NotificationService
 
-            self._notification_service = NotificationService(config=self.config)
+            self._notification_service = NotificationService(
+                config=self.config, db=self.db
+            )
         return self._notification_service
 
+    @property
+    def webhook_inbox_service(self):
+        if self._webhook_inbox_service is None:
+            from app.services.webhook_inbox import WebhookInboxService
+
+            self._webhook_inbox_service = WebhookInboxService(db=self.db)
+        return self._webhook_inbox_service
+
+    @property
+    def dashboard_service(self):
+        if self._dashboard_service is None:
+            from app.services.dashboard import DashboardService
+
+            self._dashboard_service = DashboardService(
+                db=self.db,
+                balance_service=self.balance_service,
+                invoice_service=self.invoice_service,
+                entity_owed_service=self.entity_owed_service,
+                stripe_authorization_service=self.stripe_authorization_service,
+            )
+        return self._dashboard_service
+
 
 def get_container(
     db: Session = Depends(get_uow),
@@ -387,3 +414,11 @@ def get_token_service(container: ServiceContainer = Depends(get_container)):
 
 def get_notification_service(container: ServiceContainer = Depends(get_container)):
     return container.notification_service
+
+
+def get_webhook_inbox_service(container: ServiceContainer = Depends(get_container)):
+    return container.webhook_inbox_service
+
+
+def get_dashboard_service(container: ServiceContainer = Depends(get_container)):
+    return container.dashboard_service
@@ -6,3 +6,8 @@ from app.errors.base import ApplicationError
 class NotFoundError(ApplicationError):
     error_code = 1404
     error = "Not found"
+
+
+class UnknownFieldsError(ApplicationError):
+    error_code = 1422
+    error = "Unknown fields requested"
@@ -6,3 +6,8 @@ from app.errors.base import ApplicationError
 class POSEntityHasUnpaidInvoices(ApplicationError):
     error_code = 10001
     error = "Entity has unpaid invoices and cannot be charged via POS."
+
+
+class POSSaleSignatureInvalid(ApplicationError):
+    error_code = 10002
+    error = "POS sale signature is invalid."
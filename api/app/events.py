@@ -0,0 +1,93 @@
+"""In-process publish/subscribe of subject events for Server-Sent Events.
+
+Events are published per subject (``"entity:5"``, ``"treasury:2"``):
+
+- ``balance_changed`` when a subject's balances change;
+- ``transaction_created`` for the subjects on both sides of a new transaction;
+- ``stats_ready`` once a stats bundle that missed the cache has been computed.
+
+Publishing is thread-safe, as services run in worker threads while
+subscribers are ``/events`` streams on the event loop. Events about database
+changes are published with ``publish_on_commit`` so subscribers never hear
+about rows they cannot read yet, or that were rolled back. Like the balance
+caches, subscribers live in process memory.
+"""
+
+import asyncio
+import json
+import threading
+from dataclasses import dataclass, field
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+BALANCE_CHANGED = "balance_changed"
+TRANSACTION_CREATED = "transaction_created"
+STATS_READY = "stats_ready"
+
+_SESSION_KEY = "pending_events"
+
+
+@dataclass(frozen=True)
+class SubjectEvent:
+    subject: str
+    name: str
+    data: dict[str, Any] = field(default_factory=dict)
+
+    def encode(self) -> str:
+        """The event in ``text/event-stream`` format."""
+        payload = json.dumps({"subject": self.subject, **self.data})
+        return f"event: {self.name}\ndata: {payload}\n\n"
+
+
+class EventBroker:
+    _subscribers: dict[
+        str, dict[asyncio.Queue[SubjectEvent], asyncio.AbstractEventLoop]
+    ] = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def publish(cls, subject: str, name: str, **data: Any) -> None:
+        event = SubjectEvent(subject, name, data)
+        with cls._lock:
+            subscribers = list(cls._subscribers.get(subject, {}).items())
+        for queue, loop in subscribers:
+            loop.call_soon_threadsafe(queue.put_nowait, event)
+
+    @classmethod
+    def publish_on_commit(cls, db: Session, subject: str, name: str, **data) -> None:
+        """Publish once the transaction of *db* commits; repeats are merged."""
+        pending = db.info.setdefault(_SESSION_KEY, {})
+        pending[(subject, name)] = data
+
+    @classmethod
+    def subscribe(cls, subject: str) -> asyncio.Queue[SubjectEvent]:
+        """Queue receiving events of *subject*; call from the event loop."""
+        queue: asyncio.Queue[SubjectEvent] = asyncio.Queue()
+        with cls._lock:
+            cls._subscribers.setdefault(subject, {})[queue] = asyncio.get_running_loop()
+        return queue
+
+    @classmethod
+    def unsubscribe(cls, subject: str, queue: asyncio.Queue[SubjectEvent]) -> None:
+        with cls._lock:
+            subscribers = cls._subscribers.get(subject, {})
+            subscribers.pop(queue, None)
+            if not subscribers:
+                cls._subscribers.pop(subject, None)
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_committed(session: Session) -> None:
+    pending = session.info.pop(_SESSION_KEY, None)
+    for (subject, name), data in (pending or {}).items():
+        EventBroker.publish(subject, name, **data)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _drop_rolled_back(session: Session, previous_transaction) -> None:
+    # a rolled back savepoint keeps them: they cannot be told apart from the
+    # events of the enclosing transaction, and a spare event is harmless
+    if not previous_transaction.nested:
+        session.info.pop(_SESSION_KEY, None)
@@ -0,0 +1,208 @@
+"""Shared outbound HTTP client.
+
+Every integration (currency rates, Telegram, Keepz, CryptAPI) sends its
+requests through one ``HttpClient``:
+
+- one keep-alive ``requests.Session`` per host, so connections are reused
+  across calls and services;
+- explicit ``(connect, read)`` timeouts on every request;
+- retries of idempotent requests on connection errors and 502/503/504,
+  limited by a per-host retry budget so an outage is not multiplied by the
+  retry count;
+- per-host request, error and latency counters (``HttpClient.metrics``).
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TIMEOUT = (3.05, 10.0)
+_IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+_RETRY_STATUSES = {502, 503, 504}
+_LATENCY_SAMPLES = 256
+
+
+class RetryBudget:
+    """Allows retries for at most ``ratio`` of recent requests to a host.
+
+    Every request deposits ``ratio`` tokens (up to ``capacity``) and every retry
+    spends one, so a host that keeps failing quickly runs out of retries instead
+    of receiving ``1 + max_retries`` times its normal load.
+    """
+
+    def __init__(self, ratio: float = 0.2, capacity: float = 10.0) -> None:
+        self.ratio = ratio
+        self.capacity = capacity
+        self._tokens = capacity
+        self._lock = threading.Lock()
+
+    def deposit(self) -> None:
+        with self._lock:
+            self._tokens = min(self.capacity, self._tokens + self.ratio)
+
+    def withdraw(self) -> bool:
+        with self._lock:
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+
+@dataclass
+class HostMetrics:
+    requests: int = 0
+    # connection errors, timeouts and 5xx responses
+    errors: int = 0
+    retries: int = 0
+    total_seconds: float = 0.0
+    latencies: deque[float] = field(
+        default_factory=lambda: deque(maxlen=_LATENCY_SAMPLES)
+    )
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def record(self, seconds: float, *, error: bool) -> None:
+        with self._lock:
+            self.requests += 1
+            self.errors += error
+            self.total_seconds += seconds
+            self.latencies.append(seconds)
+
+    def record_retry(self) -> None:
+        with self._lock:
+            self.retries += 1
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            recent = sorted(self.latencies)
+
+            def _percentile(p: float) -> float | None:
+                if not recent:
+                    return None
+                return round(recent[min(len(recent) - 1, int(len(recent) * p))], 4)
+
+            return {
+                "requests": self.requests,
+                "errors": self.errors,
+                "retries": self.retries,
+                "avg_seconds": (
+                    round(self.total_seconds / self.requests, 4)
+                    if self.requests
+                    else None
+                ),
+                "p50_seconds": _percentile(0.5),
+                "p95_seconds": _percentile(0.95),
+            }
+
+
+class HttpClient:
+    def __init__(
+        self,
+        *,
+        timeout: tuple[float, float] = DEFAULT_TIMEOUT,
+        pool_maxsize: int = 32,
+        max_retries: int = 2,
+        retry_backoff_seconds: float = 0.2,
+        retry_ratio: float = 0.2,
+    ) -> None:
+        self.timeout = timeout
+        self.pool_maxsize = pool_maxsize
+        self.max_retries = max_retries
+        self.retry_backoff_seconds = retry_backoff_seconds
+        self.retry_ratio = retry_ratio
+        self._sessions: dict[str, requests.Session] = {}
+        self._budgets: dict[str, RetryBudget] = {}
+        self._metrics: dict[str, HostMetrics] = {}
+        self._lock = threading.Lock()
+
+    def session_for(self, host: str) -> requests.Session:
+        with self._lock:
+            session = self._sessions.get(host)
+            if session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=1, pool_maxsize=self.pool_maxsize
+                )
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                self._sessions[host] = session
+                self._budgets[host] = RetryBudget(self.retry_ratio)
+                self._metrics[host] = HostMetrics()
+            return session
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        *,
+        timeout: float | tuple[float, float] | None = None,
+        retry: bool | None = None,
+        **kwargs: Any,
+    ) -> requests.Response:
+        """Send a request; *retry* defaults to True for idempotent methods."""
+        host = urlsplit(url).netloc
+        session = self.session_for(host)
+        budget = self._budgets[host]
+        metrics = self._metrics[host]
+        if retry is None:
+            retry = method.upper() in _IDEMPOTENT_METHODS
+        budget.deposit()
+
+        attempt = 0
+        while True:
+            started = time.perf_counter()
+            try:
+                response = session.request(
+                    method, url, timeout=timeout or self.timeout, **kwargs
+                )
+            except requests.RequestException:
+                metrics.record(time.perf_counter() - started, error=True)
+                if not self._should_retry(retry, attempt, budget, metrics):
+                    raise
+            else:
+                failed = response.status_code >= 500
+                metrics.record(time.perf_counter() - started, error=failed)
+                if response.status_code not in _RETRY_STATUSES or not (
+                    self._should_retry(retry, attempt, budget, metrics)
+                ):
+                    return response
+                response.close()
+            attempt += 1
+            logger.info("Retrying %s %s (attempt %d)", method, url, attempt + 1)
+            time.sleep(self.retry_backoff_seconds * 2 ** (attempt - 1))
+
+    def _should_retry(
+        self, retry: bool, attempt: int, budget: RetryBudget, metrics: HostMetrics
+    ) -> bool:
+        if not retry or attempt >= self.max_retries or not budget.withdraw():
+            return False
+        metrics.record_retry()
+        return True
+
+    def get(self, url: str, **kwargs: Any) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs: Any) -> requests.Response:
+        return self.request("POST", url, **kwargs)
+
+    def metrics(self) -> dict[str, dict[str, Any]]:
+        with self._lock:
+            hosts = dict(self._metrics)
+        return {host: metrics.snapshot() for host, metrics in sorted(hosts.items())}
+
+
+@lru_cache
+def get_http_client() -> HttpClient:
+    """Process-wide client shared by all integrations."""
+    return HttpClient()
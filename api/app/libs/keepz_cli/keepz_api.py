@@ -352,24 +352,25 @@ class KeepzClient:
         self,
         base_url: str = DEFAULT_BASE_URL,
         user_agent: str = DEFAULT_USER_AGENT,
-        timeout: int = 30,
+        timeout: Any = 30,
+        session: Any = None,
     ) -> None:
         self.base_url = base_url.rstrip("/")
         self.timeout = timeout
-        self.session = requests.Session()
-        self.session.headers.update(
-            {
-                "accept": DEFAULT_ACCEPT,
-                "accept-language": DEFAULT_ACCEPT_LANGUAGE,
-                "user-agent": user_agent,
-            }
-        )
+        # Anything with the requests.Session request/get interface; may be shared
+        # between clients, so headers are kept per client and sent per request.
+        self.session = session or requests.Session()
+        self.headers = {
+            "accept": DEFAULT_ACCEPT,
+            "accept-language": DEFAULT_ACCEPT_LANGUAGE,
+            "user-agent": user_agent,
+        }
 
     def set_access_token(self, access_token: str) -> None:
-        self.session.headers["authorization"] = f"Bearer {access_token}"
+        self.headers["authorization"] = f"Bearer {access_token}"
 
     def clear_access_token(self) -> None:
-        self.session.headers.pop("authorization", None)
+        self.headers.pop("authorization", None)
 
     def _request_json(
         self,
@@ -387,6 +388,7 @@ class KeepzClient:
             url,
             params=params,
             json=json_body,
+            headers=self.headers,
             timeout=self.timeout,
         )
         if resp.status_code not in expected:
@@ -557,7 +559,9 @@ class KeepzClient:
         return _maybe_parse_response(AmountForDefault, data)
 
     def resolve_payment_url(self, short_url: str, max_redirects: int = 5) -> str:
-        resp = self.session.get(short_url, allow_redirects=True, timeout=self.timeout)
+        resp = self.session.get(
+            short_url, allow_redirects=True, headers=self.headers, timeout=self.timeout
+        )
         if len(resp.history) > max_redirects:
             raise KeepzApiError("Redirect chain too long when resolving payment URL")
         return resp.url
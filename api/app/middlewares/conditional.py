@@ -0,0 +1,97 @@
+"""Conditional GET with ETags derived from data versions"""
+
+import hashlib
+from datetime import date
+from typing import Callable
+
+from app.data_versions import ALL, DataVersions
+from app.middlewares.token import get_entity_from_token
+from app.models.entity import Entity
+from fastapi import Depends, HTTPException, Request
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+_TRUE_VALUES = {"1", "true", "yes", "on"}
+# suffixes CompressionMiddleware appends to strong ETags
+_ENCODING_SUFFIXES = ("-br", "-gzip")
+
+
+def conditional_get(
+    *subjects: str, unless: str | None = None
+) -> Callable[[Request], None]:
+    """Dependency answering ``304 Not Modified`` before the handler runs.
+
+    *subjects* are data version keys formatted with the path parameters, e.g.
+    ``"entity:{entity_id}"``; without any, the response depends on all data.
+    The ETag also covers the path, the query string and today's date, so
+    defaults such as "the last 6 months" roll over. *unless* names a boolean
+    query parameter that turns conditional handling off for the request.
+
+    The X-Token is checked first: FastAPI reports a missing header only after
+    every dependency ran, which would otherwise let a 304 through unauthenticated.
+    """
+
+    def check(
+        request: Request, _actor: Entity = Depends(get_entity_from_token)
+    ) -> None:
+        if unless and request.query_params.get(unless, "").lower() in _TRUE_VALUES:
+            return
+        keys = [subject.format(**request.path_params) for subject in subjects]
+        etag = _etag(request, keys or [ALL])
+        if _matches(request.headers.get("if-none-match"), etag):
+            raise HTTPException(status_code=304, headers={"ETag": etag})
+        request.state.etag = etag
+
+    return check
+
+
+def _etag(request: Request, subjects: list[str]) -> str:
+    key = "|".join(
+        (
+            DataVersions.boot_token,
+            ",".join(subjects),
+            ",".join(map(str, DataVersions.get(*subjects))),
+            date.today().isoformat(),
+            request.url.path,
+            str(sorted(request.query_params.multi_items())),
+        )
+    )
+    return f'"{hashlib.sha256(key.encode()).hexdigest()[:32]}"'
+
+
+def _matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip().removeprefix("W/")
+        if candidate == "*":
+            return True
+        for suffix in _ENCODING_SUFFIXES:
+            if candidate.endswith(f'{suffix}"'):
+                candidate = f'{candidate[: -len(suffix) - 1]}"'
+                break
+        if candidate == etag:
+            return True
+    return False
+
+
+class ETagMiddleware:
+    """Adds the ETag computed by ``conditional_get`` to successful responses."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_etag(message: Message) -> None:
+            if message["type"] == "http.response.start" and message["status"] == 200:
+                etag = scope.get("state", {}).get("etag")
+                headers = MutableHeaders(raw=message["headers"])
+                if etag and "etag" not in headers:
+                    headers["ETag"] = etag
+            await send(message)
+
+        await self.app(scope, receive, send_with_etag)
@@ -74,5 +74,7 @@ class Deposit(BaseModel):
 
     provider: Mapped[str] = mapped_column(String, nullable=False)
     details: Mapped[dict] = mapped_column(JSON)
+    # copy of details["keepz"]["note"], indexed to match incoming Keepz transactions
+    keepz_note: Mapped[str | None] = mapped_column(String, nullable=True, index=True)
 
     tags: Mapped[list[Tag]] = relationship(secondary=deposits_tags)
@@ -4,7 +4,7 @@ from typing import List
 
 from app.models.base import BaseModel
 from app.models.tag import Tag
-from sqlalchemy import JSON, Column, ForeignKey, Index, Table
+from sqlalchemy import JSON, Column, ForeignKey, Index, Table, func, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 entities_tags = Table(
@@ -27,3 +27,28 @@ class Entity(BaseModel):
     # dictionary with telegram id, signal id, matrix id, etc.
     # where to send an authentication link.
     auth: Mapped[dict] = mapped_column(JSON, nullable=True, default=None)
+
+
+# POS and bots resolve entities by case-insensitive name.
+Index("ix_entities_name_lower", func.lower(Entity.name))
+
+
+def _pg_trgm_installed(ddl, target, bind, **kw) -> bool:
+    return (
+        bind.execute(
+            text("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+        ).first()
+        is not None
+    )
+
+
+# Trigram indexes behind the substring search of ``GET /entities?q=``. pg_trgm is
+# installed by ``DatabaseConnection.create_tables`` where the server ships it;
+# without it the indexes are skipped and the search scans.
+for _column in (Entity.name, Entity.comment):
+    Index(
+        f"ix_entities_{_column.key}_trgm",
+        _column,
+        postgresql_using="gin",
+        postgresql_ops={_column.key: "gin_trgm_ops"},
+    ).ddl_if(dialect="postgresql", callable_=_pg_trgm_installed)
@@ -34,6 +34,7 @@ class Invoice(BaseModel):
     __tablename__ = "invoices"
     __table_args__ = (
         Index("ix_invoices_status_billing_period", "status", "billing_period"),
+        Index("ix_invoices_from_entity_status", "from_entity_id", "status"),
         {"sqlite_autoincrement": True},
     )
 
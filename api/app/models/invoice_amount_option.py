@@ -0,0 +1,24 @@
+"""Normalized invoice payment options.
+
+``Invoice.amounts`` and ``InvoiceItem.amounts`` remain the API-facing source of
+truth. This table mirrors them with one row per currency alternative so owed
+totals and currency filters can be aggregated in SQL instead of parsing JSON.
+Rows are maintained by ``InvoiceService``.
+"""
+
+from app.models.base import BaseModel
+from sqlalchemy import DECIMAL, Column, ForeignKey, Index, Integer, String, Table
+
+invoice_amount_options = Table(
+    "invoice_amount_options",
+    BaseModel.metadata,
+    Column("invoice_id", ForeignKey("invoices.id"), nullable=False),
+    # null for a simple invoice's own amounts, set for multi-recipient items
+    Column("item_id", ForeignKey("invoice_items.id"), nullable=True),
+    Column("currency", String, nullable=False),
+    Column("amount", DECIMAL(scale=2), nullable=False),
+    # position within the original amounts list; 0 is the primary option
+    Column("rank", Integer, nullable=False),
+    Index("ix_invoice_amount_options_invoice_item", "invoice_id", "item_id", "rank"),
+    Index("ix_invoice_amount_options_currency_invoice", "currency", "invoice_id"),
+)
@@ -0,0 +1,50 @@
+"""Queued outgoing notifications"""
+
+import enum
+from datetime import datetime
+
+from app.models.base import BaseModel
+from sqlalchemy import JSON, BigInteger, DateTime, Enum, ForeignKey, Index, String
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql import func
+
+
+class NotificationOutboxStatus(enum.Enum):
+    PENDING = "pending"
+    SENT = "sent"
+    FAILED = "failed"
+
+
+class NotificationOutbox(BaseModel):
+    """A message waiting for (or done with) delivery by the dispatcher task."""
+
+    __tablename__ = "notification_outbox"
+    __table_args__ = (
+        Index(
+            "ix_notification_outbox_status_next_attempt_at",
+            "status",
+            "next_attempt_at",
+        ),
+        {"sqlite_autoincrement": True},
+    )
+
+    channel: Mapped[str] = mapped_column(String, nullable=False, default="telegram")
+    # recipient entity, if the message was addressed to one
+    entity_id: Mapped[int | None] = mapped_column(
+        ForeignKey("entities.id"), nullable=True
+    )
+    chat_id: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    # channel API parameters except the chat, e.g. text, parse_mode, reply_markup
+    payload: Mapped[dict] = mapped_column(JSON, nullable=False)
+
+    status: Mapped[NotificationOutboxStatus] = mapped_column(
+        Enum(NotificationOutboxStatus),
+        nullable=False,
+        default=NotificationOutboxStatus.PENDING,
+    )
+    attempts: Mapped[int] = mapped_column(nullable=False, default=0)
+    next_attempt_at: Mapped[datetime] = mapped_column(
+        DateTime, nullable=False, default=func.now()
+    )
+    sent_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    last_error: Mapped[str | None] = mapped_column(String, nullable=True)
@@ -0,0 +1,25 @@
+"""POS sales synced from a terminal's offline queue"""
+
+from datetime import datetime
+
+from app.models.base import BaseModel
+from sqlalchemy import DateTime, ForeignKey, String, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+
+class POSSale(BaseModel):
+    """Receipt of a synced sale; its ``client_id`` makes a resent sale a no-op."""
+
+    __tablename__ = "pos_sales"
+    __table_args__ = (
+        UniqueConstraint("client_id", name="uq_pos_sales_client_id"),
+        {"sqlite_autoincrement": True},
+    )
+
+    # id the terminal gave the sale when recording it
+    client_id: Mapped[str] = mapped_column(String, nullable=False)
+    transaction_id: Mapped[int | None] = mapped_column(
+        ForeignKey("transactions.id"), nullable=True
+    )
+    # when the terminal recorded the sale, as reported by the terminal
+    recorded_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
@@ -0,0 +1,47 @@
+"""Received provider webhooks waiting for processing"""
+
+import enum
+from datetime import datetime
+
+from app.models.base import BaseModel
+from sqlalchemy import JSON, DateTime, Enum, Index, String, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql import func
+
+
+class WebhookInboxStatus(enum.Enum):
+    PENDING = "pending"
+    PROCESSED = "processed"
+    # gave up: failed permanently or ran out of attempts
+    DEAD = "dead"
+
+
+class WebhookInbox(BaseModel):
+    """A provider callback, stored on receipt and processed by the inbox worker."""
+
+    __tablename__ = "webhook_inbox"
+    __table_args__ = (
+        UniqueConstraint(
+            "provider", "event_id", name="uq_webhook_inbox_provider_event_id"
+        ),
+        Index("ix_webhook_inbox_status_next_attempt_at", "status", "next_attempt_at"),
+        {"sqlite_autoincrement": True},
+    )
+
+    provider: Mapped[str] = mapped_column(String, nullable=False)
+    # provider's id of the event, used to drop redelivered callbacks
+    event_id: Mapped[str] = mapped_column(String, nullable=False)
+    event_type: Mapped[str | None] = mapped_column(String, nullable=True)
+    payload: Mapped[dict] = mapped_column(JSON, nullable=False)
+
+    status: Mapped[WebhookInboxStatus] = mapped_column(
+        Enum(WebhookInboxStatus),
+        nullable=False,
+        default=WebhookInboxStatus.PENDING,
+    )
+    attempts: Mapped[int] = mapped_column(nullable=False, default=0)
+    next_attempt_at: Mapped[datetime] = mapped_column(
+        DateTime, nullable=False, default=func.now()
+    )
+    processed_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    last_error: Mapped[str | None] = mapped_column(String, nullable=True)
@@ -3,7 +3,11 @@
 from app.dependencies.services import get_balance_service, get_entity_owed_service
 from app.middlewares.token import get_entity_from_token
 from app.models.entity import Entity
-from app.schemas.balance import BalanceSchema, RecommendedDepositSchema
+from app.schemas.balance import (
+    BalanceSchema,
+    EntityOwedSchema,
+    RecommendedDepositSchema,
+)
 from app.services.balance import BalanceService
 from app.services.entity_owed import EntityOwedService
 from fastapi import APIRouter, Depends, Query
@@ -20,6 +24,18 @@ def get_balances(
     return balance_service.get_balances_many(entity_ids=entity_ids)
 
 
+@balance_router.get("/owed", response_model=dict[int, EntityOwedSchema])
+def get_owed(
+    entity_ids: list[int] = Query(default_factory=list),
+    entity_owed_service: EntityOwedService = Depends(get_entity_owed_service),
+    actor_entity: Entity = Depends(get_entity_from_token),
+):
+    return {
+        entity_id: EntityOwedSchema.model_validate(summary, from_attributes=True)
+        for entity_id, summary in entity_owed_service.calculate_many(entity_ids).items()
+    }
+
+
 @balance_router.get("/{entity_id}", response_model=BalanceSchema)
 def get_balance(
     entity_id: int,
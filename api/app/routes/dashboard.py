@@ -0,0 +1,20 @@
+"""API route for the entity dashboard"""
+
+from app.dependencies.services import get_dashboard_service
+from app.middlewares.token import get_entity_from_token
+from app.models.entity import Entity
+from app.schemas.dashboard import DashboardSchema
+from app.services.dashboard import DashboardService
+from fastapi import APIRouter, Depends
+
+dashboard_router = APIRouter(prefix="/dashboard", tags=["Dashboard"])
+
+
+@dashboard_router.get("/me", response_model=DashboardSchema)
+def get_my_dashboard(
+    dashboard_service: DashboardService = Depends(get_dashboard_service),
+    actor_entity: Entity = Depends(get_entity_from_token),
+):
+    """Balances, pending and recent invoices, owed summary, recommended deposit
+    and card authorizations of the token's entity, for the UI landing page."""
+    return dashboard_service.get(actor_entity)
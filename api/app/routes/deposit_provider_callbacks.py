@@ -1,21 +1,25 @@
 """API routes for deposit provider callbacks"""
 
+import hashlib
 from typing import Annotated
 from uuid import UUID
 
-from app.dependencies.services import (
-    get_cryptapi_deposit_provider_service,
-    get_stripe_authorization_service,
-    get_stripe_deposit_provider_service,
-    get_stripe_service,
-)
-from app.errors.common import NotFoundError
+from app.config import Config, get_config
+from app.dependencies.services import get_stripe_service, get_webhook_inbox_service
 from app.schemas.deposit_providers.cryptapi import CryptAPICallbackSchema
-from app.services.deposit_providers.cryptapi import CryptAPIDepositProviderService
-from app.services.deposit_providers.stripe import StripeDepositProviderService
 from app.services.stripe import StripeService
-from app.services.stripe_authorization import StripeAuthorizationService
-from fastapi import APIRouter, Body, Depends, Form, Header, HTTPException, Path, Request
+from app.services.webhook_inbox import WebhookInboxService
+from app.tasks.webhook_inbox import drain_webhook_inbox
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Depends,
+    Form,
+    Header,
+    HTTPException,
+    Path,
+    Request,
+)
 from fastapi.responses import PlainTextResponse
 
 deposit_provider_callbacks_router = APIRouter(
@@ -23,57 +27,37 @@ deposit_provider_callbacks_router = APIRouter(
 )
 
 
-def _handle_subscription_deleted(
-    subscription_obj: dict,
-    stripe_authorization_service: StripeAuthorizationService,
-) -> None:
-    """Deactivate a StripeAuthorization when its Stripe subscription is cancelled."""
-    subscription_id = str(subscription_obj.get("id") or "").strip()
-    if not subscription_id:
-        return
-    from app.models.stripe_authorization import (  # avoid circular import at module level
-        StripeAuthorization,
-    )
-
-    auth = (
-        stripe_authorization_service.db.query(StripeAuthorization)
-        .filter(StripeAuthorization.stripe_subscription_id == subscription_id)
-        .first()
-    )
-    if auth and auth.active:
-        import datetime
-
-        auth.active = False
-        auth.modified_at = datetime.datetime.now()
-        stripe_authorization_service.db.flush()
-
-
 @deposit_provider_callbacks_router.post("/cryptapi/{deposit_uuid}")
 def cryptapi_callback(
+    background_tasks: BackgroundTasks,
     deposit_uuid: Annotated[UUID, Path()],
     cryptapi_callback: CryptAPICallbackSchema = Form(),
-    cryptapi_deposit_provider_service: CryptAPIDepositProviderService = Depends(
-        get_cryptapi_deposit_provider_service
-    ),
+    webhook_inbox_service: WebhookInboxService = Depends(get_webhook_inbox_service),
+    config: Config = Depends(get_config),
 ):
-    cryptapi_deposit_provider_service.complete_deposit(
-        deposit_uuid=deposit_uuid,
-        cryptapi_callback=cryptapi_callback,
+    # CryptAPI sends a pending and a confirmed callback for the same transaction
+    webhook_inbox_service.enqueue(
+        provider="cryptapi",
+        event_id=(
+            f"{deposit_uuid}:{cryptapi_callback.txid_in}:{cryptapi_callback.pending}"
+        ),
+        payload={
+            "deposit_uuid": str(deposit_uuid),
+            "callback": cryptapi_callback.model_dump(mode="json"),
+        },
     )
+    background_tasks.add_task(drain_webhook_inbox, config)
     return PlainTextResponse("*ok*")
 
 
 @deposit_provider_callbacks_router.post("/stripe")
 async def stripe_callback(
     request: Request,
+    background_tasks: BackgroundTasks,
     stripe_signature: str = Header(alias="Stripe-Signature"),
     stripe_service: StripeService = Depends(get_stripe_service),
-    stripe_deposit_provider_service: StripeDepositProviderService = Depends(
-        get_stripe_deposit_provider_service
-    ),
-    stripe_authorization_service: StripeAuthorizationService = Depends(
-        get_stripe_authorization_service
-    ),
+    webhook_inbox_service: WebhookInboxService = Depends(get_webhook_inbox_service),
+    config: Config = Depends(get_config),
 ):
     payload = await request.body()
     try:
@@ -81,18 +65,14 @@ async def stripe_callback(
     except Exception as exc:
         raise HTTPException(status_code=400, detail=f"Invalid Stripe webhook: {exc}")
 
-    stripe_deposit_provider_service.handle_webhook_event(event)
-    event_type = str(event.get("type") or "")
-    data_object = (event.get("data") or {}).get("object") or {}
-    session_mode = str(data_object.get("mode") or "")
-    if event_type == "checkout.session.completed" and session_mode in (
-        "setup",
-        "subscription",
-    ):
-        stripe_authorization_service.handle_setup_session_completed(data_object)
-    elif event_type == "invoice.paid":
-        invoice = stripe_service.normalize_invoice(data_object)
-        stripe_authorization_service.handle_subscription_invoice_paid(invoice)
-    elif event_type == "customer.subscription.deleted":
-        stripe_authorization_service.handle_subscription_deleted(data_object)
+    # Stripe returns a StripeObject; the inbox stores the event as plain JSON
+    if hasattr(event, "to_dict"):
+        event = event.to_dict()
+    webhook_inbox_service.enqueue(
+        provider="stripe",
+        event_id=str(event.get("id") or hashlib.sha256(payload).hexdigest()),
+        event_type=event.get("type"),
+        payload=event,
+    )
+    background_tasks.add_task(drain_webhook_inbox, config)
     return PlainTextResponse("ok")
@@ -1,15 +1,18 @@
 """API routes for Entity manipulation"""
 
 from app.dependencies.services import get_entity_service
+from app.middlewares.conditional import conditional_get
 from app.middlewares.token import get_entity_from_token
 from app.models.entity import Entity
 from app.schemas.base import PaginationSchema
 from app.schemas.entity import (
     EntityCreateSchema,
+    EntityFacetsSchema,
     EntityFiltersSchema,
     EntitySchema,
     EntityUpdateSchema,
 )
+from app.schemas.fields import FieldSelectionSchema, sparse_page
 from app.services.entity import EntityService
 from fastapi import APIRouter, Depends
 
@@ -32,7 +35,20 @@ def read_me(
     return actor_entity
 
 
-@entity_router.get("/{entity_id}", response_model=EntitySchema)
+@entity_router.get("/facets", response_model=EntityFacetsSchema)
+def read_entity_facets(
+    filters: EntityFiltersSchema = Depends(),
+    entity_service: EntityService = Depends(get_entity_service),
+    actor_entity: Entity = Depends(get_entity_from_token),
+):
+    return entity_service.get_facets(filters)
+
+
+@entity_router.get(
+    "/{entity_id}",
+    response_model=EntitySchema,
+    dependencies=[Depends(get_entity_from_token), Depends(conditional_get())],
+)
 def read_entity(
     entity_id: int,
     entity_service: EntityService = Depends(get_entity_service),
@@ -41,15 +57,25 @@ def read_entity(
     return entity_service.get(entity_id)
 
 
-@entity_router.get("", response_model=PaginationSchema[EntitySchema])
+@entity_router.get(
+    "",
+    response_model=PaginationSchema[EntitySchema],
+    dependencies=[Depends(get_entity_from_token), Depends(conditional_get())],
+)
 def read_entities(
     filters: EntityFiltersSchema = Depends(),
     skip: int = 0,
     limit: int = 100,
+    selection: FieldSelectionSchema = Depends(),
     entity_service: EntityService = Depends(get_entity_service),
     actor_entity: Entity = Depends(get_entity_from_token),
 ):
-    return entity_service.get_all(filters, skip, limit)
+    fields = selection.resolve(EntitySchema, Entity)
+    return sparse_page(
+        entity_service.get_all(filters, skip, limit, fields=fields),
+        EntitySchema,
+        fields,
+    )
 
 
 @entity_router.patch("/{entity_id}", response_model=EntitySchema)
@@ -0,0 +1,62 @@
+"""Server-Sent Events streams of entity and treasury changes"""
+
+import asyncio
+from typing import AsyncIterator, Literal
+
+from app.config import Config, get_config
+from app.events import EventBroker
+from app.middlewares.token import get_entity_from_token
+from app.models.entity import Entity
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+
+events_router = APIRouter(prefix="/events", tags=["Events"])
+
+
+@events_router.get("/{subject_type}/{subject_id}")
+async def stream_events(
+    subject_type: Literal["entity", "treasury"],
+    subject_id: int,
+    timeout: float | None = Query(
+        default=None, gt=0, description="Seconds after which the stream ends"
+    ),
+    config: Config = Depends(get_config),
+    actor_entity: Entity = Depends(get_entity_from_token),
+) -> StreamingResponse:
+    """``text/event-stream`` of ``balance_changed``, ``transaction_created``
+    and ``stats_ready`` events of one entity or treasury.
+
+    The subscription starts before the response does, so an event published
+    after the response headers arrive is never missed.
+    """
+    subject = f"{subject_type}:{subject_id}"
+    queue = EventBroker.subscribe(subject)
+    return StreamingResponse(
+        _event_stream(subject, queue, config.events_heartbeat_seconds, timeout),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def _event_stream(
+    subject: str, queue: asyncio.Queue, heartbeat: float, timeout: float | None
+) -> AsyncIterator[str]:
+    loop = asyncio.get_running_loop()
+    deadline = None if timeout is None else loop.time() + timeout
+    try:
+        # sent right away so clients see the response start
+        yield "retry: 3000\n\n"
+        while deadline is None or loop.time() < deadline:
+            wait = (
+                heartbeat
+                if deadline is None
+                else min(heartbeat, deadline - loop.time())
+            )
+            try:
+                event = await asyncio.wait_for(queue.get(), wait)
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+            yield event.encode()
+    finally:
+        EventBroker.unsubscribe(subject, queue)
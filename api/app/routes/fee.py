@@ -3,6 +3,7 @@
 from typing import Any
 
 from app.dependencies.services import get_fee_service
+from app.middlewares.conditional import conditional_get
 from app.middlewares.token import get_entity_from_token
 from app.models.entity import Entity
 from app.schemas.fee import (
@@ -16,7 +17,11 @@ from fastapi import APIRouter, Depends
 router = APIRouter(prefix="/fees", tags=["Fees"])
 
 
-@router.get("/", response_model=list[FeeSchema])
+@router.get(
+    "/",
+    response_model=list[FeeSchema],
+    dependencies=[Depends(get_entity_from_token), Depends(conditional_get())],
+)
 def get_fees(
     filters: FeeFiltersSchema = Depends(),
     service: FeeService = Depends(get_fee_service),
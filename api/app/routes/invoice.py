@@ -3,7 +3,9 @@
 from app.dependencies.services import get_invoice_service
 from app.middlewares.token import get_entity_from_token
 from app.models.entity import Entity
+from app.models.invoice import Invoice
 from app.schemas.base import PaginationSchema
+from app.schemas.fields import FieldSelectionSchema, sparse_page
 from app.schemas.invoice import (
     InvoiceAutoPayReportSchema,
     InvoiceBulkCreateReportSchema,
@@ -54,10 +56,16 @@ def read_invoices(
     filters: InvoiceFiltersSchema = Depends(),
     skip: int = 0,
     limit: int = 100,
+    selection: FieldSelectionSchema = Depends(),
     invoice_service: InvoiceService = Depends(get_invoice_service),
     actor_entity: Entity = Depends(get_entity_from_token),
 ):
-    return invoice_service.get_all(filters, skip, limit)
+    fields = selection.resolve(InvoiceSchema, Invoice)
+    return sparse_page(
+        invoice_service.get_all(filters, skip, limit, fields=fields),
+        InvoiceSchema,
+        fields,
+    )
 
 
 @invoice_router.patch("/{invoice_id}", response_model=InvoiceSchema)
@@ -2,7 +2,12 @@
 
 from app.dependencies.services import get_pos_service
 from app.middlewares.pos import require_pos_secret
-from app.schemas.pos import POSChargeRequest, POSChargeResponse
+from app.schemas.pos import (
+    POSChargeRequest,
+    POSChargeResponse,
+    POSSyncRequest,
+    POSSyncResponse,
+)
 from app.services.pos import POSService
 from fastapi import APIRouter, Depends
 
@@ -23,3 +28,13 @@ def pos_charge(
         comment=payload.comment,
     )
     return POSChargeResponse(entity=entity, balance=balance)
+
+
+@pos_router.post("/sync", response_model=POSSyncResponse)
+def pos_sync(
+    payload: POSSyncRequest,
+    _: None = Depends(require_pos_secret),
+    pos_service: POSService = Depends(get_pos_service),
+):
+    """Replay sales a terminal recorded while offline; see ``POSService.sync``."""
+    return pos_service.sync(payload.sales)
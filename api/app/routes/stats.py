@@ -1,9 +1,18 @@
 """Routes for stats"""
 
+import logging
+import threading
 from datetime import date
-from typing import List, Literal, Optional
-
-from app.dependencies.services import get_stats_service
+from typing import Any, Callable, List, Literal, Optional
+
+from app.config import Config, get_config
+from app.db import DatabaseConnection
+from app.dependencies.services import ServiceContainer, get_stats_service
+from app.events import STATS_READY, EventBroker
+from app.http import get_http_client
+from app.middlewares.conditional import conditional_get
+from app.middlewares.token import get_entity_from_token
+from app.models.entity import Entity
 from app.schemas.stats import (
     DonationsByMonthSchema,
     EntityBalanceChangeByDaySchema,
@@ -12,6 +21,7 @@ from app.schemas.stats import (
     EntityTransactionsByDaySchema,
     FeeTransactionsByMonthSchema,
     MonthlyFeeSumByMonthSchema,
+    OutboundHostStatsSchema,
     SystemBalanceHistorySchema,
     TopEntityByMonthSchema,
     TopEntityStatSchema,
@@ -21,10 +31,19 @@ from app.schemas.stats import (
     TreasuryStatsBundleSchema,
 )
 from app.services.stats import StatsService
-from fastapi import APIRouter, Depends
+from app.uow import UnitOfWork
+from fastapi import APIRouter, BackgroundTasks, Depends
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/stats", tags=["Stats"])
 
+# stats bundles being computed after a cached_only miss
+_warming: set[tuple] = set()
+_warming_lock = threading.Lock()
+_warm_up_connections: dict[str, DatabaseConnection] = {}
+_warm_up_connections_lock = threading.Lock()
+
 
 def _normalize_history_timeframe(
     stats_service: StatsService,
@@ -79,6 +98,51 @@ def _get_history_stats_bundle(
     }
 
 
+def _warm_up_stats_bundle(
+    background_tasks: BackgroundTasks,
+    config: Config,
+    subject: str,
+    key: tuple,
+    compute: Callable[[StatsService], Any],
+) -> None:
+    """Compute a missed bundle after the response, then announce ``stats_ready``.
+
+    Subscribers of the subject's event stream learn when a ``cached_only``
+    request will hit, instead of polling for it.
+    """
+    with _warming_lock:
+        if key in _warming:
+            return
+        _warming.add(key)
+    background_tasks.add_task(_compute_stats_bundle, config, subject, key, compute)
+
+
+def _warm_up_connection(config: Config) -> DatabaseConnection:
+    """Connection shared by every warm-up, one per database."""
+    with _warm_up_connections_lock:
+        db_conn = _warm_up_connections.get(config.database_url)
+        if db_conn is None:
+            db_conn = _warm_up_connections[config.database_url] = DatabaseConnection(
+                config
+            )
+        return db_conn
+
+
+def _compute_stats_bundle(
+    config: Config, subject: str, key: tuple, compute: Callable[[StatsService], Any]
+) -> None:
+    db_conn = _warm_up_connection(config)
+    try:
+        with UnitOfWork(db_conn.get_session()) as uow:
+            compute(ServiceContainer(uow.db, config).stats_service)
+        EventBroker.publish(subject, STATS_READY)
+    except Exception:
+        logger.exception("Could not compute stats bundle %s", key)
+    finally:
+        with _warming_lock:
+            _warming.discard(key)
+
+
 @router.get(
     "/monthly-fee-sum-by-month", response_model=List[MonthlyFeeSumByMonthSchema]
 )
@@ -341,20 +405,33 @@ def get_incoming_by_tag_by_month(
     )
 
 
-@router.get("/treasury/{treasury_id}", response_model=TreasuryStatsBundleSchema)
+@router.get(
+    "/treasury/{treasury_id}",
+    response_model=TreasuryStatsBundleSchema,
+    dependencies=[
+        Depends(get_entity_from_token),
+        Depends(conditional_get("treasury:{treasury_id}", unless="cached_only")),
+    ],
+)
 def get_treasury_stats_bundle(
     treasury_id: int,
+    background_tasks: BackgroundTasks,
     months: int = 6,
     timeframe_from: Optional[date] = None,
     timeframe_to: Optional[date] = None,
     cached_only: bool = False,
+    config: Config = Depends(get_config),
     stats_service: StatsService = Depends(get_stats_service),
 ):
-    """Return the two account-history graphs for a treasury."""
+    """Return the two account-history graphs for a treasury.
+
+    A ``cached_only`` miss starts computing the bundle in the background and
+    publishes ``stats_ready`` on ``/events/treasury/{treasury_id}`` when done.
+    """
     _, normalized_from, normalized_to = _normalize_history_timeframe(
         stats_service, months, timeframe_from, timeframe_to
     )
-    return _get_history_stats_bundle(
+    bundle = _get_history_stats_bundle(
         stats_service,
         "treasury",
         treasury_id,
@@ -362,21 +439,48 @@ def get_treasury_stats_bundle(
         normalized_to,
         cached_only=cached_only,
     )
+    if bundle.get("cached") is False:
+        _warm_up_stats_bundle(
+            background_tasks,
+            config,
+            f"treasury:{treasury_id}",
+            ("treasury", treasury_id, normalized_from, normalized_to),
+            lambda service: _get_history_stats_bundle(
+                service,
+                "treasury",
+                treasury_id,
+                normalized_from,
+                normalized_to,
+                cached_only=False,
+            ),
+        )
+    return bundle
 
 
-@router.get("/entity/{entity_id}", response_model=EntityStatsBundleSchema)
+@router.get(
+    "/entity/{entity_id}",
+    response_model=EntityStatsBundleSchema,
+    dependencies=[
+        Depends(get_entity_from_token),
+        Depends(conditional_get("entity:{entity_id}", unless="cached_only")),
+    ],
+)
 def get_entity_stats_bundle(
     entity_id: int,
+    background_tasks: BackgroundTasks,
     limit: int = 6,
     months: int = 6,
     timeframe_from: Optional[date] = None,
     timeframe_to: Optional[date] = None,
     cached_only: bool = False,
+    config: Config = Depends(get_config),
     stats_service: StatsService = Depends(get_stats_service),
 ):
     """Return all entity stats in a single request.
 
     This endpoint is intended for UI usage and benefits from StatsService's in-memory caching.
+    A ``cached_only`` miss starts computing the bundle in the background and
+    publishes ``stats_ready`` on ``/events/entity/{entity_id}`` when done.
     """
     normalized_months, bundle_timeframe_from, normalized_timeframe_to = (
         _normalize_history_timeframe(
@@ -447,6 +551,20 @@ def get_entity_stats_bundle(
         )
 
         if history_stats.get("cached") is False or not all_present:
+            _warm_up_stats_bundle(
+                background_tasks,
+                config,
+                f"entity:{entity_id}",
+                ("entity", entity_id, *top_args, bundle_timeframe_from),
+                lambda service: _get_entity_stats_bundle(
+                    service,
+                    entity_id,
+                    normalized_limit,
+                    normalized_months,
+                    bundle_timeframe_from,
+                    normalized_timeframe_to,
+                ),
+            )
             return {"cached": False}
 
         return {
@@ -462,67 +580,85 @@ def get_entity_stats_bundle(
             "outgoing_by_tag_by_month": outgoing_by_tag_by_month,
         }
 
+    return _get_entity_stats_bundle(
+        stats_service,
+        entity_id,
+        normalized_limit,
+        normalized_months,
+        bundle_timeframe_from,
+        normalized_timeframe_to,
+    )
+
+
+def _get_entity_stats_bundle(
+    stats_service: StatsService,
+    entity_id: int,
+    limit: int,
+    months: int,
+    timeframe_from: date,
+    timeframe_to: date,
+) -> dict:
     # Use the same bundle timeframe for all time-series charts.
     history_stats = _get_history_stats_bundle(
         stats_service,
         "entity",
         entity_id,
-        bundle_timeframe_from,
-        normalized_timeframe_to,
+        timeframe_from,
+        timeframe_to,
         cached_only=False,
     )
     transactions_by_day = stats_service.get_entity_transactions_by_day(
         entity_id,
-        bundle_timeframe_from,
-        normalized_timeframe_to,
+        timeframe_from,
+        timeframe_to,
     )
     top_incoming = stats_service.get_top_incoming_entities(
-        limit=normalized_limit,
-        months=normalized_months,
-        timeframe_to=normalized_timeframe_to,
+        limit=limit,
+        months=months,
+        timeframe_to=timeframe_to,
         entity_id=entity_id,
     )
     top_outgoing = stats_service.get_top_outgoing_entities(
-        limit=normalized_limit,
-        months=normalized_months,
-        timeframe_to=normalized_timeframe_to,
+        limit=limit,
+        months=months,
+        timeframe_to=timeframe_to,
         entity_id=entity_id,
     )
     top_incoming_tags = stats_service.get_top_incoming_tags(
-        limit=normalized_limit,
-        months=normalized_months,
-        timeframe_to=normalized_timeframe_to,
+        limit=limit,
+        months=months,
+        timeframe_to=timeframe_to,
         entity_id=entity_id,
     )
     top_outgoing_tags = stats_service.get_top_outgoing_tags(
-        limit=normalized_limit,
-        months=normalized_months,
-        timeframe_to=normalized_timeframe_to,
+        limit=limit,
+        months=months,
+        timeframe_to=timeframe_to,
         entity_id=entity_id,
     )
     incoming_by_entity_by_month = stats_service.get_incoming_by_entity_by_month(
         entity_id=entity_id,
-        limit=normalized_limit,
-        months=normalized_months,
-        timeframe_to=normalized_timeframe_to,
+        limit=limit,
+        months=months,
+        timeframe_to=timeframe_to,
     )
     outgoing_by_entity_by_month = stats_service.get_outgoing_by_entity_by_month(
         entity_id=entity_id,
-        limit=normalized_limit,
-        months=normalized_months,
-        timeframe_to=normalized_timeframe_to,
+        limit=limit,
+        months=months,
+        timeframe_to=timeframe_to,
     )
     incoming_by_tag_by_month = stats_service.get_incoming_by_tag_by_month(
         entity_id=entity_id,
-        limit=normalized_limit,
-        months=normalized_months,
-        timeframe_to=normalized_timeframe_to,
+        limit=limit,
+        months=months,
+        timeframe_to=timeframe_to,
     )
     outgoing_by_tag_by_month = stats_service.get_outgoing_by_tag_by_month(
         entity_id=entity_id,
-        limit=normalized_limit,
-        months=normalized_months,
-        timeframe_to=normalized_timeframe_to,
+        limit=limit,
+        months=months,
+        timeframe_to=timeframe_to,
     )
 
     return {
@@ -537,3 +673,9 @@ def get_entity_stats_bundle(
         "incoming_by_tag_by_month": incoming_by_tag_by_month,
         "outgoing_by_tag_by_month": outgoing_by_tag_by_month,
     }
+
+
+@router.get("/outbound-http", response_model=dict[str, OutboundHostStatsSchema])
+def get_outbound_http_stats(_actor: Entity = Depends(get_entity_from_token)):
+    """Per-host request, error and latency counters of the shared HTTP client."""
+    return get_http_client().metrics()
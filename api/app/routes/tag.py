@@ -1,6 +1,7 @@
 """API routes for Tag manipulation"""
 
 from app.dependencies.services import get_tag_service
+from app.middlewares.conditional import conditional_get
 from app.middlewares.token import get_entity_from_token
 from app.models.entity import Entity
 from app.schemas.base import PaginationSchema
@@ -25,7 +26,11 @@ def create_tag(
     return tag_service.create(tag)
 
 
-@tag_router.get("/{tag_id}", response_model=TagSchema)
+@tag_router.get(
+    "/{tag_id}",
+    response_model=TagSchema,
+    dependencies=[Depends(get_entity_from_token), Depends(conditional_get())],
+)
 def read_tag(
     tag_id: int,
     tag_service: TagService = Depends(get_tag_service),
@@ -34,7 +39,11 @@ def read_tag(
     return tag_service.get(tag_id)
 
 
-@tag_router.get("", response_model=PaginationSchema[TagSchema])
+@tag_router.get(
+    "",
+    response_model=PaginationSchema[TagSchema],
+    dependencies=[Depends(get_entity_from_token), Depends(conditional_get())],
+)
 def read_tags(
     filters: TagFiltersSchema = Depends(),
     skip: int = 0,
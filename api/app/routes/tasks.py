@@ -1,5 +1,7 @@
 """API routes for manually triggering background tasks."""
 
+from dataclasses import asdict
+
 from app.dependencies.services import (
     get_stripe_authorization_service,
     get_stripe_deposit_provider_service,
@@ -70,9 +72,11 @@ def run_stripe_entity_charge(
             details={"dry_run": True, "plans": plans},
         )
 
+    report = stripe_authorization_service.run_weekly_entity_dynamic_charges()
     return TaskRunResponse(
         task="stripe-entity-charge",
-        result=stripe_authorization_service.run_weekly_entity_dynamic_charges(),
+        result=report.processed,
+        details=asdict(report),
     )
 
 
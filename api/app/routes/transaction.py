@@ -1,9 +1,13 @@
 """API routes for Transaction manipulation"""
 
 from app.dependencies.services import get_transaction_service
+from app.middlewares.conditional import conditional_get
 from app.middlewares.token import get_entity_from_token
 from app.models.entity import Entity
+from app.models.transaction import Transaction
 from app.schemas.base import PaginationSchema
+from app.schemas.fast import fast_page
+from app.schemas.fields import FieldSelectionSchema, sparse_page
 from app.schemas.transaction import (
     TransactionCreateSchema,
     TransactionFiltersSchema,
@@ -36,15 +40,24 @@ def read_transaction(
     return transaction_service.get(transaction_id)
 
 
-@transaction_router.get("", response_model=PaginationSchema[TransactionSchema])
+@transaction_router.get(
+    "",
+    response_model=PaginationSchema[TransactionSchema],
+    dependencies=[Depends(get_entity_from_token), Depends(conditional_get())],
+)
 def read_transactions(
     filters: TransactionFiltersSchema = Depends(),
     skip: int = 0,
     limit: int = 100,
+    selection: FieldSelectionSchema = Depends(),
     transaction_service: TransactionService = Depends(get_transaction_service),
     actor_entity: Entity = Depends(get_entity_from_token),
 ):
-    return transaction_service.get_all(filters, skip, limit)
+    fields = selection.resolve(TransactionSchema, Transaction)
+    page = transaction_service.get_all(filters, skip, limit, fields=fields)
+    if fields is None:
+        return fast_page(page, TransactionSchema)
+    return sparse_page(page, TransactionSchema, fields)
 
 
 @transaction_router.patch("/{transaction_id}", response_model=TransactionSchema)
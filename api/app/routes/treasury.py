@@ -1,6 +1,7 @@
 """API routes for Treasury manipulation"""
 
 from app.dependencies.services import get_treasury_service
+from app.middlewares.conditional import conditional_get
 from app.middlewares.token import get_entity_from_token
 from app.models.entity import Entity
 from app.schemas.base import PaginationSchema
@@ -25,7 +26,11 @@ def create_treasury(
     return service.create(treasury)
 
 
-@treasury_router.get("/{treasury_id}", response_model=TreasurySchema)
+@treasury_router.get(
+    "/{treasury_id}",
+    response_model=TreasurySchema,
+    dependencies=[Depends(get_entity_from_token), Depends(conditional_get())],
+)
 def read_treasury(
     treasury_id: int,
     service: TreasuryService = Depends(get_treasury_service),
@@ -34,7 +39,11 @@ def read_treasury(
     return service.get(treasury_id)
 
 
-@treasury_router.get("", response_model=PaginationSchema[TreasurySchema])
+@treasury_router.get(
+    "",
+    response_model=PaginationSchema[TreasurySchema],
+    dependencies=[Depends(get_entity_from_token), Depends(conditional_get())],
+)
 def read_treasuries(
     filters: TreasuryFiltersSchema = Depends(),
     skip: int = 0,
@@ -12,3 +12,12 @@ class RecommendedDepositSchema(BaseSchema):
     entity_id: int
     currency: str | None = None
     amount: CurrencyDecimal | None = None
+
+
+class EntityOwedSchema(BaseSchema):
+    owed_by_currency: dict[str, CurrencyDecimal]
+    total_owed_usd: CurrencyDecimal
+    available_credit_usd: CurrencyDecimal
+    net_owed_usd: CurrencyDecimal
+    minimum_topup_currency: str | None = None
+    minimum_topup_amount: CurrencyDecimal | None = None
@@ -4,7 +4,13 @@ from datetime import datetime
 from decimal import Decimal
 from typing import Any, Generic, Optional, TypeVar
 
-from pydantic import BaseModel, ConfigDict, GetCoreSchemaHandler, GetJsonSchemaHandler
+from pydantic import (
+    BaseModel,
+    ConfigDict,
+    Field,
+    GetCoreSchemaHandler,
+    GetJsonSchemaHandler,
+)
 from pydantic_core import core_schema
 
 
@@ -101,10 +107,19 @@ class BaseUpdateSchema(BaseSchema):
 
 
 class BaseFilterSchema(BaseSchema):
+    # comma-separated ids, e.g. "3,1,2"; results keep this order
+    ids: str | None = Field(default=None, pattern=r"^\d+(,\d+)*$")
     comment: str | None = None
     created_before: datetime | None = None
     created_after: datetime | None = None
 
+    @property
+    def id_list(self) -> list[int]:
+        """``ids`` parsed, without repeats."""
+        if not self.ids:
+            return []
+        return list(dict.fromkeys(int(obj_id) for obj_id in self.ids.split(",")))
+
 
 M = TypeVar("M")
 
@@ -0,0 +1,22 @@
+"""DTO for the entity dashboard"""
+
+from app.schemas.balance import (
+    BalanceSchema,
+    EntityOwedSchema,
+    RecommendedDepositSchema,
+)
+from app.schemas.base import BaseSchema, PaginationSchema
+from app.schemas.entity import EntitySchema
+from app.schemas.invoice import InvoiceSchema
+from app.schemas.stripe_authorization import StripeAuthorizationSchema
+
+
+class DashboardSchema(BaseSchema):
+    entity: EntitySchema
+    balances: BalanceSchema
+    pending_invoices: PaginationSchema[InvoiceSchema]
+    recent_invoices: list[InvoiceSchema]
+    # None while currency rates are unavailable
+    owed: EntityOwedSchema | None = None
+    recommended_deposit: RecommendedDepositSchema
+    stripe_authorizations: list[StripeAuthorizationSchema]
@@ -3,7 +3,12 @@
 from typing import Literal, Optional
 
 from app.models.transaction import TransactionStatus
-from app.schemas.base import BaseFilterSchema, BaseReadSchema, BaseUpdateSchema
+from app.schemas.base import (
+    BaseFilterSchema,
+    BaseReadSchema,
+    BaseSchema,
+    BaseUpdateSchema,
+)
 from app.schemas.mixins.tags_filter_mixin import TagsFilterSchemaMixin
 from app.schemas.tag import TagSchema
 from pydantic import BaseModel, field_serializer, field_validator, model_serializer
@@ -43,6 +48,8 @@ class EntityUpdateSchema(BaseUpdateSchema):
 
 class EntityFiltersSchema(TagsFilterSchemaMixin, BaseFilterSchema):
     name: str | None = None
+    # case-insensitive substring of the name or comment
+    q: str | None = None
     active: bool | None = None
     auth_telegram_id: int | None = None
     balance_currency: str | None = None
@@ -52,3 +59,10 @@ class EntityFiltersSchema(TagsFilterSchemaMixin, BaseFilterSchema):
     @field_validator("balance_currency")
     def normalize_balance_currency(cls, v: str | None) -> str | None:
         return v.lower() if v else v
+
+
+class EntityFacetsSchema(BaseSchema):
+    # entities matching the filters
+    total: int
+    # tag id -> number of matching entities carrying it
+    tags: dict[int, int]
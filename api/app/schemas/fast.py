@@ -0,0 +1,182 @@
+"""Fast JSON serialization for large read responses.
+
+The standard path validates every ORM row into a response schema and then
+serializes the validated models. For rows that come straight from the
+database that validation only copies attributes, so large pages spend most of
+their time on it. ``encode`` instead walks the ORM objects along a plan
+compiled once per schema and produces plain dicts that orjson turns into
+bytes:
+
+- nested objects seen more than once (the same entity on many transactions)
+  are encoded once per response;
+- ``CurrencyDecimal`` values are collected during the walk and formatted in
+  one pass at the end;
+- everything else is passed to orjson as is.
+
+The output matches ``schema.model_validate(obj).model_dump(mode="json")``.
+Routes opt in with ``fast_page``; schemas with validators or custom
+serializers are rejected, since skipping validation would change their output.
+"""
+
+from decimal import Decimal
+from functools import lru_cache
+from types import NoneType, UnionType
+from typing import Any, Union, get_args, get_origin
+
+import orjson
+from app.schemas.base import BaseSchema, CurrencyDecimal, PaginationSchema
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, TypeAdapter
+
+# field kinds of a compiled plan
+_PASS, _CURRENCY, _MODEL, _LIST, _ADAPTER = range(5)
+_MISSING = object()
+_format_currency = "{:.2f}".format
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response rendered by orjson from already encoded content."""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(
+            content,
+            default=_default,
+            option=orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS,
+        )
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, (Decimal, CurrencyDecimal)):
+        return str(value)
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+class _Plan:
+    __slots__ = ("schema", "fields")
+
+    def __init__(self, schema: type[BaseModel]) -> None:
+        self.schema = schema
+        # (name, kind, argument, default) per schema field
+        self.fields: tuple[tuple[str, int, Any, Any], ...] = ()
+
+
+@lru_cache
+def _plan(schema: type[BaseModel]) -> _Plan:
+    decorators = schema.__pydantic_decorators__
+    if (
+        decorators.validators
+        or decorators.field_validators
+        or decorators.root_validators
+        or decorators.model_validators
+        or decorators.field_serializers
+        or decorators.model_serializers
+        or decorators.computed_fields
+    ):
+        raise TypeError(f"{schema.__name__} needs the standard serialization path")
+    plan = _Plan(schema)
+    plan.fields = tuple(
+        (
+            name,
+            *_field_kind(field.annotation),
+            _MISSING if field.is_required() else field.get_default(),
+        )
+        for name, field in schema.model_fields.items()
+    )
+    return plan
+
+
+def _field_kind(annotation: Any) -> tuple[int, Any]:
+    inner = _strip_optional(annotation)
+    if inner is CurrencyDecimal:
+        return _CURRENCY, None
+    if isinstance(inner, type) and issubclass(inner, BaseModel):
+        return _MODEL, _plan(inner)
+    if get_origin(inner) is list:
+        (item,) = get_args(inner)
+        if isinstance(item, type) and issubclass(item, BaseModel):
+            return _LIST, _plan(item)
+    if _mentions_schema_types(inner):
+        return _ADAPTER, TypeAdapter(annotation)
+    return _PASS, None
+
+
+def _strip_optional(annotation: Any) -> Any:
+    if get_origin(annotation) in (Union, UnionType):
+        args = [arg for arg in get_args(annotation) if arg is not NoneType]
+        if len(args) == 1:
+            return _strip_optional(args[0])
+    return annotation
+
+
+def _mentions_schema_types(annotation: Any) -> bool:
+    if annotation is CurrencyDecimal or (
+        isinstance(annotation, type) and issubclass(annotation, BaseModel)
+    ):
+        return True
+    return any(_mentions_schema_types(arg) for arg in get_args(annotation))
+
+
+class _Encoder:
+    def __init__(self) -> None:
+        # keeps the source object alive so its id is not reused
+        self._memo: dict[tuple[int, _Plan], tuple[Any, dict]] = {}
+        # (target dict, key, value) of CurrencyDecimal fields to format
+        self._currency: list[tuple[dict, str, Any]] = []
+
+    def encode(self, plan: _Plan, obj: Any) -> dict:
+        memo_key = (id(obj), plan)
+        seen = self._memo.get(memo_key)
+        if seen is not None:
+            return seen[1]
+        out: dict = {}
+        self._memo[memo_key] = (obj, out)
+        is_mapping = isinstance(obj, dict)
+        for name, kind, arg, default in plan.fields:
+            value = (
+                obj.get(name, default) if is_mapping else getattr(obj, name, default)
+            )
+            if value is _MISSING:
+                raise AttributeError(f"{plan.schema.__name__}.{name} is missing")
+            if value is None or kind == _PASS:
+                out[name] = value
+            elif kind == _CURRENCY:
+                out[name] = None
+                self._currency.append((out, name, value))
+            elif kind == _MODEL:
+                out[name] = self.encode(arg, value)
+            elif kind == _LIST:
+                out[name] = [self.encode(arg, item) for item in value]
+            else:
+                out[name] = arg.dump_python(
+                    arg.validate_python(value, from_attributes=True), mode="json"
+                )
+        return out
+
+    def format_currency(self) -> None:
+        values = [value for _, _, value in self._currency]
+        if all(type(value) is Decimal for value in values):
+            formatted = list(map(_format_currency, values))
+        else:
+            formatted = [str(CurrencyDecimal.validate(value)) for value in values]
+        for (out, name, _), text in zip(self._currency, formatted):
+            out[name] = text
+        self._currency.clear()
+
+
+def encode(schema: type[BaseModel], obj: Any) -> dict:
+    """*obj* (an ORM object or schema instance) as JSON-ready data of *schema*."""
+    encoder = _Encoder()
+    out = encoder.encode(_plan(schema), obj)
+    encoder.format_currency()
+    return out
+
+
+def fast_page(page: PaginationSchema, schema: type[BaseSchema]) -> FastJSONResponse:
+    """Serialize a page of ORM objects as ``PaginationSchema[schema]``.
+
+    The response bypasses the route's ``response_model``, which would validate
+    every item again.
+    """
+    return FastJSONResponse(encode(PaginationSchema[schema], page))  # type: ignore[valid-type]
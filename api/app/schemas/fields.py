@@ -0,0 +1,75 @@
+"""Sparse fieldsets for list endpoints.
+
+``fields=`` names the attributes to return and ``expand=`` the nested relations
+to embed, e.g. ``GET /transactions?fields=id,amount,currency&expand=to_entity``.
+Without either parameter responses are unchanged. With any of them, relations
+are embedded only when requested and the list query skips loading the rest.
+"""
+
+from functools import lru_cache
+
+from app.errors.common import UnknownFieldsError
+from app.models.base import BaseModel
+from app.schemas.base import BaseSchema, PaginationSchema
+from fastapi.responses import JSONResponse
+from pydantic import create_model
+from sqlalchemy import inspect
+
+
+class FieldSelectionSchema(BaseSchema):
+    # comma-separated attributes to return; all non-relation ones by default
+    fields: str | None = None
+    # comma-separated relations to embed; none by default
+    expand: str | None = None
+
+    def resolve(
+        self, schema: type[BaseSchema], model: type[BaseModel]
+    ) -> frozenset[str] | None:
+        """Names of *schema* fields to return, or None for the full schema."""
+        if self.fields is None and self.expand is None:
+            return None
+        relations = set(inspect(model).relationships.keys())
+        available = set(schema.model_fields)
+        fields = _split(self.fields) if self.fields is not None else None
+        expand = _split(self.expand)
+
+        unknown = ((fields or set()) - available) | (expand - (available & relations))
+        if unknown:
+            raise UnknownFieldsError(", ".join(sorted(unknown)))
+        if fields is None:
+            fields = available - relations
+        return frozenset({"id", *fields, *expand})
+
+
+def _split(value: str | None) -> set[str]:
+    return {name.strip() for name in (value or "").split(",") if name.strip()}
+
+
+@lru_cache
+def sparse_schema(schema: type[BaseSchema], names: frozenset[str]) -> type[BaseSchema]:
+    """*schema* reduced to *names*; serializing it reads no other attribute."""
+    return create_model(
+        f"{schema.__name__}Sparse",
+        __base__=BaseSchema,
+        **{
+            name: (field.annotation, field)
+            for name, field in schema.model_fields.items()
+            if name in names
+        },
+    )
+
+
+def sparse_page(
+    page: PaginationSchema, schema: type[BaseSchema], names: frozenset[str] | None
+) -> PaginationSchema | JSONResponse:
+    """Return *page* as is, or serialized with only the selected fields.
+
+    The sparse response bypasses the route's ``response_model``, which
+    requires every field.
+    """
+    if names is None:
+        return page
+    sparse = PaginationSchema[sparse_schema(schema, names)](  # type: ignore[misc]
+        items=page.items, total=page.total, skip=page.skip, limit=page.limit
+    )
+    return JSONResponse(sparse.model_dump(mode="json"))
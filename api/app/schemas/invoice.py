@@ -108,6 +108,8 @@ class InvoiceFiltersSchema(TagsFilterSchemaMixin, BaseFilterSchema):
     to_entity_id: int | None = None
     status: InvoiceStatus | None = None
     billing_period: date | None = None
+    # invoices that offer a payment option in this currency
+    currency: str | None = None
 
 
 class InvoiceAutoPayReportSchema(BaseSchema):
@@ -1,11 +1,13 @@
 """Schemas for POS operations."""
 
+from datetime import datetime
 from decimal import Decimal
+from typing import Literal
 
 from app.schemas.balance import BalanceSchema
 from app.schemas.base import BaseSchema
 from app.schemas.entity import EntitySchema
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class POSChargeRequest(BaseModel):
@@ -19,3 +21,34 @@ class POSChargeRequest(BaseModel):
 class POSChargeResponse(BaseSchema):
     entity: EntitySchema
     balance: BalanceSchema
+
+
+class POSSyncSale(POSChargeRequest):
+    # unique per sale, assigned by the terminal when the sale is recorded
+    client_id: str = Field(min_length=1, max_length=128)
+    recorded_at: datetime | None = None
+    # hex HMAC-SHA256 of the sale under the POS secret, see ``pos_sale_signature``
+    signature: str
+
+
+class POSSyncRequest(BaseModel):
+    sales: list[POSSyncSale] = Field(max_length=500)
+
+
+class POSSyncResult(BaseSchema):
+    client_id: str
+    status: Literal["applied", "duplicate", "failed"]
+    entity_id: int | None = None
+    transaction_id: int | None = None
+    error_code: int | None = None
+    error: str | None = None
+
+
+class POSSyncResponse(BaseSchema):
+    applied: int
+    duplicates: int
+    failed: int
+    # in request order
+    results: list[POSSyncResult]
+    # current balances of the entities charged by this batch
+    balances: dict[int, BalanceSchema]
@@ -116,3 +116,12 @@ class EntityStatsBundleSchema(HistoryStatsBundleSchema):
     )
     incoming_by_tag_by_month: list[TopTagByMonthSchema] = Field(default_factory=list)
     outgoing_by_tag_by_month: list[TopTagByMonthSchema] = Field(default_factory=list)
+
+
+class OutboundHostStatsSchema(BaseModel):
+    requests: int
+    errors: int
+    retries: int
+    avg_seconds: float | None
+    p50_seconds: float | None
+    p95_seconds: float | None
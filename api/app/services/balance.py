@@ -1,10 +1,15 @@
 """Balance service"""
 
+import threading
 from datetime import date, datetime, time
+from decimal import Decimal
 
+from app.data_versions import DataVersions
 from app.dependencies.services import get_entity_service
+from app.events import BALANCE_CHANGED, EventBroker
 from app.models.transaction import TransactionStatus
 from app.schemas.balance import BalanceSchema
+from app.schemas.base import CurrencyDecimal
 from app.services.balance_queries import (
     sum_entity_balances,
     sum_entity_balances_many,
@@ -13,13 +18,36 @@ from app.services.balance_queries import (
 from app.services.entity import EntityService
 from app.uow import get_uow
 from fastapi import Depends
+from sqlalchemy import event
 from sqlalchemy.orm import Session
 
+# completed transfers of a session not committed yet: {entity_id: {currency: delta}},
+# with None for entities whose transfers were partly rolled back
+_PENDING_TRANSFERS_KEY = "pending_balance_transfers"
+
+
+def _pending_transfers(db: Session) -> dict[int, dict[str, Decimal] | None]:
+    return db.info.get(_PENDING_TRANSFERS_KEY) or {}
+
+
+def _adjusted(balance: BalanceSchema, deltas: dict[str, Decimal]) -> BalanceSchema:
+    if not deltas:
+        return balance
+    completed = dict(balance.completed)
+    for currency, delta in deltas.items():
+        current = completed.get(currency)
+        completed[currency] = CurrencyDecimal(
+            (current.value if current is not None else Decimal("0")) + delta
+        )
+    return BalanceSchema(completed=completed, draft=balance.draft)
+
 
 class BalanceService:
     _cache = {}
     # cache for treasury balances
     _treasury_cache = {}
+    # serializes adjustments of cached entity balances by committed transfers
+    _cache_lock = threading.Lock()
 
     def __init__(
         self,
@@ -31,9 +59,64 @@ class BalanceService:
 
     def invalidate_cache_entry(self, entity_id: int):
         self._cache.pop(entity_id, None)
+        self._mark_changed(f"entity:{entity_id}")
 
     def invalidate_treasury_cache_entry(self, treasury_id: int):
         self._treasury_cache.pop(treasury_id, None)
+        self._mark_changed(f"treasury:{treasury_id}")
+
+    def _mark_changed(self, *subjects: str) -> None:
+        """Bump data versions and announce new balances once committed."""
+        DataVersions.bump(*subjects, db=self.db)
+        for subject in subjects:
+            EventBroker.publish_on_commit(self.db, subject, BALANCE_CHANGED)
+
+    def apply_completed_transfer(
+        self,
+        from_entity_id: int,
+        to_entity_id: int,
+        currency: str,
+        amount: Decimal,
+    ) -> None:
+        """Adjust cached balances for a new COMPLETED transfer between entities.
+
+        Used instead of ``invalidate_cache_entry`` on hot paths, so the next
+        balance read is not recomputed from the whole transaction history.
+        The shared cache is adjusted once the transaction commits; until then
+        only reads through this session see the transfer. Entities without a
+        cache entry are left to be computed on demand.
+        """
+        self._mark_changed(f"entity:{from_entity_id}", f"entity:{to_entity_id}")
+        pending = self.db.info.setdefault(_PENDING_TRANSFERS_KEY, {})
+        for entity_id, delta in ((from_entity_id, -amount), (to_entity_id, amount)):
+            deltas = pending.setdefault(entity_id, {})
+            if deltas is not None:
+                deltas[currency] = deltas.get(currency, Decimal("0")) + delta
+
+    @classmethod
+    def _apply_committed_transfers(
+        cls, pending: dict[int, dict[str, Decimal] | None]
+    ) -> None:
+        with cls._cache_lock:
+            for entity_id, deltas in pending.items():
+                cached = cls._cache.get(entity_id)
+                if deltas is None:
+                    cls._cache.pop(entity_id, None)
+                elif cached is not None:
+                    cls._cache[entity_id] = _adjusted(cached, deltas)
+
+    def _cache_committed(
+        self,
+        entity_id: int,
+        balance: BalanceSchema,
+        deltas: dict[str, Decimal] | None,
+    ) -> None:
+        """Cache *balance* read by this session without its uncommitted transfers."""
+        if deltas is None:
+            return
+        self._cache[entity_id] = _adjusted(
+            balance, {currency: -delta for currency, delta in deltas.items()}
+        )
 
     def get_balances(
         self, entity_id: int, end_date: date | None = None
@@ -48,10 +131,13 @@ class BalanceService:
         entity is created, edited (status) or deleted.
         """
         if end_date is None:
-            if entity_id in self._cache:
-                return self._cache[entity_id]
+            pending = _pending_transfers(self.db)
+            deltas = pending.get(entity_id, {})
+            cached = self._cache.get(entity_id)
+            if cached is not None and deltas is not None:
+                return _adjusted(cached, deltas)
             result = self._get_balances(entity_id)
-            self._cache[entity_id] = result
+            self._cache_committed(entity_id, result, deltas)
             return result
 
         return self._get_balances(entity_id, end_date=end_date)
@@ -87,10 +173,12 @@ class BalanceService:
         balances_by_entity: dict[int, BalanceSchema] = {}
         missing_ids: list[int] = []
 
+        pending = _pending_transfers(self.db)
         for entity_id in unique_entity_ids:
             cached = self._cache.get(entity_id)
-            if cached is not None:
-                balances_by_entity[entity_id] = cached
+            deltas = pending.get(entity_id, {})
+            if cached is not None and deltas is not None:
+                balances_by_entity[entity_id] = _adjusted(cached, deltas)
             else:
                 missing_ids.append(entity_id)
 
@@ -122,7 +210,7 @@ class BalanceService:
                     completed=completed_by_entity.get(entity_id, {}),
                     draft=draft_by_entity.get(entity_id, {}),
                 )
-                self._cache[entity_id] = result
+                self._cache_committed(entity_id, result, pending.get(entity_id, {}))
                 balances_by_entity[entity_id] = result
 
         return {
@@ -154,3 +242,20 @@ class BalanceService:
             ),
         )
         return result
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_committed_transfers(session: Session) -> None:
+    pending = session.info.pop(_PENDING_TRANSFERS_KEY, None)
+    if pending:
+        BalanceService._apply_committed_transfers(pending)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _drop_rolled_back_transfers(session: Session, previous_transaction) -> None:
+    pending = session.info.pop(_PENDING_TRANSFERS_KEY, None)
+    if not pending or not previous_transaction.nested:
+        return
+    # A savepoint may undo only some of the transfers: the balances involved
+    # are read from the database until the commit drops their cache entries.
+    session.info[_PENDING_TRANSFERS_KEY] = dict.fromkeys(pending)
@@ -1,14 +1,16 @@
 """Base service that incorporates business logic and CRUD operations."""
 
 import datetime
-from typing import Generic, Type, TypeVar
+from typing import Collection, Generic, Type, TypeVar
 
 from app.errors.common import NotFoundError
 from app.models.base import BaseModel
 from app.schemas.base import BaseFilterSchema, BaseUpdateSchema, PaginationSchema
 from app.uow import get_uow
 from fastapi import Depends
-from sqlalchemy.orm import Query, Session
+from sqlalchemy import case, inspect
+from sqlalchemy.orm import Query, Session, load_only
+from sqlalchemy.orm.interfaces import LoaderOption
 
 M = TypeVar("M", bound=BaseModel)  # model
 K = TypeVar("K", int, str)  # primary key
@@ -47,6 +49,8 @@ class BaseService(Generic[M]):
 
     def _apply_base_filters(self, query: Query[M], filters: BFS) -> Query[M]:
         """Common filters that are present for any database model"""
+        if filters.ids:
+            query = query.filter(self.model.id.in_(filters.id_list))
         if filters.comment is not None:
             query = query.filter(self.model.comment.ilike(f"%{filters.comment}%"))
         if filters.created_after is not None:
@@ -59,14 +63,61 @@ class BaseService(Generic[M]):
         """Filters for a particular model. To be overridden by child class."""
         return query
 
+    def _list_loaders(self) -> dict[str, LoaderOption]:
+        """Eager loads for ``get_all`` by the response field they serve, so
+        serializing a page does not lazy-load relationships row by row. To be
+        overridden by child class."""
+        return {}
+
+    def _list_query(self, fields: Collection[str] | None = None) -> Query[M]:
+        """Query for ``get_all``; with *fields*, loads only what they need."""
+        loaders = self._list_loaders()
+        query = self.db.query(self.model)
+        if fields is None:
+            return query.options(*loaders.values())
+        mapper = inspect(self.model)
+        columns = {"id", *fields}
+        for name in fields:
+            if name in mapper.relationships:
+                columns.update(
+                    column.key for column in mapper.relationships[name].local_columns
+                )
+        return query.options(
+            load_only(
+                *(
+                    getattr(self.model, attr.key)
+                    for attr in mapper.column_attrs
+                    if attr.key in columns
+                )
+            ),
+            *(loader for name, loader in loaders.items() if name in fields),
+        )
+
+    def _order_by_ids(self, query: Query[M], ids: list[int]) -> Query[M]:
+        """Order results as the ids were requested."""
+        return query.order_by(
+            case(
+                {obj_id: position for position, obj_id in enumerate(ids)},
+                value=self.model.id,
+            )
+        )
+
     def get_all(
-        self, filters: BFS | None = None, skip=0, limit=100
+        self,
+        filters: BFS | None = None,
+        skip=0,
+        limit=100,
+        fields: Collection[str] | None = None,
     ) -> PaginationSchema[M]:
-        query = self.db.query(self.model)
+        """Page of objects; *fields* limits loading to those response fields."""
+        query = self._list_query(fields)
         if filters:
             query = self._apply_base_filters(query, filters)
             query = self._apply_filters(query, filters)
-            query = query.order_by(self.model.id.desc())
+            if filters.ids:
+                query = self._order_by_ids(query, filters.id_list)
+            else:
+                query = query.order_by(self.model.id.desc())
         total = query.count()
         items = query.offset(skip).limit(limit).all()
         return PaginationSchema[M](items=items, total=total, skip=skip, limit=limit)
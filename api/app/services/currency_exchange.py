@@ -14,6 +14,7 @@ from app.dependencies.services import (
     get_transaction_service,
 )
 from app.errors.currency_exchange import CurrencyExchangeSourceOrTargetAmountZero
+from app.http import get_http_client
 from app.models.entity import Entity
 from app.models.transaction import TransactionStatus
 from app.schemas.base import CurrencyDecimal
@@ -62,6 +63,41 @@ class _ExchangePlanItem(NamedTuple):
     use_target_amount: bool = False
 
 
+class RateTable:
+    """GEL value of one unit of each currency from a single rates snapshot.
+
+    Compiled once per snapshot (see ``CurrencyExchangeService.rate_table``), so
+    converting amounts for many entities costs a dict lookup per currency.
+    """
+
+    def __init__(self, currencies: list[dict]) -> None:
+        # GEL is the base currency.
+        self._gel_per_unit: dict[str, Decimal] = {"gel": Decimal("1")}
+        for cur in currencies:
+            self._gel_per_unit.setdefault(
+                cur["code"].lower(),
+                Decimal(str(cur["rate"])) / Decimal(str(cur["quantity"])),
+            )
+
+    def gel_per_unit(self, code: str) -> Decimal:
+        code = code.lower()
+        try:
+            return self._gel_per_unit[code]
+        except KeyError:
+            raise ValueError(f"Currency {code} not found in rates data.") from None
+
+    def convert(
+        self, amount: Decimal, source_currency: str, target_currency: str
+    ) -> Decimal:
+        """``calculate_conversion(source_amount=amount, ...)``'s target amount."""
+        target = amount * (
+            self.gel_per_unit(source_currency) / self.gel_per_unit(target_currency)
+        )
+        if target <= 0 or amount <= 0:
+            raise CurrencyExchangeSourceOrTargetAmountZero
+        return target.quantize(Decimal("0.01"), rounding=ROUND_DOWN)
+
+
 class CurrencyExchangeService:
     rates_ttl_seconds = timedelta(hours=1).total_seconds()
     rates_request_timeout_seconds: tuple[float, float] = (2.0, 3.0)
@@ -70,6 +106,7 @@ class CurrencyExchangeService:
     _rates_cache: list[dict] | None = None
     _rates_cached_at: float = 0.0
     _rates_lock = threading.Lock()
+    _rate_table: tuple[list[dict], RateTable] | None = None
 
     def __init__(
         self,
@@ -138,7 +175,7 @@ class CurrencyExchangeService:
             ) from provider_errors[-1][1]
 
     def _fetch_nbg_rates(self) -> list[dict]:
-        response = requests.get(
+        response = get_http_client().get(
             self.nbg_rates_url,
             timeout=self.rates_request_timeout_seconds,
         )
@@ -152,7 +189,7 @@ class CurrencyExchangeService:
         return rates
 
     def _fetch_frankfurter_rates(self) -> list[dict]:
-        response = requests.get(
+        response = get_http_client().get(
             self.frankfurter_rates_url,
             timeout=self.rates_request_timeout_seconds,
         )
@@ -198,6 +235,14 @@ class CurrencyExchangeService:
             }
         ]
 
+    def rate_table(self) -> RateTable:
+        """The current rates compiled for lookup; rebuilt when the rates change."""
+        rates = self._raw_rates
+        cls = self.__class__
+        if cls._rate_table is None or cls._rate_table[0] is not rates:
+            cls._rate_table = (rates, RateTable(rates[0]["currencies"]))
+        return cls._rate_table[1]
+
     def calculate_conversion(
         self,
         source_amount: Optional[Decimal],
@@ -212,25 +257,9 @@ class CurrencyExchangeService:
         Returns a tuple of (computed_source_amount, computed_target_amount, conversion_rate)
         where conversion_rate is the rate for converting one unit of source into target.
         """
-        currencies = self._raw_rates[0]["currencies"]
-
-        def get_currency_info(code: str):
-            code = code.lower()
-            if code == "gel":
-                # GEL is the base currency.
-                return {"rate": Decimal("1"), "quantity": Decimal("1")}
-            cur = next((cur for cur in currencies if cur["code"].lower() == code), None)
-            if cur is None:
-                raise ValueError(f"Currency {code} not found in rates data.")
-            return {
-                "rate": Decimal(str(cur["rate"])),
-                "quantity": Decimal(str(cur["quantity"])),
-            }
-
-        source_info = get_currency_info(source_currency)
-        target_info = get_currency_info(target_currency)
-        gel_per_source = source_info["rate"] / source_info["quantity"]
-        gel_per_target = target_info["rate"] / target_info["quantity"]
+        rates = self.rate_table()
+        gel_per_source = rates.gel_per_unit(source_currency)
+        gel_per_target = rates.gel_per_unit(target_currency)
 
         # Conversion rate: how many units of target currency per one unit of source currency.
         conversion_rate = gel_per_source / gel_per_target
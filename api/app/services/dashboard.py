@@ -0,0 +1,67 @@
+"""Everything the UI landing page shows about the signed-in entity."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from app.models.entity import Entity
+from app.models.invoice import InvoiceStatus
+from app.schemas.invoice import InvoiceFiltersSchema
+from sqlalchemy.orm import Session
+
+if TYPE_CHECKING:
+    from app.services.balance import BalanceService
+    from app.services.entity_owed import EntityOwedService
+    from app.services.invoice import InvoiceService
+    from app.services.stripe_authorization import StripeAuthorizationService
+
+
+class DashboardService:
+    """Compose the dashboard from the entity's services in one unit of work."""
+
+    pending_invoices_limit = 500
+    recent_invoices_limit = 6
+
+    def __init__(
+        self,
+        db: Session,
+        balance_service: "BalanceService",
+        invoice_service: "InvoiceService",
+        entity_owed_service: "EntityOwedService",
+        stripe_authorization_service: "StripeAuthorizationService",
+    ) -> None:
+        self.db = db
+        self.balance_service = balance_service
+        self.invoice_service = invoice_service
+        self.entity_owed_service = entity_owed_service
+        self.stripe_authorization_service = stripe_authorization_service
+
+    def get(self, entity: Entity) -> dict[str, Any]:
+        owed, (currency, amount) = self.entity_owed_service.summarize(entity.id)
+        return {
+            "entity": entity,
+            "balances": self.balance_service.get_balances(entity.id),
+            "pending_invoices": self.invoice_service.get_all(
+                InvoiceFiltersSchema(
+                    from_entity_id=entity.id,
+                    status=InvoiceStatus.PENDING,
+                    tags_ids=[],
+                ),
+                0,
+                self.pending_invoices_limit,
+            ),
+            "recent_invoices": self.invoice_service.get_all(
+                InvoiceFiltersSchema(from_entity_id=entity.id, tags_ids=[]),
+                0,
+                self.recent_invoices_limit,
+            ).items,
+            "owed": owed,
+            "recommended_deposit": {
+                "entity_id": entity.id,
+                "currency": currency,
+                "amount": amount,
+            },
+            "stripe_authorizations": (
+                self.stripe_authorization_service.list_for_entity(entity.id)
+            ),
+        }
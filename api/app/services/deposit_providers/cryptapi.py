@@ -3,10 +3,10 @@
 from decimal import Decimal
 from uuid import UUID
 
-import requests
 from app.config import Config, get_config
 from app.dependencies.services import get_deposit_service
 from app.errors.deposit import DepositAmountIncorrect
+from app.http import get_http_client
 from app.models.deposit import Deposit
 from app.models.entity import Entity
 from app.schemas.deposit import DepositCreateSchema, DepositUpdateSchema
@@ -41,7 +41,9 @@ class CryptAPIDepositProviderService(BaseService[Entity]):
         self, schema: CryptAPIDepositCreateSchema, actor_entity: Entity
     ) -> Deposit:
         # check minimum amount accepted by cryptapi
-        check = requests.get(f"http://api.cryptapi.io/{schema.coin}/info/").json()
+        check = (
+            get_http_client().get(f"http://api.cryptapi.io/{schema.coin}/info/").json()
+        )
         if schema.amount < (m := Decimal(check["minimum_transaction_coin"])):
             raise DepositAmountIncorrect(f"minimum amount for this coin is {m}")
 
@@ -69,7 +71,7 @@ class CryptAPIDepositProviderService(BaseService[Entity]):
         confirmations = {"trc20/usdt": 1, "erc20/usdt": 15}
 
         # create address via crypatpi
-        r = requests.get(
+        r = get_http_client().get(
             f"https://api.cryptapi.io/{schema.coin}/create/",
             params={
                 "callback": f"{self.config.api_url}/deposit-callbacks/cryptapi/{d.uuid}",
@@ -77,6 +79,8 @@ class CryptAPIDepositProviderService(BaseService[Entity]):
                 "confirmations": confirmations[schema.coin],
                 "post": 1,
             },
+            # creates an address; do not risk duplicating it
+            retry=False,
         )
         cryptapi_response = r.json()
         self.deposit_service.update(
@@ -1,5 +1,6 @@
 """Keepz deposit provider service."""
 
+import logging
 import random
 import string
 from decimal import Decimal
@@ -9,11 +10,7 @@ from app.config import Config, get_config
 from app.dependencies.services import get_deposit_service, get_keepz_service
 from app.models.deposit import Deposit, DepositStatus
 from app.models.entity import Entity
-from app.schemas.deposit import (
-    DepositCreateSchema,
-    DepositFiltersSchema,
-    DepositUpdateSchema,
-)
+from app.schemas.deposit import DepositCreateSchema, DepositUpdateSchema
 from app.schemas.deposit_providers.keepz import KeepzDepositCreateSchema
 from app.seeding import keepz_deposit_provider, keepz_treasury
 from app.services.base import BaseService
@@ -21,8 +18,17 @@ from app.services.deposit import DepositService
 from app.services.keepz import KeepzService
 from app.uow import get_uow
 from fastapi import Depends
+from sqlalchemy import exists
 from sqlalchemy.orm import Session
 
+logger = logging.getLogger(__name__)
+
+_SYNC_PAGE_SIZE = 50
+# Upper bound of pages read per poll when catching up after a long pause.
+_SYNC_MAX_PAGES = 20
+_SUCCESS_STATUSES = {"SUCCESS", "COMPLETED", "APPROVED", "DONE", "PAID"}
+_FAILED_STATUSES = {"FAILED", "CANCELLED", "REJECTED", "DECLINED"}
+
 
 class KeepzDepositProviderService(BaseService[Entity]):
     def __init__(
@@ -86,59 +92,146 @@ class KeepzDepositProviderService(BaseService[Entity]):
                 details=details,
                 to_treasury_id=keepz_treasury.id,
             ),
-            overrides={"actor_entity_id": actor_entity.id},
+            overrides={"actor_entity_id": actor_entity.id, "keepz_note": note},
         )
 
     def poll_pending_deposits(self) -> int:
-        pending = self._list_pending_deposits()
-        if not pending:
+        """Sync Keepz transactions made since the stored cursor.
+
+        Keepz lists transactions newest first, so pages are read only until one
+        reaches the last transaction id seen by the previous sync. New
+        transactions are matched to pending deposits through the indexed
+        ``keepz_note`` column. Matched transactions that are not final yet are
+        kept in the cursor and re-fetched one by one until they settle. While
+        nothing is pending only the newest transaction is read, to move the
+        cursor past payments no deposit can claim.
+        """
+        if not self._has_pending_deposits():
+            self._advance_cursor_to_latest()
             return 0
 
-        transactions_payload = self.keepz_service.list_transactions()
-        transactions_by_note = self._index_transactions_by_note(transactions_payload)
+        cursor = self.keepz_service.get_transactions_cursor()
+        last_id = cursor.get("last_id")
+        new_transactions = self._fetch_new_transactions(last_id)
 
         processed = 0
-        for deposit in pending:
-            note = (deposit.details or {}).get("keepz", {}).get("note")
-            if not note:
+        unsettled: list[list[int]] = []
+        for transaction_id, deposit_id in cursor.get("unsettled") or []:
+            deposit = self.db.get(Deposit, deposit_id)
+            if deposit is None or deposit.status != DepositStatus.PENDING:
                 continue
-            tx = transactions_by_note.get(note)
-            if tx is None:
+            tx = self.keepz_service.get_transaction(transaction_id)
+            if self._apply_transaction_to_deposit(deposit, tx):
+                processed += 1
+            else:
+                unsettled.append([transaction_id, deposit_id])
+
+        deposits_by_note = self._pending_deposits_by_note(
+            {tx.note for tx in new_transactions if tx.note}
+        )
+        # Oldest first, so that reused notes are matched in payment order.
+        for tx in sorted(new_transactions, key=lambda tx: tx.id):
+            candidates = deposits_by_note.get(tx.note or "")
+            if not candidates:
                 continue
+            deposit = candidates.pop(0)
             if self._apply_transaction_to_deposit(deposit, tx):
                 processed += 1
+            else:
+                unsettled.append([tx.id, deposit.id])
+
+        if new_transactions:
+            last_id = max([tx.id for tx in new_transactions] + [last_id or 0])
+        self.keepz_service.save_transactions_cursor(
+            {"last_id": last_id, "unsettled": unsettled}
+        )
         return processed
 
-    def _list_pending_deposits(self) -> list[Deposit]:
-        filters = DepositFiltersSchema(
-            provider="keepz", status=DepositStatus.PENDING, tags_ids=[]
+    def _advance_cursor_to_latest(self) -> None:
+        payload = self.keepz_service.list_transactions(page=0, limit=1)
+        page = payload.transactionsPage
+        latest = [tx.id for tx in (page.content if page else None) or [] if tx.id]
+        if not latest:
+            return
+        last_id = self.keepz_service.get_transactions_cursor().get("last_id")
+        self.keepz_service.save_transactions_cursor(
+            {"last_id": max(latest + [last_id or 0]), "unsettled": []}
         )
-        page = self.deposit_service.get_all(filters, skip=0, limit=200)
-        return list(page.items)
 
-    def _generate_unique_note(self, attempts: int = 10) -> str:
-        pending = self._list_pending_deposits()
-        existing_notes = {
-            (d.details or {}).get("keepz", {}).get("note") for d in pending
-        }
-        existing_notes.discard(None)
-        for _ in range(attempts):
-            length = random.randint(2, 5)
-            pool = (
-                string.digits
-                if random.choice([True, False])
-                else string.ascii_lowercase
+    def _fetch_new_transactions(self, last_id: int | None) -> list[Any]:
+        """Page through transactions newer than *last_id*.
+
+        Without a cursor (first sync) only the latest page is read.
+        """
+        transactions: list[Any] = []
+        for page_number in range(_SYNC_MAX_PAGES):
+            payload = self.keepz_service.list_transactions(
+                page=page_number, limit=_SYNC_PAGE_SIZE
             )
-            note = "".join(random.choice(pool) for _ in range(length))
-            if note not in existing_notes:
-                return note
+            page = payload.transactionsPage
+            items = [tx for tx in (page.content if page else None) or [] if tx.id]
+            new_items = [tx for tx in items if last_id is None or tx.id > last_id]
+            transactions.extend(new_items)
+            if (
+                last_id is None
+                or not items
+                or len(new_items) < len(items)
+                or (page is not None and page.last)
+            ):
+                break
+        else:
+            logger.warning(
+                "Keepz sync read %d pages without reaching transaction id=%s",
+                _SYNC_MAX_PAGES,
+                last_id,
+            )
+        return transactions
+
+    def _has_pending_deposits(self) -> bool:
+        return self.db.query(
+            exists().where(
+                Deposit.provider == "keepz",
+                Deposit.status == DepositStatus.PENDING,
+            )
+        ).scalar()
+
+    def _pending_deposits_by_note(self, notes: set[str]) -> dict[str, list[Deposit]]:
+        if not notes:
+            return {}
+        deposits = (
+            self.db.query(Deposit)
+            .filter(
+                Deposit.keepz_note.in_(notes),
+                Deposit.provider == "keepz",
+                Deposit.status == DepositStatus.PENDING,
+            )
+            .order_by(Deposit.id)
+            .all()
+        )
+        by_note: dict[str, list[Deposit]] = {}
+        for deposit in deposits:
+            by_note.setdefault(deposit.keepz_note, []).append(deposit)
+        return by_note
+
+    @staticmethod
+    def _random_note(length: int) -> str:
         pool = string.digits if random.choice([True, False]) else string.ascii_lowercase
-        return "".join(random.choice(pool) for _ in range(5))
+        return "".join(random.choice(pool) for _ in range(length))
 
-    def _index_transactions_by_note(self, payload: Any) -> dict[str, Any]:
-        page = payload.transactionsPage
-        items = page.content or []
-        return {tx.note: tx for tx in items if tx.note}
+    def _generate_unique_note(self, attempts: int = 10) -> str:
+        candidates = [self._random_note(random.randint(2, 5)) for _ in range(attempts)]
+        taken = {
+            note
+            for (note,) in self.db.query(Deposit.keepz_note).filter(
+                Deposit.keepz_note.in_(candidates),
+                Deposit.provider == "keepz",
+                Deposit.status == DepositStatus.PENDING,
+            )
+        }
+        for note in candidates:
+            if note not in taken:
+                return note
+        return self._random_note(5)
 
     def _apply_transaction_to_deposit(self, deposit: Deposit, tx: Any) -> bool:
         tx_dict = tx.model_dump()
@@ -162,10 +255,7 @@ class KeepzDepositProviderService(BaseService[Entity]):
 
         self.deposit_service.update(deposit.id, DepositUpdateSchema(details=details))
 
-        success_statuses = {"SUCCESS", "COMPLETED", "APPROVED", "DONE", "PAID"}
-        failed_statuses = {"FAILED", "CANCELLED", "REJECTED", "DECLINED"}
-
-        if status in success_statuses:
+        if status in _SUCCESS_STATUSES:
             if amount_value is not None:
                 amount = Decimal(str(amount_value)).quantize(Decimal("0.01"))
                 self.deposit_service.update(
@@ -173,7 +263,7 @@ class KeepzDepositProviderService(BaseService[Entity]):
                 )
             self.deposit_service.complete(deposit.id)
             return True
-        if status in failed_statuses:
+        if status in _FAILED_STATUSES:
             self.deposit_service.update(
                 deposit.id, DepositUpdateSchema(status=DepositStatus.FAILED)
             )
@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+import datetime
+import logging
 from decimal import Decimal
 from typing import Any
 
@@ -22,6 +24,8 @@ from app.uow import get_uow
 from fastapi import Depends
 from sqlalchemy.orm import Session
 
+logger = logging.getLogger(__name__)
+
 
 class StripeDepositProviderService:
     def __init__(
@@ -103,22 +107,42 @@ class StripeDepositProviderService:
         )
 
     def poll_pending_deposits(self) -> int:
-        pending = self._list_pending_deposits()
-        if not pending:
-            return 0
+        """Refresh pending deposits whose poll back-off has elapsed.
 
-        processed = 0
-        for deposit in pending:
+        Checkout sessions are fetched from Stripe concurrently; only the API
+        calls run on the thread pool, the results are applied on this session.
+        """
+        now = datetime.datetime.now()
+        due: list[tuple[Deposit, str]] = []
+        for deposit in self._list_pending_deposits():
             stripe_details = (deposit.details or {}).get("stripe") or {}
             session_id = stripe_details.get("checkout_session_id")
             if not session_id:
                 continue
+            next_poll_at = self._parse_timestamp(stripe_details.get("next_poll_at"))
+            if next_poll_at is not None and next_poll_at > now:
+                continue
+            due.append((deposit, session_id))
+        if not due:
+            return 0
 
-            session = self.stripe_service.retrieve_checkout_session(session_id)
-            session_obj = self._session_to_dict(session)
+        sessions = self.stripe_service.call_concurrently(
+            self.stripe_service.retrieve_checkout_session,
+            [session_id for _, session_id in due],
+        )
+        processed = 0
+        for (deposit, session_id), session in zip(due, sessions):
+            if isinstance(session, Exception):
+                logger.warning(
+                    "Failed to retrieve checkout session %s for deposit %s: %s",
+                    session_id,
+                    deposit.id,
+                    session,
+                )
+                continue
             if self._apply_checkout_session_to_deposit(
                 deposit,
-                session_obj=session_obj,
+                session_obj=self._session_to_dict(session),
                 last_event_id=f"poll:{session_id}",
             ):
                 processed += 1
@@ -149,6 +173,15 @@ class StripeDepositProviderService:
             "metadata": getattr(session, "metadata", None) or {},
         }
 
+    @staticmethod
+    def _parse_timestamp(value: Any) -> datetime.datetime | None:
+        if not value:
+            return None
+        try:
+            return datetime.datetime.fromisoformat(str(value))
+        except ValueError:
+            return None
+
     def _apply_checkout_session_to_deposit(
         self,
         deposit: Deposit,
@@ -169,6 +202,19 @@ class StripeDepositProviderService:
                 "status": session_obj.get("status"),
             }
         )
+        now = datetime.datetime.now()
+        if previous_status != stripe_details.get(
+            "status"
+        ) or previous_payment_status != stripe_details.get("payment_status"):
+            stripe_details["status_changed_at"] = now.isoformat()
+        last_change = (
+            self._parse_timestamp(stripe_details.get("status_changed_at"))
+            or deposit.created_at
+            or now
+        )
+        stripe_details["next_poll_at"] = self.stripe_service.next_poll_at(
+            last_change, now
+        ).isoformat()
         details["stripe"] = stripe_details
         self.deposit_service.update(
             deposit.id,
@@ -1,14 +1,16 @@
 """Entity service"""
 
 import datetime
+from typing import Collection
 
 from app.dependencies.services import get_tag_service
 from app.errors.common import NotFoundError
-from app.models.entity import Entity
+from app.models.entity import Entity, entities_tags
 from app.models.transaction import TransactionStatus
 from app.schemas.base import PaginationSchema
 from app.schemas.entity import (
     EntityCreateSchema,
+    EntityFacetsSchema,
     EntityFiltersSchema,
     EntityUpdateSchema,
 )
@@ -18,8 +20,9 @@ from app.services.mixins.taggable_mixin import TaggableServiceMixin
 from app.services.tag import TagService
 from app.uow import get_uow
 from fastapi import Depends
-from sqlalchemy import BigInteger, Text, cast
-from sqlalchemy.orm import Query, Session
+from sqlalchemy import BigInteger, Text, cast, or_
+from sqlalchemy.orm import Query, Session, selectinload
+from sqlalchemy.orm.interfaces import LoaderOption
 from sqlalchemy.sql import func
 
 
@@ -43,21 +46,39 @@ class EntityService(TaggableServiceMixin[Entity], BaseService[Entity]):
     ) -> Query[Entity]:
         if filters.name is not None:
             query = query.filter(self.model.name.ilike(f"%{filters.name}%"))
+        if filters.q:
+            # served by the trigram indexes on name and comment
+            query = query.filter(
+                or_(
+                    self.model.name.icontains(filters.q, autoescape=True),
+                    self.model.comment.icontains(filters.q, autoescape=True),
+                )
+            )
         if filters.active is not None:
             query = query.filter(self.model.active == filters.active)
         if filters.auth_telegram_id is not None:
             query = query.filter(
-                cast(func.nullif(self.model.auth.op("->>")("telegram_id"), ""), BigInteger)
+                cast(
+                    func.nullif(self.model.auth.op("->>")("telegram_id"), ""),
+                    BigInteger,
+                )
                 == filters.auth_telegram_id
             )
         if filters.tags_ids:
             query = self._apply_tag_filters(query, filters.tags_ids)
         return query
 
+    def _list_loaders(self) -> dict[str, LoaderOption]:
+        return {"tags": selectinload(self.model.tags)}
+
     def get_all(
-        self, filters: EntityFiltersSchema | None = None, skip=0, limit=100
+        self,
+        filters: EntityFiltersSchema | None = None,
+        skip=0,
+        limit=100,
+        fields: Collection[str] | None = None,
     ) -> PaginationSchema[Entity]:
-        query = self.db.query(self.model)
+        query = self._list_query(fields)
         if filters:
             query = self._apply_base_filters(query, filters)
             query = self._apply_filters(query, filters)
@@ -79,6 +100,8 @@ class EntityService(TaggableServiceMixin[Entity], BaseService[Entity]):
                     query = query.order_by(balance_expr.asc(), self.model.id.desc())
                 else:
                     query = query.order_by(balance_expr.desc(), self.model.id.desc())
+            elif filters.ids:
+                query = self._order_by_ids(query, filters.id_list)
             else:
                 query = query.order_by(self.model.id.desc())
         total = query.count()
@@ -87,11 +110,33 @@ class EntityService(TaggableServiceMixin[Entity], BaseService[Entity]):
             items=items, total=total, skip=skip, limit=limit
         )
 
+    def get_facets(self, filters: EntityFiltersSchema) -> EntityFacetsSchema:
+        """Count matching entities per tag with one GROUP BY on entities_tags."""
+        matching = self._apply_filters(
+            self._apply_base_filters(self.db.query(self.model.id), filters), filters
+        )
+        rows = (
+            self.db.query(
+                entities_tags.c.tag_id,
+                func.count(func.distinct(entities_tags.c.entity_id)),
+            )
+            .filter(entities_tags.c.entity_id.in_(matching.subquery().select()))
+            .group_by(entities_tags.c.tag_id)
+            .all()
+        )
+        return EntityFacetsSchema(
+            total=matching.count(), tags={tag_id: count for tag_id, count in rows}
+        )
+
     def get_by_telegram_id(self, telegram_id: int) -> Entity:
         db_obj = (
             self.db.query(self.model)
             .filter(
-                cast(func.nullif(self.model.auth.op("->>")("telegram_id"), ""), BigInteger) == telegram_id
+                cast(
+                    func.nullif(self.model.auth.op("->>")("telegram_id"), ""),
+                    BigInteger,
+                )
+                == telegram_id
             )
             .first()
         )
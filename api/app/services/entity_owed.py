@@ -9,11 +9,12 @@ from typing import TYPE_CHECKING, Callable, Iterable, Mapping
 
 import requests
 from app.models.invoice import Invoice, InvoiceStatus
+from app.services.invoice_queries import sum_invoice_currency_options_by_payer
 from sqlalchemy.orm import Session
 
 if TYPE_CHECKING:
     from app.services.balance import BalanceService
-    from app.services.currency_exchange import CurrencyExchangeService
+    from app.services.currency_exchange import CurrencyExchangeService, RateTable
 
 logger = logging.getLogger(__name__)
 
@@ -180,6 +181,39 @@ def calculate_entity_owed(
     )
 
 
+def _calculate_entity_owed_or_raise(
+    *,
+    pending_invoices: list[Mapping[str, Decimal]],
+    completed_balances: Mapping[str, Decimal],
+    convert_amount: Callable[[Decimal, str, str], Decimal],
+) -> EntityOwedSummary:
+    """``calculate_entity_owed`` that raises a currency rates outage.
+
+    ``calculate_entity_owed`` leaves out invoice options it cannot convert,
+    which during an outage would understate the debt.
+    """
+    conversion_error: requests.RequestException | None = None
+
+    def convert_with_outage_tracking(
+        amount: Decimal, source_currency: str, target_currency: str
+    ) -> Decimal:
+        nonlocal conversion_error
+        try:
+            return convert_amount(amount, source_currency, target_currency)
+        except requests.RequestException as exc:
+            conversion_error = exc
+            raise
+
+    summary = calculate_entity_owed(
+        pending_invoices=pending_invoices,
+        completed_balances=completed_balances,
+        convert_amount=convert_with_outage_tracking,
+    )
+    if conversion_error is not None:
+        raise conversion_error
+    return summary
+
+
 def calculate_same_currency_invoice_topup(
     *,
     pending_invoices: list[Mapping[str, Decimal]],
@@ -232,61 +266,122 @@ class EntityOwedService:
         self.balance_service = balance_service
         self.currency_exchange_service = currency_exchange_service
 
-    def _load_inputs(
-        self, entity_id: int
-    ) -> tuple[list[dict[str, Decimal]], dict[str, Decimal]]:
-        pending_invoices = (
-            self.db.query(Invoice)
-            .filter(
-                Invoice.from_entity_id == entity_id,
+    def _load_inputs_many(
+        self, entity_ids: list[int]
+    ) -> dict[int, tuple[list[dict[str, Decimal]], dict[str, Decimal]]]:
+        if not entity_ids:
+            return {}
+        balances = self.balance_service.get_balances_many(entity_ids)
+        invoices_by_entity = sum_invoice_currency_options_by_payer(
+            db=self.db,
+            filters=[
+                Invoice.from_entity_id.in_(balances),
                 Invoice.status == InvoiceStatus.PENDING,
-            )
-            .all()
+            ],
         )
-        invoice_options = [
-            options
-            for invoice in pending_invoices
-            if (options := invoice_currency_options(invoice))
-        ]
-
-        balance = self.balance_service.get_balances(entity_id)
-        completed_balances = {
-            str(currency or "").lower().strip(): amount.value
-            for currency, amount in balance.completed.items()
-            if str(currency or "").strip()
+        return {
+            entity_id: (
+                invoices_by_entity.get(entity_id, []),
+                {
+                    str(currency or "").lower().strip(): amount.value
+                    for currency, amount in balance.completed.items()
+                    if str(currency or "").strip()
+                },
+            )
+            for entity_id, balance in balances.items()
         }
-        return invoice_options, completed_balances
 
     def calculate(self, entity_id: int) -> EntityOwedSummary:
-        invoice_options, completed_balances = self._load_inputs(entity_id)
+        invoice_options, completed_balances = self._load_inputs_many([entity_id])[
+            entity_id
+        ]
         return calculate_entity_owed(
             pending_invoices=invoice_options,
             completed_balances=completed_balances,
-            convert_amount=self._convert_amount,
+            convert_amount=self._rate_converter(),
         )
 
+    def calculate_many(self, entity_ids: list[int]) -> dict[int, EntityOwedSummary]:
+        """Owed summaries for many entities from one invoice and one balance query.
+
+        All conversions read one compiled rate table. An entity whose debt
+        cannot be calculated is logged and left out of the result.
+        """
+        convert_amount = self._rate_converter()
+        summaries: dict[int, EntityOwedSummary] = {}
+        for entity_id, (
+            invoice_options,
+            completed_balances,
+        ) in self._load_inputs_many(entity_ids).items():
+            try:
+                summaries[entity_id] = calculate_entity_owed(
+                    pending_invoices=invoice_options,
+                    completed_balances=completed_balances,
+                    convert_amount=convert_amount,
+                )
+            except Exception:
+                logger.error(
+                    "Owed amount could not be calculated for entity %s",
+                    entity_id,
+                    exc_info=True,
+                )
+        return summaries
+
     def recommended_deposit(self, entity_id: int) -> tuple[str | None, Decimal | None]:
-        invoice_options, completed_balances = self._load_inputs(entity_id)
-        conversion_error: requests.RequestException | None = None
+        return self.recommended_deposit_many([entity_id])[entity_id]
+
+    def recommended_deposit_many(
+        self, entity_ids: list[int]
+    ) -> dict[int, tuple[str | None, Decimal | None]]:
+        convert_amount = self._rate_converter()
+        return {
+            entity_id: self._recommended_deposit(
+                entity_id, invoice_options, completed_balances, convert_amount
+            )
+            for entity_id, (
+                invoice_options,
+                completed_balances,
+            ) in self._load_inputs_many(entity_ids).items()
+        }
 
-        def convert_with_outage_tracking(
-            amount: Decimal, source_currency: str, target_currency: str
-        ) -> Decimal:
-            nonlocal conversion_error
-            try:
-                return self._convert_amount(amount, source_currency, target_currency)
-            except requests.RequestException as exc:
-                conversion_error = exc
-                raise
+    def summarize(
+        self, entity_id: int
+    ) -> tuple[EntityOwedSummary | None, tuple[str | None, Decimal | None]]:
+        """Owed summary and recommended deposit from one load of their inputs.
+
+        The summary is ``None`` while currency rates are unavailable; the
+        deposit then falls back to the same-currency invoice shortfall.
+        """
+        invoice_options, completed_balances = self._load_inputs_many([entity_id])[
+            entity_id
+        ]
+        convert_amount = self._rate_converter()
+        summary: EntityOwedSummary | None
+        try:
+            summary = _calculate_entity_owed_or_raise(
+                pending_invoices=invoice_options,
+                completed_balances=completed_balances,
+                convert_amount=convert_amount,
+            )
+        except requests.RequestException:
+            summary = None
+        return summary, self._recommended_deposit(
+            entity_id, invoice_options, completed_balances, convert_amount
+        )
 
+    def _recommended_deposit(
+        self,
+        entity_id: int,
+        invoice_options: list[dict[str, Decimal]],
+        completed_balances: dict[str, Decimal],
+        convert_amount: Callable[[Decimal, str, str], Decimal],
+    ) -> tuple[str | None, Decimal | None]:
         try:
-            summary = calculate_entity_owed(
+            summary = _calculate_entity_owed_or_raise(
                 pending_invoices=invoice_options,
                 completed_balances=completed_balances,
-                convert_amount=convert_with_outage_tracking,
+                convert_amount=convert_amount,
             )
-            if conversion_error is not None:
-                raise conversion_error
             return (
                 summary.minimum_topup_currency,
                 self._round_recommended_deposit(summary.minimum_topup_amount),
@@ -310,18 +405,32 @@ class EntityOwedService:
             return None
         return amount.to_integral_value(rounding=ROUND_CEILING)
 
-    def _convert_amount(
-        self, amount: Decimal, source_currency: str, target_currency: str
-    ) -> Decimal:
-        source = str(source_currency or "").lower().strip()
-        target = str(target_currency or "").lower().strip()
-        decimal_amount = Decimal(str(amount or "0"))
-        if decimal_amount == 0 or source == target:
-            return decimal_amount
-        _, target_amount, _ = self.currency_exchange_service.calculate_conversion(
-            source_amount=decimal_amount,
-            target_amount=None,
-            source_currency=source,
-            target_currency=target,
-        )
-        return Decimal(str(target_amount))
+    def _rate_converter(self) -> Callable[[Decimal, str, str], Decimal]:
+        """Return a converter over one rate table, compiled on first use.
+
+        A failed rates fetch is remembered, so a batch does not retry the rate
+        providers once per entity.
+        """
+        rates: RateTable | None = None
+        error: requests.RequestException | None = None
+
+        def convert_amount(
+            amount: Decimal, source_currency: str, target_currency: str
+        ) -> Decimal:
+            nonlocal rates, error
+            source = str(source_currency or "").lower().strip()
+            target = str(target_currency or "").lower().strip()
+            decimal_amount = Decimal(str(amount or "0"))
+            if decimal_amount == 0 or source == target:
+                return decimal_amount
+            if rates is None:
+                if error is not None:
+                    raise error
+                try:
+                    rates = self.currency_exchange_service.rate_table()
+                except requests.RequestException as exc:
+                    error = exc
+                    raise
+            return rates.convert(decimal_amount, source, target)
+
+        return convert_amount
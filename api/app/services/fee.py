@@ -3,9 +3,10 @@
 import calendar
 import re
 from collections import defaultdict
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import date
 from decimal import Decimal
+from threading import Lock
 from typing import Any, Mapping
 
 from app.config import Config, get_config
@@ -35,7 +36,7 @@ from app.seeding import (
 )
 from app.services.base import BaseService
 from app.services.entity import EntityService
-from app.services.entity_owed import invoice_currency_options
+from app.services.invoice_queries import sum_invoice_currency_options
 from app.uow import get_uow
 from fastapi import Depends
 from sqlalchemy import and_, or_, select
@@ -84,7 +85,37 @@ class FeeRecord:
         )
 
 
+@dataclass(slots=True)
+class _FeeHistory:
+    """A resident's fee invoices aggregated by billing ``(year, month)``."""
+
+    fees: dict[tuple[int, int], dict[str, Decimal]] = field(default_factory=dict)
+    unpaid_invoice_ids: dict[tuple[int, int], int] = field(default_factory=dict)
+    unpaid_amounts: dict[tuple[int, int], dict[str, Decimal]] = field(
+        default_factory=dict
+    )
+    paid_invoice_ids: dict[tuple[int, int], int] = field(default_factory=dict)
+
+    def first_month_idx(self) -> int | None:
+        periods = [
+            *self.fees,
+            *self.unpaid_invoice_ids,
+            *self.paid_invoice_ids,
+        ]
+        if not periods:
+            return None
+        return min(year * 12 + month for year, month in periods)
+
+
 class FeeService(BaseService):
+    # Resident fee histories survive across requests. Invoice and transaction
+    # writes bump ``_cache_version`` and drop only the affected residents, whose
+    # rows are then reloaded on the next page view.
+    _cache: dict[int, _FeeHistory] = {}
+    _cache_version: int = 0
+    _invalidated_at: dict[int, int] = {}
+    _cache_lock: Lock = Lock()
+
     def __init__(
         self,
         db: Session = Depends(get_uow),
@@ -208,121 +239,28 @@ class FeeService(BaseService):
             )
         )
 
+        histories = self._get_fee_histories(
+            hackerspace.id, [resident.id for resident in residents]
+        )
+
         # Base window: last N months up to today
         today = date.today()
         today_year, today_month = today.year, today.month
         today_idx = today_year * 12 + today_month
         # limit future extension to 12 months ahead of today
         max_future_idx = today_idx + 12
-        # number of past months to include
-        months = min(filters.months, 12)
-
-        def subtract_months(base: date, months_back: int) -> date:
-            year = base.year
-            month = base.month - months_back
-            while month <= 0:
-                month += 12
-                year -= 1
-            return date(year, month, 1)
-
-        def add_months(base: date, months_forward: int) -> date:
-            year = base.year
-            month = base.month + months_forward
-            while month > 12:
-                month -= 12
-                year += 1
-            return date(year, month, 1)
-
-        resident_ids = [r.id for r in residents]
-        start_period = subtract_months(date(today_year, today_month, 1), months - 1)
-        max_future_period = add_months(date(today_year, today_month, 1), 12)
-
-        invoices = (
-            self.db.query(Invoice)
-            .join(
-                invoices_tags,
-                and_(
-                    invoices_tags.c.invoice_id == Invoice.id,
-                    invoices_tags.c.tag_id == fee_tag.id,
-                ),
-            )
-            .options(selectinload(Invoice.items).selectinload(InvoiceItem.transaction))
-            .filter(
-                or_(
-                    Invoice.to_entity_id == hackerspace.id,
-                    Invoice.items.any(),
-                ),
-                Invoice.billing_period.isnot(None),
-                Invoice.billing_period >= start_period,
-                Invoice.billing_period <= max_future_period,
-                Invoice.from_entity_id.in_(resident_ids),
-            )
-            .all()
-        )
-
-        # Process transactions into a nested dictionary
-        # {resident_id: {(year, month): {currency: amount}}}
-        fees_by_resident_by_month = defaultdict(
-            lambda: defaultdict(lambda: defaultdict(Decimal))
-        )
-        # Track unpaid invoices
-        # {resident_id: {(year, month): invoice_id}}
-        unpaid_invoice_by_resident_by_month: dict[int, dict[tuple[int, int], int]] = (
-            defaultdict(dict)
-        )
-        unpaid_amounts_by_resident_by_month: dict[
-            int, dict[tuple[int, int], dict[str, Decimal]]
-        ] = defaultdict(dict)
-        # Track paid invoices
-        # {resident_id: {(year, month): invoice_id}}
-        paid_invoice_by_resident_by_month: dict[int, dict[tuple[int, int], int]] = (
-            defaultdict(dict)
-        )
-        for invoice in invoices:
-            if invoice.billing_period is None:
-                continue
-            year = invoice.billing_period.year
-            month = invoice.billing_period.month
-            if invoice.status == InvoiceStatus.PENDING:
-                current = unpaid_invoice_by_resident_by_month[
-                    invoice.from_entity_id
-                ].get((year, month))
-                if current is None or invoice.id > current:
-                    unpaid_invoice_by_resident_by_month[invoice.from_entity_id][
-                        (year, month)
-                    ] = invoice.id
-                    unpaid_amounts_by_resident_by_month[invoice.from_entity_id][
-                        (year, month)
-                    ] = invoice_currency_options(invoice)
-                continue
-            if invoice.status != InvoiceStatus.PAID:
-                continue
-            if invoice.items:
-                transactions = [item.transaction for item in invoice.items]
-            else:
-                transactions = [invoice.transaction]
-            completed_transactions = [
-                tx
-                for tx in transactions
-                if tx is not None and tx.status == TransactionStatus.COMPLETED
-            ]
-            if not completed_transactions:
-                continue
-            current_paid = paid_invoice_by_resident_by_month[
-                invoice.from_entity_id
-            ].get((year, month))
-            if current_paid is None or invoice.id > current_paid:
-                paid_invoice_by_resident_by_month[invoice.from_entity_id][
-                    (year, month)
-                ] = invoice.id
-            for tx in completed_transactions:
-                fees_by_resident_by_month[invoice.from_entity_id][(year, month)][
-                    tx.currency.lower()
-                ] += tx.amount
 
         # Build the final response structure
         results: list[FeeRecord] = []
         for r in residents:
+            history = histories[r.id]
+            # Months before a resident's first fee invoice would be trimmed below,
+            # so full-history requests only walk back as far as there is data.
+            first_idx = history.first_month_idx()
+            months = min(
+                filters.months,
+                max(today_idx - first_idx + 1, 1) if first_idx is not None else 1,
+            )
             # Past months window
             monthly_fees: list[MonthlyFee] = []
             for i in range(months):
@@ -335,12 +273,10 @@ class FeeService(BaseService):
                     self._build_monthly_fee(
                         year,
                         month,
-                        fees_by_resident_by_month[r.id].get((year, month), {}),
-                        unpaid_invoice_by_resident_by_month[r.id].get((year, month)),
-                        paid_invoice_by_resident_by_month[r.id].get((year, month)),
-                        unpaid_amounts_by_resident_by_month[r.id].get(
-                            (year, month), {}
-                        ),
+                        history.fees.get((year, month), {}),
+                        history.unpaid_invoice_ids.get((year, month)),
+                        history.paid_invoice_ids.get((year, month)),
+                        history.unpaid_amounts.get((year, month), {}),
                     )
                 )
 
@@ -358,7 +294,7 @@ class FeeService(BaseService):
                 break
             # Future months with payments (up to 12 months ahead)
             future_fees: list[MonthlyFee] = []
-            for (y, m), currs in fees_by_resident_by_month[r.id].items():
+            for (y, m), currs in history.fees.items():
                 idx = y * 12 + m
                 if idx > today_idx and idx <= max_future_idx:
                     future_fees.append(
@@ -366,12 +302,12 @@ class FeeService(BaseService):
                             y,
                             m,
                             currs,
-                            unpaid_invoice_by_resident_by_month[r.id].get((y, m)),
-                            paid_invoice_by_resident_by_month[r.id].get((y, m)),
-                            unpaid_amounts_by_resident_by_month[r.id].get((y, m), {}),
+                            history.unpaid_invoice_ids.get((y, m)),
+                            history.paid_invoice_ids.get((y, m)),
+                            history.unpaid_amounts.get((y, m), {}),
                         )
                     )
-            for (y, m), invoice_id in unpaid_invoice_by_resident_by_month[r.id].items():
+            for (y, m), invoice_id in history.unpaid_invoice_ids.items():
                 idx = y * 12 + m
                 if idx <= today_idx or idx > max_future_idx:
                     continue
@@ -383,8 +319,8 @@ class FeeService(BaseService):
                         m,
                         {},
                         invoice_id,
-                        paid_invoice_by_resident_by_month[r.id].get((y, m)),
-                        unpaid_amounts_by_resident_by_month[r.id].get((y, m), {}),
+                        history.paid_invoice_ids.get((y, m)),
+                        history.unpaid_amounts.get((y, m), {}),
                     )
                 )
             # Combine and sort chronologically
@@ -395,6 +331,117 @@ class FeeService(BaseService):
 
         return [record.to_schema() for record in results]
 
+    @classmethod
+    def invalidate_entity_cache(cls, *entity_ids: int | None) -> None:
+        """Drop cached fee histories of residents whose fee invoices changed."""
+        with cls._cache_lock:
+            cls._cache_version += 1
+            for entity_id in entity_ids:
+                if entity_id is None:
+                    continue
+                cls._cache.pop(entity_id, None)
+                cls._invalidated_at[entity_id] = cls._cache_version
+
+    def _get_fee_histories(
+        self, hackerspace_id: int, resident_ids: list[int]
+    ) -> dict[int, _FeeHistory]:
+        cls = type(self)
+        with cls._cache_lock:
+            histories = {
+                entity_id: cls._cache[entity_id]
+                for entity_id in resident_ids
+                if entity_id in cls._cache
+            }
+            version = cls._cache_version
+        missing_ids = [
+            entity_id for entity_id in resident_ids if entity_id not in histories
+        ]
+        if not missing_ids:
+            return histories
+
+        loaded = self._load_fee_histories(hackerspace_id, missing_ids)
+        with cls._cache_lock:
+            for entity_id, history in loaded.items():
+                # Skip rows invalidated while they were being loaded.
+                if cls._invalidated_at.get(entity_id, 0) <= version:
+                    cls._cache[entity_id] = history
+        histories.update(loaded)
+        return histories
+
+    def _load_fee_histories(
+        self, hackerspace_id: int, resident_ids: list[int]
+    ) -> dict[int, _FeeHistory]:
+        """Aggregate the full fee invoice history of the given residents."""
+        invoices = (
+            self.db.query(Invoice)
+            .join(
+                invoices_tags,
+                and_(
+                    invoices_tags.c.invoice_id == Invoice.id,
+                    invoices_tags.c.tag_id == fee_tag.id,
+                ),
+            )
+            .options(
+                selectinload(Invoice.items).selectinload(InvoiceItem.transaction),
+                selectinload(Invoice.transactions),
+            )
+            .filter(
+                or_(
+                    Invoice.to_entity_id == hackerspace_id,
+                    Invoice.items.any(),
+                ),
+                Invoice.billing_period.isnot(None),
+                Invoice.from_entity_id.in_(resident_ids),
+            )
+            .all()
+        )
+        pending_invoice_ids = [
+            invoice.id
+            for invoice in invoices
+            if invoice.status == InvoiceStatus.PENDING
+        ]
+        pending_options = (
+            sum_invoice_currency_options(
+                db=self.db, filters=[Invoice.id.in_(pending_invoice_ids)]
+            )
+            if pending_invoice_ids
+            else {}
+        )
+
+        histories = {entity_id: _FeeHistory() for entity_id in resident_ids}
+        for invoice in invoices:
+            if invoice.billing_period is None:
+                continue
+            history = histories[invoice.from_entity_id]
+            period = (invoice.billing_period.year, invoice.billing_period.month)
+            if invoice.status == InvoiceStatus.PENDING:
+                current = history.unpaid_invoice_ids.get(period)
+                if current is None or invoice.id > current:
+                    history.unpaid_invoice_ids[period] = invoice.id
+                    history.unpaid_amounts[period] = pending_options.get(invoice.id, {})
+                continue
+            if invoice.status != InvoiceStatus.PAID:
+                continue
+            if invoice.items:
+                transactions = [item.transaction for item in invoice.items]
+            else:
+                transactions = [invoice.transaction]
+            completed_transactions = [
+                tx
+                for tx in transactions
+                if tx is not None and tx.status == TransactionStatus.COMPLETED
+            ]
+            if not completed_transactions:
+                continue
+            current_paid = history.paid_invoice_ids.get(period)
+            if current_paid is None or invoice.id > current_paid:
+                history.paid_invoice_ids[period] = invoice.id
+            fees = history.fees.setdefault(period, {})
+            for tx in completed_transactions:
+                currency = tx.currency.lower()
+                fees[currency] = fees.get(currency, Decimal("0")) + tx.amount
+        return histories
+
     def get_fee_amounts(self) -> list[FeeAmountSchema]:
         items: list[FeeAmountSchema] = []
         for item in self._config.fee_presets:
@@ -34,8 +34,10 @@ from app.errors.invoice import (
     InvoiceTransactionAlreadyAttached,
 )
 from app.models.entity import Entity
-from app.models.invoice import Invoice, InvoiceStatus
+from app.models.invoice import Invoice, InvoiceStatus, invoices_tags
+from app.models.invoice_amount_option import invoice_amount_options
 from app.models.invoice_item import InvoiceItem
+from app.models.tag import Tag
 from app.models.transaction import TransactionStatus
 from app.schemas.invoice import (
     InvoiceBulkCreateReportSchema,
@@ -49,13 +51,15 @@ from app.schemas.transaction import TransactionCreateSchema
 from app.seeding import automatic_tag, fee_tag
 from app.services.balance import BalanceService
 from app.services.base import BaseService
+from app.services.invoice_queries import amount_option_rows
 from app.services.mixins.taggable_mixin import TaggableServiceMixin
 from app.services.tag import TagService
 from app.services.transaction import TransactionService
 from app.uow import get_uow
 from fastapi import Depends
-from sqlalchemy import or_
-from sqlalchemy.orm import Query, Session
+from sqlalchemy import and_, delete, exists, insert, or_
+from sqlalchemy.orm import Query, Session, selectinload
+from sqlalchemy.orm.interfaces import LoaderOption
 
 
 class InvoiceService(TaggableServiceMixin[Invoice], BaseService[Invoice]):
@@ -120,6 +124,25 @@ class InvoiceService(TaggableServiceMixin[Invoice], BaseService[Invoice]):
             resolved.append(item)
         return resolved
 
+    def _list_loaders(self) -> dict[str, LoaderOption]:
+        return {
+            "actor_entity": selectinload(self.model.actor_entity).selectinload(
+                Entity.tags
+            ),
+            "from_entity": selectinload(self.model.from_entity).selectinload(
+                Entity.tags
+            ),
+            "to_entity": selectinload(self.model.to_entity).selectinload(Entity.tags),
+            "tags": selectinload(self.model.tags),
+            # ``transaction_id`` is derived from the invoice's transactions
+            "transaction_id": selectinload(self.model.transactions),
+            "items": selectinload(self.model.items).options(
+                selectinload(InvoiceItem.to_entity).selectinload(Entity.tags),
+                selectinload(InvoiceItem.to_tag),
+                selectinload(InvoiceItem.transaction),
+            ),
+        }
+
     def _apply_filters(  # type: ignore[override]
         self, query: Query[Invoice], filters: InvoiceFiltersSchema
     ) -> Query[Invoice]:
@@ -141,6 +164,13 @@ class InvoiceService(TaggableServiceMixin[Invoice], BaseService[Invoice]):
             query = query.filter(self.model.status == filters.status)
         if filters.billing_period is not None:
             query = query.filter(self.model.billing_period == filters.billing_period)
+        if filters.currency is not None:
+            query = query.filter(
+                exists().where(
+                    invoice_amount_options.c.invoice_id == self.model.id,
+                    invoice_amount_options.c.currency == filters.currency.lower(),
+                )
+            )
         if filters.tags_ids:
             query = self._apply_tag_filters(query, filters.tags_ids)
         return query
@@ -174,8 +204,37 @@ class InvoiceService(TaggableServiceMixin[Invoice], BaseService[Invoice]):
                 self._create_invoice_item(new_obj.id, item_schema)
         self.db.flush()
         self.db.refresh(new_obj)
+        self._sync_amount_options(new_obj)
+        self._invalidate_fee_cache(new_obj.from_entity_id)
         return new_obj
 
+    @staticmethod
+    def _invalidate_fee_cache(*entity_ids: int | None) -> None:
+        from app.services.fee import FeeService
+
+        FeeService.invalidate_entity_cache(*entity_ids)
+
+    def _delete_amount_options(self, invoice_id: int) -> None:
+        self.db.execute(
+            delete(invoice_amount_options).where(
+                invoice_amount_options.c.invoice_id == invoice_id
+            )
+        )
+
+    def _sync_amount_options(self, invoice: Invoice) -> None:
+        """Rewrite the normalized ``invoice_amount_options`` rows of an invoice."""
+        self._delete_amount_options(invoice.id)
+        if invoice.items:
+            rows = [
+                row
+                for item in invoice.items
+                for row in amount_option_rows(invoice.id, item.id, item.amounts or [])
+            ]
+        else:
+            rows = amount_option_rows(invoice.id, None, invoice.amounts or [])
+        if rows:
+            self.db.execute(insert(invoice_amount_options), rows)
+
     def _create_invoice_item(
         self, invoice_id: int, schema: InvoiceItemCreateSchema
     ) -> InvoiceItem:
@@ -212,12 +271,14 @@ class InvoiceService(TaggableServiceMixin[Invoice], BaseService[Invoice]):
                 data.get("billing_period")
             )
         data = {**data, **overrides}
+        self._invalidate_fee_cache(db_obj.from_entity_id, data.get("from_entity_id"))
         for key, value in data.items():
             setattr(db_obj, key, value)
         if tag_ids is not None:
             self.set_tags(db_obj, tag_ids)
         if new_items_data is not None:
-            # Replace all items
+            # Replace all items; their option rows reference them.
+            self._delete_amount_options(db_obj.id)
             for old_item in list(db_obj.items):
                 self.db.delete(old_item)
             self.db.flush()
@@ -227,6 +288,8 @@ class InvoiceService(TaggableServiceMixin[Invoice], BaseService[Invoice]):
         setattr(db_obj, "modified_at", datetime.datetime.now())
         self.db.flush()
         self.db.refresh(db_obj)
+        if "amounts" in data or new_items_data is not None:
+            self._sync_amount_options(db_obj)
         return db_obj
 
     def delete(self, obj_id: int) -> int:  # type: ignore[override]
@@ -235,6 +298,8 @@ class InvoiceService(TaggableServiceMixin[Invoice], BaseService[Invoice]):
             raise InvoiceNotEditable
         if db_obj.items and any(item.transaction is not None for item in db_obj.items):
             raise InvoiceNotEditable
+        self._delete_amount_options(obj_id)
+        self._invalidate_fee_cache(db_obj.from_entity_id)
         return super().delete(obj_id)
 
     def _serialize_amounts(self, amounts: list[dict]) -> list[dict[str, str]]:
@@ -269,6 +334,17 @@ class InvoiceService(TaggableServiceMixin[Invoice], BaseService[Invoice]):
             value = value.to_decimal()
         return value if isinstance(value, Decimal) else Decimal(str(value))
 
+    def has_pending_invoices(self, from_entity_id: int) -> bool:
+        """Whether *from_entity_id* owes any unpaid invoice (an indexed EXISTS)."""
+        return bool(
+            self.db.query(
+                exists().where(
+                    Invoice.from_entity_id == from_entity_id,
+                    Invoice.status == InvoiceStatus.PENDING,
+                )
+            ).scalar()
+        )
+
     def select_best_currency(
         self, from_entity_id: int, available_currencies: set[str]
     ) -> str | None:
@@ -318,142 +394,182 @@ class InvoiceService(TaggableServiceMixin[Invoice], BaseService[Invoice]):
         return selected_currency, selected_amount
 
     def auto_pay_oldest_invoices(self) -> int:
+        """Pay every eligible pending invoice its debtor can afford, oldest first.
+
+        All eligible invoices and the debtors' balances are loaded up front and
+        payments are planned in memory, then written with a single bulk insert.
+        The plan mirrors sequential payment: debtors are handled in id order,
+        simple invoices before multi-item ones, and a payment credits the
+        recipient's running balance if the recipient is a debtor too.
+        """
         grace_days = max(self._config.invoice_auto_pay_grace_days, 0)
         eligible_before = datetime.datetime.now() - datetime.timedelta(days=grace_days)
-        # ── simple invoices (no items) ──────────────────────────────────────
-        simple_pending_filter = [
-            self.model.status == InvoiceStatus.PENDING,
-            self.model.created_at <= eligible_before,
-            ~self.model.transactions.any(),
-            ~self.model.items.any(),
-        ]
-        entity_ids = (
-            self.db.query(self.model.from_entity_id)
-            .filter(*simple_pending_filter)
-            .distinct()
+        invoices = (
+            self.db.query(self.model)
+            .options(
+                selectinload(self.model.tags),
+                selectinload(self.model.items).selectinload(InvoiceItem.transaction),
+            )
+            .filter(
+                self.model.status == InvoiceStatus.PENDING,
+                self.model.created_at <= eligible_before,
+                or_(
+                    # simple invoices (no items) that have no transaction yet
+                    and_(~self.model.transactions.any(), ~self.model.items.any()),
+                    # multi-item invoices, paid only when every item is prefilled
+                    self.model.items.any(),
+                ),
+            )
+            .order_by(
+                self.model.from_entity_id.asc(),
+                self.model.created_at.asc(),
+                self.model.id.asc(),
+            )
             .all()
         )
+        if not invoices:
+            return 0
 
-        paid_count = 0
-
-        for (entity_id,) in entity_ids:
-            balances = self._balance_service.get_balances(entity_id)
-            completed_balances = balances.completed or {}
-            available_balances = {
+        balances_by_entity = self._balance_service.get_balances_many(
+            [invoice.from_entity_id for invoice in invoices]
+        )
+        running_balances: dict[int, dict[str, Decimal]] = {
+            entity_id: {
                 currency.lower(): self._balance_to_decimal(amount)
-                for currency, amount in completed_balances.items()
+                for currency, amount in (balances.completed or {}).items()
             }
+            for entity_id, balances in balances_by_entity.items()
+        }
 
-            invoices = (
-                self.db.query(self.model)
-                .filter(*simple_pending_filter)
-                .filter(self.model.from_entity_id == entity_id)
-                .order_by(self.model.created_at.asc(), self.model.id.asc())
-                .all()
-            )
+        def transfer(
+            from_entity_id: int, to_entity_id: int, currency: str, amount: Decimal
+        ) -> None:
+            payer_balances = running_balances[from_entity_id]
+            payer_balances[currency] = payer_balances[currency] - amount
+            payee_balances = running_balances.get(to_entity_id)
+            if payee_balances is not None:
+                payee_balances[currency] = (
+                    payee_balances.get(currency, Decimal("0")) + amount
+                )
 
-            for invoice in invoices:
-                selection = self._select_auto_pay_amount(invoice, available_balances)
-                if selection is None:
-                    continue
-                currency, amount = selection
+        rows: list[dict] = []
+        row_tag_ids: list[list[int]] = []
+        paid_invoices: list[Invoice] = []
 
-                tx_schema = TransactionCreateSchema(
+        # ── simple invoices (no items) ──────────────────────────────────────
+        for invoice in invoices:
+            if invoice.items or invoice.to_entity_id is None:
+                continue
+            selection = self._select_auto_pay_amount(
+                invoice, running_balances[invoice.from_entity_id]
+            )
+            if selection is None:
+                continue
+            currency, amount = selection
+            rows.append(
+                self._auto_pay_transaction_row(
+                    invoice,
                     to_entity_id=invoice.to_entity_id,
-                    from_entity_id=invoice.from_entity_id,
-                    amount=amount,
                     currency=currency,
-                    status=TransactionStatus.COMPLETED,
+                    amount=amount,
                     invoice_id=invoice.id,
+                    invoice_item_id=None,
                     comment=invoice.comment,
-                    tag_ids=[automatic_tag.id],
                 )
-
-                self._transaction_service.create(
-                    tx_schema, overrides={"actor_entity_id": invoice.actor_entity_id}
-                )
-                available_balances[currency] = available_balances[currency] - amount
-                paid_count += 1
+            )
+            row_tag_ids.append([automatic_tag.id, *(tag.id for tag in invoice.tags)])
+            transfer(invoice.from_entity_id, invoice.to_entity_id, currency, amount)
+            paid_invoices.append(invoice)
 
         # ── multi-item invoices (only when every item has to_entity_id set) ─
-        multi_pending_filter = [
-            self.model.status == InvoiceStatus.PENDING,
-            self.model.created_at <= eligible_before,
-            self.model.items.any(),
-        ]
-        multi_entity_ids = (
-            self.db.query(self.model.from_entity_id)
-            .filter(*multi_pending_filter)
-            .distinct()
-            .all()
-        )
-
-        for (entity_id,) in multi_entity_ids:
-            balances = self._balance_service.get_balances(entity_id)
-            completed_balances = balances.completed or {}
-            available_balances = {
-                currency.lower(): self._balance_to_decimal(amount)
-                for currency, amount in completed_balances.items()
-            }
+        for invoice in invoices:
+            if not invoice.items:
+                continue
+            # Skip if any item has no entity or is already paid
+            if any(
+                item.to_entity_id is None or item.transaction is not None
+                for item in invoice.items
+            ):
+                continue
 
-            invoices = (
-                self.db.query(self.model)
-                .filter(*multi_pending_filter)
-                .filter(self.model.from_entity_id == entity_id)
-                .order_by(self.model.created_at.asc(), self.model.id.asc())
-                .all()
-            )
+            # Pre-select amounts for all items; skip invoice if any can't be paid
+            selections: list[tuple[InvoiceItem, str, Decimal]] = []
+            temp_balances = dict(running_balances[invoice.from_entity_id])
+            payable = True
+            for item in invoice.items:
+                sel = self._select_auto_pay_amount(
+                    item,  # type: ignore[arg-type]
+                    temp_balances,
+                )
+                if sel is None:
+                    payable = False
+                    break
+                currency, amount = sel
+                temp_balances[currency] = temp_balances[currency] - amount
+                selections.append((item, currency, amount))
+
+            if not payable:
+                continue
 
-            for invoice in invoices:
-                # Skip if any item has no entity or is already paid
-                if any(
-                    item.to_entity_id is None or item.transaction is not None
-                    for item in invoice.items
-                ):
-                    continue
-
-                # Pre-select amounts for all items; skip invoice if any can't be paid
-                selections: list[tuple[InvoiceItem, str, Decimal]] = []
-                temp_balances = dict(available_balances)
-                payable = True
-                for item in invoice.items:
-                    sel = self._select_auto_pay_amount(
-                        item,  # type: ignore[arg-type]
-                        temp_balances,
-                    )
-                    if sel is None:
-                        payable = False
-                        break
-                    currency, amount = sel
-                    temp_balances[currency] = temp_balances[currency] - amount
-                    selections.append((item, currency, amount))
-
-                if not payable:
-                    continue
-
-                for item, currency, amount in selections:
-                    tx_schema = TransactionCreateSchema(
-                        to_entity_id=item.to_entity_id,
-                        from_entity_id=invoice.from_entity_id,
-                        amount=amount,
+            for item, currency, amount in selections:
+                rows.append(
+                    self._auto_pay_transaction_row(
+                        invoice,
+                        to_entity_id=item.to_entity_id,  # type: ignore[arg-type]
                         currency=currency,
-                        status=TransactionStatus.COMPLETED,
+                        amount=amount,
+                        invoice_id=None,
                         invoice_item_id=item.id,
                         comment=item.comment or invoice.comment,
-                        tag_ids=[automatic_tag.id],
-                    )
-                    self._transaction_service.create(
-                        tx_schema,
-                        overrides={"actor_entity_id": invoice.actor_entity_id},
                     )
+                )
+                row_tag_ids.append([automatic_tag.id])
+                transfer(
+                    invoice.from_entity_id,
+                    item.to_entity_id,  # type: ignore[arg-type]
+                    currency,
+                    amount,
+                )
+            paid_invoices.append(invoice)
 
-                available_balances = temp_balances
-                invoice.status = InvoiceStatus.PAID
-                invoice.modified_at = datetime.datetime.now()
-                self.db.flush()
-                paid_count += 1
+        if not paid_invoices:
+            return 0
 
-        return paid_count
+        self._transaction_service.create_many(rows, row_tag_ids)
+        paid_at = datetime.datetime.now()
+        for invoice in paid_invoices:
+            invoice.status = InvoiceStatus.PAID
+            invoice.modified_at = paid_at
+        self.db.flush()
+        # Bulk inserts bypass the identity map; drop stale transaction links.
+        for invoice in paid_invoices:
+            self.db.expire(invoice, ["transactions"])
+            for item in invoice.items:
+                self.db.expire(item, ["transaction"])
+        return len(paid_invoices)
+
+    @staticmethod
+    def _auto_pay_transaction_row(
+        invoice: Invoice,
+        *,
+        to_entity_id: int,
+        currency: str,
+        amount: Decimal,
+        invoice_id: int | None,
+        invoice_item_id: int | None,
+        comment: str | None,
+    ) -> dict:
+        return {
+            "actor_entity_id": invoice.actor_entity_id,
+            "from_entity_id": invoice.from_entity_id,
+            "to_entity_id": to_entity_id,
+            "amount": amount,
+            "currency": currency,
+            "status": TransactionStatus.COMPLETED,
+            "invoice_id": invoice_id,
+            "invoice_item_id": invoice_item_id,
+            "comment": comment,
+        }
 
     @staticmethod
     def _normalize_billing_period(
@@ -694,9 +810,12 @@ class InvoiceService(TaggableServiceMixin[Invoice], BaseService[Invoice]):
     def bulk_create(
         self, schema: InvoiceBulkCreateSchema, actor_entity_id: int
     ) -> InvoiceBulkCreateReportSchema:
-        from app.models.entity import Entity
-        from app.models.tag import Tag
+        """Issue the same invoice to many entities with batched inserts.
 
+        Eligible entities are resolved with one query and invoice, tag, item and
+        amount option rows are each written with a single multi-row INSERT, so
+        the statement count does not grow with the number of entities.
+        """
         billing_period = schema.billing_period
         if billing_period is None:
             today = date.today()
@@ -712,58 +831,112 @@ class InvoiceService(TaggableServiceMixin[Invoice], BaseService[Invoice]):
             ),
         )
 
-        entity_ids: set[int] = set(schema.from_entity_ids)
-
-        if schema.from_tag_ids:
-            tags = self.db.query(Tag).filter(Tag.id.in_(schema.from_tag_ids)).all()
-            tag_filters = [Entity.tags.contains(tag) for tag in tags]
-            if tag_filters:
-                tag_entities = self.db.query(Entity).filter(or_(*tag_filters)).all()
-                for e in tag_entities:
-                    entity_ids.add(e.id)
-
-        invoice_ids: list[int] = []
-        created_count = 0
-        skipped_count = 0
-
-        for entity_id in sorted(entity_ids):
-            entity = self.db.query(Entity).filter(Entity.id == entity_id).first()
-            if entity is None or not entity.active:
-                skipped_count += 1
-                continue
-
-            if resolved_items:
-                # Multi-item invoice mode
-                invoice = self.create(
-                    InvoiceCreateSchema(
-                        from_entity_id=entity_id,
-                        to_entity_id=None,
-                        amounts=[],
-                        billing_period=billing_period,
-                        tag_ids=schema.tag_ids,
-                        comment=schema.comment,
-                        items=resolved_items,
-                    ),
-                    overrides={"actor_entity_id": actor_entity_id},
+        requested_ids: set[int] = set(schema.from_entity_ids)
+        candidates = (
+            self.db.query(Entity.id, Entity.active)
+            .filter(
+                or_(
+                    Entity.id.in_(requested_ids),
+                    Entity.tags.any(Tag.id.in_(schema.from_tag_ids)),
                 )
-            else:
-                invoice = self.create(
-                    InvoiceCreateSchema(
-                        from_entity_id=entity_id,
-                        to_entity_id=schema.to_entity_id,
-                        amounts=schema.amounts,
-                        billing_period=billing_period,
-                        tag_ids=schema.tag_ids,
-                        comment=schema.comment,
+            )
+            .all()
+        )
+        active_ids = sorted(entity_id for entity_id, active in candidates if active)
+        # Unknown and inactive entities are reported as skipped.
+        skipped_count = len(
+            requested_ids | {entity_id for entity_id, _ in candidates}
+        ) - len(active_ids)
+
+        # Validate amounts and tags once instead of once per invoice.
+        tag_ids = [
+            self._tag_service.get(tag_id).id for tag_id in dict.fromkeys(schema.tag_ids)
+        ]
+        item_rows = [
+            {
+                "to_entity_id": item.to_entity_id,
+                "to_tag_id": item.to_tag_id,
+                "amounts": self._serialize_amounts(
+                    [{"currency": a.currency, "amount": a.amount} for a in item.amounts]
+                ),
+                "comment": item.comment,
+            }
+            for item in resolved_items
+        ]
+        if item_rows:
+            # Multi-recipient invoice: no single to_entity or amounts
+            to_entity_id = None
+            amounts: list[dict[str, str]] = []
+        else:
+            to_entity_id = schema.to_entity_id
+            amounts = self._serialize_amounts([a.model_dump() for a in schema.amounts])
+
+        if not active_ids:
+            return InvoiceBulkCreateReportSchema(
+                billing_period=billing_period,
+                created_count=0,
+                skipped_count=skipped_count,
+                invoice_ids=[],
+            )
+
+        invoice_ids = list(
+            self.db.scalars(
+                insert(Invoice).returning(Invoice.id, sort_by_parameter_order=True),
+                [
+                    {
+                        "actor_entity_id": actor_entity_id,
+                        "from_entity_id": entity_id,
+                        "to_entity_id": to_entity_id,
+                        "amounts": amounts,
+                        "billing_period": billing_period,
+                        "status": InvoiceStatus.PENDING,
+                        "comment": schema.comment,
+                    }
+                    for entity_id in active_ids
+                ],
+            )
+        )
+        if tag_ids:
+            self.db.execute(
+                insert(invoices_tags),
+                [
+                    {"invoice_id": invoice_id, "tag_id": tag_id}
+                    for invoice_id in invoice_ids
+                    for tag_id in tag_ids
+                ],
+            )
+        option_rows: list[dict] = []
+        if item_rows:
+            item_ids = list(
+                self.db.scalars(
+                    insert(InvoiceItem).returning(
+                        InvoiceItem.id, sort_by_parameter_order=True
                     ),
-                    overrides={"actor_entity_id": actor_entity_id},
+                    [
+                        {"invoice_id": invoice_id, **item_row}
+                        for invoice_id in invoice_ids
+                        for item_row in item_rows
+                    ],
                 )
-            invoice_ids.append(invoice.id)
-            created_count += 1
+            )
+            item_id_iter = iter(item_ids)
+            for invoice_id in invoice_ids:
+                for item_row in item_rows:
+                    option_rows.extend(
+                        amount_option_rows(
+                            invoice_id, next(item_id_iter), item_row["amounts"]
+                        )
+                    )
+        else:
+            for invoice_id in invoice_ids:
+                option_rows.extend(amount_option_rows(invoice_id, None, amounts))
+        if option_rows:
+            self.db.execute(insert(invoice_amount_options), option_rows)
+        self._invalidate_fee_cache(*active_ids)
 
         return InvoiceBulkCreateReportSchema(
             billing_period=billing_period,
-            created_count=created_count,
+            created_count=len(invoice_ids),
             skipped_count=skipped_count,
             invoice_ids=invoice_ids,
         )
@@ -0,0 +1,87 @@
+"""Shared invoice amount aggregation helpers."""
+
+from __future__ import annotations
+
+from decimal import Decimal
+from typing import Any
+
+from app.models.invoice import Invoice
+from app.models.invoice_amount_option import invoice_amount_options
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+
+def amount_option_rows(
+    invoice_id: int, item_id: int | None, amounts: list[dict[str, Any]]
+) -> list[dict[str, Any]]:
+    """Build ``invoice_amount_options`` rows from a serialized amounts list."""
+    return [
+        {
+            "invoice_id": invoice_id,
+            "item_id": item_id,
+            "currency": str(entry.get("currency") or "").lower().strip(),
+            "amount": Decimal(str(entry.get("amount") or "0")),
+            "rank": rank,
+        }
+        for rank, entry in enumerate(amounts)
+        if str(entry.get("currency") or "").strip()
+    ]
+
+
+def sum_invoice_currency_options(
+    *, db: Session, filters: list[Any]
+) -> dict[int, dict[str, Decimal]]:
+    """Return whole-invoice payment totals per currency for matching invoices.
+
+    Same semantics as ``entity_owed.invoice_currency_options``: item amounts in
+    a currency are summed, while currencies remain alternatives. ``filters``
+    are applied to ``Invoice``; currencies keep their original option order.
+    """
+    options_by_invoice: dict[int, dict[str, Decimal]] = {}
+    for row in db.execute(_currency_options_query(filters)).all():
+        options_by_invoice.setdefault(row.invoice_id, {})[row.currency] = row.total
+    return options_by_invoice
+
+
+def sum_invoice_currency_options_by_payer(
+    *, db: Session, filters: list[Any]
+) -> dict[int, list[dict[str, Decimal]]]:
+    """``sum_invoice_currency_options`` grouped by ``Invoice.from_entity_id``.
+
+    A single query serves any number of payers, e.g. every entity charged in
+    one run; each payer's invoices are listed in id order.
+    """
+    options_by_invoice: dict[int, dict[str, Decimal]] = {}
+    options_by_payer: dict[int, list[dict[str, Decimal]]] = {}
+    for row in db.execute(
+        _currency_options_query(filters, Invoice.from_entity_id)
+    ).all():
+        options = options_by_invoice.get(row.invoice_id)
+        if options is None:
+            options = options_by_invoice[row.invoice_id] = {}
+            options_by_payer.setdefault(row.from_entity_id, []).append(options)
+        options[row.currency] = row.total
+    return options_by_payer
+
+
+def _currency_options_query(filters: list[Any], *extra_columns: Any):
+    return (
+        select(
+            invoice_amount_options.c.invoice_id,
+            *extra_columns,
+            invoice_amount_options.c.currency,
+            func.sum(invoice_amount_options.c.amount).label("total"),
+        )
+        .join(Invoice, Invoice.id == invoice_amount_options.c.invoice_id)
+        .where(*filters)
+        .group_by(
+            invoice_amount_options.c.invoice_id,
+            *extra_columns,
+            invoice_amount_options.c.currency,
+        )
+        .order_by(
+            invoice_amount_options.c.invoice_id,
+            func.min(invoice_amount_options.c.rank),
+            invoice_amount_options.c.currency,
+        )
+    )
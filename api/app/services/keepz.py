@@ -8,6 +8,7 @@ from uuid import uuid4
 from app.config import Config, get_config
 from app.errors.common import NotFoundError
 from app.errors.keepz import KeepzAuthFailed, KeepzAuthRequired
+from app.http import get_http_client
 from app.libs.keepz_cli import keepz_api
 from app.models.entity import Entity
 from app.seeding import keepz_deposit_provider
@@ -61,10 +62,25 @@ class KeepzService:
         self.db.flush()
         self.db.refresh(entity)
 
+    def get_transactions_cursor(self) -> dict[str, Any]:
+        """Return the transaction sync position stored by the deposit poller."""
+        entity = self._get_provider_entity()
+        keepz_auth = (entity.auth or {}).get("keepz") or {}
+        return dict(keepz_auth.get("transactions_cursor") or {})
+
+    def save_transactions_cursor(self, cursor: dict[str, Any]) -> None:
+        entity = self._get_provider_entity()
+        auth = dict(entity.auth or {})
+        auth["keepz"] = {**(auth.get("keepz") or {}), "transactions_cursor": cursor}
+        entity.auth = auth
+        self.db.flush()
+
     def _client(self) -> Any:
         return keepz_api.KeepzClient(
             base_url=self.config.keepz_base_url or keepz_api.DEFAULT_BASE_URL,
             user_agent=self.config.keepz_user_agent or keepz_api.DEFAULT_USER_AGENT,
+            timeout=(3.05, 30),
+            session=get_http_client(),
         )
 
     def auth_status(self) -> dict[str, Any]:
@@ -182,8 +198,10 @@ class KeepzService:
             )
         )
 
-    def list_transactions(self) -> Any:
-        return self._call_with_refresh(lambda client: client.list_transactions())
+    def list_transactions(self, *, page: int = 0, limit: int = 20) -> Any:
+        return self._call_with_refresh(
+            lambda client: client.list_transactions(page=page, limit=limit)
+        )
 
     def get_transaction(self, transaction_id: int) -> Any:
         return self._call_with_refresh(
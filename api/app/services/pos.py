@@ -1,42 +1,81 @@
 """POS Service for processing point-of-sale payments.
 
-Creates a completed transaction from a payer entity (resolved by exact name)
-to a target entity, tagging the transaction with the `pos` tag. Returns the payer
+Creates a completed transaction from a payer entity (resolved by name,
+case-insensitively) to a target entity, tagging the transaction with the `pos` tag. Returns the payer
 entity and its updated balance after the transaction.
+
+Terminals that lose connectivity queue their sales and replay them through
+``sync``. Each queued sale carries a terminal-assigned ``client_id``, recorded
+in ``pos_sales`` once applied so a resent sale is reported as a duplicate
+instead of charging twice, and an HMAC of its fields under the POS secret.
 """
 
+import hashlib
+import hmac
+import logging
 from decimal import Decimal
 from typing import Tuple
 
+from app.config import Config, get_config
 from app.dependencies.services import (
     get_balance_service,
     get_entity_service,
     get_invoice_service,
     get_transaction_service,
 )
-from app.errors.pos import POSEntityHasUnpaidInvoices
+from app.errors.base import ApplicationError
+from app.errors.pos import POSEntityHasUnpaidInvoices, POSSaleSignatureInvalid
 from app.models.entity import Entity
-from app.models.invoice import InvoiceStatus
-from app.models.transaction import TransactionStatus
+from app.models.pos_sale import POSSale
 from app.schemas.balance import BalanceSchema
-from app.schemas.invoice import InvoiceFiltersSchema
+from app.schemas.pos import POSSyncResponse, POSSyncResult, POSSyncSale
 from app.schemas.transaction import TransactionCreateSchema
 from app.seeding import pos_tag
 from app.services.balance import BalanceService
 from app.services.entity import EntityService
 from app.services.invoice import InvoiceService
 from app.services.transaction import TransactionService
+from app.uow import get_uow
 from fastapi import Depends
+from sqlalchemy import select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+
+def pos_sale_signature(secret: str, sale: POSSyncSale) -> str:
+    """Hex HMAC-SHA256 a terminal attaches to a queued sale.
+
+    Signs ``client_id:entity_name:amount:currency:to_entity_id:comment`` with
+    the amount in plain decimal notation and an empty comment when absent.
+    ``recorded_at`` is informational and not signed.
+    """
+    message = ":".join(
+        (
+            sale.client_id,
+            sale.entity_name,
+            format(sale.amount, "f"),
+            sale.currency,
+            str(sale.to_entity_id),
+            sale.comment or "",
+        )
+    )
+    return hmac.new(secret.encode(), message.encode(), hashlib.sha256).hexdigest()
 
 
 class POSService:
     def __init__(
         self,
+        db: Session = Depends(get_uow),
         entity_service: EntityService = Depends(get_entity_service),
         transaction_service: TransactionService = Depends(get_transaction_service),
         balance_service: BalanceService = Depends(get_balance_service),
         invoice_service: InvoiceService = Depends(get_invoice_service),
+        config: Config = Depends(get_config),
     ):
+        self.db = db
+        self.config = config
         self._entity_service = entity_service
         self._transaction_service = transaction_service
         self._balance_service = balance_service
@@ -54,33 +93,132 @@ class POSService:
         """Process a POS payment.
 
         Steps:
-        1. Resolve paying entity by exact name.
-        2. Create a COMPLETED transaction from that entity to the target entity,
-           tagged with the `pos` tag.
-        3. Return (payer entity, payer balance schema) after cache invalidation done by TransactionService.
+        1. Resolve paying entity by case-insensitive name (functional index).
+        2. Refuse if it has an unpaid invoice (a single EXISTS probe).
+        3. Insert a COMPLETED transaction from that entity to the target entity,
+           tagged with the `pos` tag, adjusting cached balances in place.
+        4. Return (payer entity, payer balance schema).
         """
-        payer = self._entity_service.get_by_name(entity_name)
+        payer, _ = self._charge(
+            entity_name=entity_name,
+            amount=amount,
+            currency=currency,
+            to_entity_id=to_entity_id,
+            comment=comment,
+        )
+        balances = self._balance_service.get_balances(payer.id)
+        return payer, balances
+
+    def sync(self, sales: list[POSSyncSale]) -> POSSyncResponse:
+        """Apply sales queued by an offline terminal, in the order given.
 
-        unpaid = self._invoice_service.get_all(
-            InvoiceFiltersSchema(
-                from_entity_id=payer.id, status=InvoiceStatus.PENDING, tags_ids=[]
+        Every sale runs in its own savepoint of the request's unit of work, so
+        a failing sale (bad signature, unknown payer, unpaid invoices) is
+        reported and skipped without undoing the others. Sales whose
+        ``client_id`` was already applied, here or in an earlier sync, are
+        reported as duplicates.
+        """
+        client_ids = [sale.client_id for sale in sales]
+        seen = set(
+            self.db.scalars(
+                select(POSSale.client_id).where(POSSale.client_id.in_(client_ids))
+            )
+        )
+        results: list[POSSyncResult] = []
+        payer_ids: dict[int, None] = {}
+        for sale in sales:
+            if sale.client_id in seen:
+                results.append(
+                    POSSyncResult(client_id=sale.client_id, status="duplicate")
+                )
+                continue
+            try:
+                self._verify_signature(sale)
+                with self.db.begin_nested():
+                    # Claim the client id first: a concurrent sync of the same
+                    # sale fails here, before anything is charged.
+                    receipt = POSSale(
+                        client_id=sale.client_id, recorded_at=sale.recorded_at
+                    )
+                    self.db.add(receipt)
+                    self.db.flush()
+                    payer, tx_id = self._charge(
+                        entity_name=sale.entity_name,
+                        amount=sale.amount,
+                        currency=sale.currency,
+                        to_entity_id=sale.to_entity_id,
+                        comment=sale.comment,
+                    )
+                    receipt.transaction_id = tx_id
+                    self.db.flush()
+            except ApplicationError as e:
+                results.append(
+                    POSSyncResult(
+                        client_id=sale.client_id,
+                        status="failed",
+                        error_code=e.error_code,
+                        error=e.error,
+                    )
+                )
+                continue
+            except SQLAlchemyError:
+                logger.exception("POS sale %s could not be applied", sale.client_id)
+                results.append(
+                    POSSyncResult(
+                        client_id=sale.client_id,
+                        status="failed",
+                        error="Sale could not be applied.",
+                    )
+                )
+                continue
+            seen.add(sale.client_id)
+            payer_ids[payer.id] = None
+            results.append(
+                POSSyncResult(
+                    client_id=sale.client_id,
+                    status="applied",
+                    entity_id=payer.id,
+                    transaction_id=tx_id,
+                )
             )
+
+        statuses = [result.status for result in results]
+        return POSSyncResponse(
+            applied=statuses.count("applied"),
+            duplicates=statuses.count("duplicate"),
+            failed=statuses.count("failed"),
+            results=results,
+            balances=self._balance_service.get_balances_many(list(payer_ids)),
         )
-        if unpaid.total > 0:
+
+    def _verify_signature(self, sale: POSSyncSale) -> None:
+        expected = pos_sale_signature(self.config.pos_secret or "", sale)
+        if not hmac.compare_digest(expected, sale.signature):
+            raise POSSaleSignatureInvalid
+
+    def _charge(
+        self,
+        *,
+        entity_name: str,
+        amount: Decimal,
+        currency: str,
+        to_entity_id: int,
+        comment: str | None,
+    ) -> Tuple[Entity, int]:
+        payer = self._entity_service.get_by_name(entity_name)
+
+        if self._invoice_service.has_pending_invoices(payer.id):
             raise POSEntityHasUnpaidInvoices
 
-        self._transaction_service.create(
+        tx_id = self._transaction_service.create_completed_transfer(
             TransactionCreateSchema(
                 amount=amount,
                 currency=currency,
                 from_entity_id=payer.id,
                 to_entity_id=to_entity_id,
-                status=TransactionStatus.COMPLETED,
                 tag_ids=[pos_tag.id],
                 comment=comment,
             ),
             overrides={"actor_entity_id": to_entity_id},
         )
-
-        balances = self._balance_service.get_balances(payer.id)
-        return payer, balances
+        return payer, tx_id
@@ -16,6 +16,7 @@ from app.dependencies.services import (
 )
 from app.models.entity import Entity, entities_tags
 from app.models.invoice import Invoice, InvoiceStatus
+from app.models.invoice_amount_option import invoice_amount_options
 from app.models.invoice_item import InvoiceItem
 from app.models.tag import Tag
 from app.models.transaction import Transaction, TransactionStatus, transactions_tags
@@ -238,43 +239,6 @@ class StatsService(BaseService):
                 continue
         return float(total)
 
-    @staticmethod
-    def _invoice_amounts_for_entity(
-        invoice: Invoice, entity_id: int
-    ) -> dict[str, Decimal]:
-        """Return an invoice's payment options that belong to one recipient.
-
-        A legacy invoice stores its recipient and amounts on the invoice itself.
-        Multi-recipient invoices store them per item, while a paid item's
-        transaction is authoritative when the recipient was selected at pay time.
-        """
-        if not invoice.items:
-            if invoice.to_entity_id != entity_id:
-                return {}
-            amount_groups = [invoice.amounts or []]
-        else:
-            amount_groups = []
-            for item in invoice.items:
-                transaction = item.transaction
-                recipient_id = (
-                    transaction.to_entity_id
-                    if transaction is not None
-                    else item.to_entity_id
-                )
-                if recipient_id == entity_id:
-                    amount_groups.append(item.amounts or [])
-
-        options: dict[str, Decimal] = {}
-        for amounts in amount_groups:
-            for entry in amounts:
-                currency = str(entry.get("currency") or "").lower().strip()
-                if not currency:
-                    continue
-                options[currency] = options.get(currency, Decimal("0")) + Decimal(
-                    str(entry.get("amount") or "0")
-                )
-        return options
-
     @staticmethod
     def _completed_invoice_transactions_for_entity(
         invoice: Invoice, entity_id: int
@@ -291,6 +255,57 @@ class StatsService(BaseService):
             and transaction.status == TransactionStatus.COMPLETED
         ]
 
+    def _unpaid_fee_totals(
+        self, start_month: date, end_month: date, entity_id: int
+    ) -> list[tuple[date, str, Decimal]]:
+        """Sum pending fee invoices' primary payment option owed to one recipient.
+
+        A legacy invoice's options belong to its ``to_entity_id``; an item's belong
+        to its settling transaction's recipient, falling back to the item's own
+        ``to_entity_id``. Fee invoices expose several payment options, so only the
+        invoice's first currency (item order, then option rank) counts.
+        """
+        options = invoice_amount_options.c
+        recipient_id = case(
+            (options.item_id.is_(None), Invoice.to_entity_id),
+            else_=func.coalesce(Transaction.to_entity_id, InvoiceItem.to_entity_id),
+        )
+        recipient_options = (
+            select(
+                Invoice.billing_period.label("billing_period"),
+                options.currency.label("currency"),
+                options.amount.label("amount"),
+                func.first_value(options.currency)
+                .over(
+                    partition_by=options.invoice_id,
+                    order_by=(options.item_id.asc().nulls_first(), options.rank),
+                )
+                .label("primary_currency"),
+            )
+            .select_from(invoice_amount_options)
+            .join(Invoice, Invoice.id == options.invoice_id)
+            .outerjoin(InvoiceItem, InvoiceItem.id == options.item_id)
+            .outerjoin(Transaction, Transaction.invoice_item_id == options.item_id)
+            .where(
+                Invoice.billing_period >= start_month,
+                Invoice.billing_period <= end_month,
+                Invoice.tags.contains(fee_tag),
+                Invoice.status == InvoiceStatus.PENDING,
+                recipient_id == entity_id,
+            )
+            .subquery()
+        )
+        query = (
+            select(
+                recipient_options.c.billing_period,
+                recipient_options.c.currency,
+                func.sum(recipient_options.c.amount),
+            )
+            .where(recipient_options.c.currency == recipient_options.c.primary_currency)
+            .group_by(recipient_options.c.billing_period, recipient_options.c.currency)
+        )
+        return [tuple(row) for row in self.db.execute(query).all()]
+
     def get_monthly_fee_sum_by_month(
         self, timeframe_from: date | None = None, timeframe_to: date | None = None
     ):
@@ -304,9 +319,8 @@ class StatsService(BaseService):
             selectinload(Invoice.transactions),
         )
 
-        # Apply the timeframe before loading relationships, and fetch both statuses
-        # together. Previously this loaded every fee invoice twice and discarded old
-        # rows in Python.
+        # Apply the timeframe before loading relationships. Only paid invoices are
+        # loaded as objects; pending ones are summed from invoice_amount_options.
         invoices = (
             self.db.query(Invoice)
             .options(*invoice_load_options)
@@ -314,7 +328,7 @@ class StatsService(BaseService):
                 Invoice.billing_period >= start_month,
                 Invoice.billing_period <= end_month,
                 Invoice.tags.contains(fee_tag),
-                Invoice.status.in_((InvoiceStatus.PAID, InvoiceStatus.PENDING)),
+                Invoice.status == InvoiceStatus.PAID,
             )
             .all()
         )
@@ -326,26 +340,21 @@ class StatsService(BaseService):
             # the type narrowing explicit.
             if invoice.billing_period is None:
                 continue
-            year = invoice.billing_period.year
-            month = invoice.billing_period.month
-            if invoice.status == InvoiceStatus.PAID:
-                completed_transactions = (
-                    self._completed_invoice_transactions_for_entity(
-                        invoice, f0_entity.id
-                    )
-                )
-                for transaction in completed_transactions:
-                    monthly_paid_totals[(year, month)][
-                        transaction.currency.lower()
-                    ] += transaction.amount
-            else:
-                # Fee invoices expose several payment options; only the primary one
-                # belongs in the expected (unpaid) total.
-                entity_amounts = self._invoice_amounts_for_entity(invoice, f0_entity.id)
-                if entity_amounts:
-                    currency, amount = next(iter(entity_amounts.items()))
-                    if amount:
-                        monthly_unpaid_totals[(year, month)][currency] += amount
+            completed_transactions = self._completed_invoice_transactions_for_entity(
+                invoice, f0_entity.id
+            )
+            for transaction in completed_transactions:
+                monthly_paid_totals[
+                    (invoice.billing_period.year, invoice.billing_period.month)
+                ][transaction.currency.lower()] += transaction.amount
+
+        for billing_period, currency, amount in self._unpaid_fee_totals(
+            start_month, end_month, f0_entity.id
+        ):
+            if amount:
+                monthly_unpaid_totals[(billing_period.year, billing_period.month)][
+                    currency
+                ] += amount
 
         all_months = set(monthly_paid_totals.keys()) | set(monthly_unpaid_totals.keys())
 
@@ -3,10 +3,12 @@
 from __future__ import annotations
 
 import contextlib
-from collections.abc import Generator
+import datetime
+from collections.abc import Callable, Generator, Sequence
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from decimal import Decimal
-from typing import Any
+from typing import Any, TypeVar
 
 import stripe
 from app.config import Config, get_config
@@ -17,6 +19,9 @@ from app.errors.stripe import (
 )
 from fastapi import Depends
 
+T = TypeVar("T")
+R = TypeVar("R")
+
 
 @dataclass(frozen=True)
 class StripeCheckoutSessionData:
@@ -82,6 +87,52 @@ class StripeService:
                 getattr(exc, "user_message", None) or str(exc)
             ) from exc
 
+    # ── Polling ────────────────────────────────────────────────────────────
+
+    def call_concurrently(
+        self,
+        fn: Callable[[T], R],
+        items: Sequence[T],
+        *,
+        concurrency: int | None = None,
+    ) -> list[R | Exception]:
+        """Run the blocking Stripe call *fn* for every item on a bounded thread pool.
+
+        Results are returned in input order; a call that raised yields its
+        exception instead of aborting the rest of the batch. *concurrency*
+        defaults to ``stripe_poll_concurrency``.
+        """
+        if not items:
+            return []
+
+        def _call(item: T) -> R | Exception:
+            try:
+                return fn(item)
+            except Exception as exc:
+                return exc
+
+        if concurrency is None:
+            concurrency = self.config.stripe_poll_concurrency
+        workers = min(max(int(concurrency or 1), 1), len(items))
+        with ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="stripe"
+        ) as pool:
+            return list(pool.map(_call, items))
+
+    def next_poll_at(
+        self, last_change: datetime.datetime, now: datetime.datetime
+    ) -> datetime.datetime:
+        """When to poll again an object that has not changed since *last_change*.
+
+        The delay is a quarter of the idle time, clamped between the poll
+        interval and ``stripe_poll_max_interval_seconds``, so polls of a stale
+        object back off geometrically while fresh ones are polled every cycle.
+        """
+        base = max(int(self.config.stripe_poll_interval_seconds or 60), 10)
+        ceiling = max(int(self.config.stripe_poll_max_interval_seconds or base), base)
+        idle = max((now - last_change).total_seconds(), 0)
+        return now + datetime.timedelta(seconds=min(max(idle / 4, base), ceiling))
+
     # ── Checkout Sessions ──────────────────────────────────────────────────
 
     def create_checkout_session(
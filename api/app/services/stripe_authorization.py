@@ -4,20 +4,20 @@ from __future__ import annotations
 
 import datetime
 import logging
+import time
+from dataclasses import dataclass, field
 from decimal import Decimal
 
 from app.config import Config, get_config
 from app.dependencies.services import (
-    get_balance_service,
-    get_currency_exchange_service,
     get_deposit_service,
+    get_entity_owed_service,
     get_stripe_service,
 )
 from app.errors.common import NotFoundError
 from app.errors.stripe import StripeRequestError
-from app.models.deposit import DepositStatus
+from app.models.deposit import Deposit, DepositStatus
 from app.models.entity import Entity
-from app.models.invoice import Invoice, InvoiceStatus
 from app.models.stripe_authorization import StripeAuthorization, StripeAuthorizationMode
 from app.schemas.deposit import (
     DepositCreateSchema,
@@ -33,14 +33,8 @@ from app.seeding import (
     stripe_deposit_provider,
     stripe_treasury,
 )
-from app.services.balance import BalanceService
-from app.services.currency_exchange import CurrencyExchangeService
 from app.services.deposit import DepositService
-from app.services.entity_owed import (
-    EntityOwedSummary,
-    calculate_entity_owed,
-    invoice_currency_options,
-)
+from app.services.entity_owed import EntityOwedService, EntityOwedSummary
 from app.services.stripe import (
     StripeCheckoutSessionData,
     StripeInvoiceData,
@@ -73,23 +67,57 @@ def _metadata_recipient_id(metadata: dict) -> int | None:
         return None
 
 
+@dataclass(frozen=True)
+class _Card:
+    """The Stripe identifiers of an authorization, safe to use with no session."""
+
+    authorization_id: int
+    customer_id: str
+    payment_method_id: str
+
+    @classmethod
+    def of(cls, auth: StripeAuthorization) -> _Card:
+        return cls(
+            authorization_id=auth.id,
+            customer_id=auth.stripe_customer_id,
+            payment_method_id=auth.stripe_payment_method_id,
+        )
+
+
+@dataclass
+class EntityChargeRunReport:
+    """Outcome of one recurring entity_dynamic charge run."""
+
+    # eligible entities with an active card
+    entities: int = 0
+    # charges sent to Stripe; ``succeeded`` of them went through
+    processed: int = 0
+    succeeded: int = 0
+    # charges already made earlier in this cycle
+    skipped: int = 0
+    duration_seconds: float = 0.0
+    charges_per_second: float = 0.0
+    # {"entity_id", "currency", "error"} per failed charge or owed calculation
+    failures: list[dict] = field(default_factory=list)
+
+
 class StripeAuthorizationService:
+    # authorization id -> when its subscription invoices are next polled.
+    # Process-local: after a restart every subscription is simply polled once.
+    _subscription_next_poll_at: dict[int, datetime.datetime] = {}
+
     def __init__(
         self,
         db: Session = Depends(get_uow),
         stripe_service: StripeService = Depends(get_stripe_service),
-        currency_exchange_service: CurrencyExchangeService = Depends(
-            get_currency_exchange_service
-        ),
         deposit_service: DepositService = Depends(get_deposit_service),
-        balance_service: BalanceService = Depends(get_balance_service),
+        entity_owed_service: EntityOwedService = Depends(get_entity_owed_service),
         config: Config = Depends(get_config),
     ):
         self.db = db
         self.stripe_service = stripe_service
-        self.currency_exchange_service = currency_exchange_service
         self.deposit_service = deposit_service
-        self.balance_service = balance_service
+        self.entity_owed_service = entity_owed_service
         self.config = config
 
     # ── Queries ────────────────────────────────────────────────────────────
@@ -502,7 +530,12 @@ class StripeAuthorizationService:
 
     def poll_subscription_invoice_deposits(self) -> int:
         """Recovery poller: fetch recent paid Stripe invoices for each active subscription
-        and record any that were missed by the webhook."""
+        and record any that were missed by the webhook.
+
+        Subscriptions are listed concurrently and each one backs off according to
+        how long ago it last produced a payment."""
+        now = datetime.datetime.now()
+        next_poll_at = type(self)._subscription_next_poll_at
         auths = [
             a
             for a in self._list_active_authorizations(
@@ -510,34 +543,35 @@ class StripeAuthorizationService:
             )
             if a.stripe_subscription_id
         ]
+        for stale_id in set(next_poll_at) - {auth.id for auth in auths}:
+            next_poll_at.pop(stale_id, None)
+        auths = [auth for auth in auths if next_poll_at.get(auth.id, now) <= now]
+        results = self.stripe_service.call_concurrently(
+            lambda subscription_id: self.stripe_service.list_invoices_for_subscription(
+                subscription_id, limit=5
+            ),
+            [auth.stripe_subscription_id for auth in auths],
+        )
+
         processed = 0
-        for auth in auths:
-            try:
-                invoices = self.stripe_service.list_invoices_for_subscription(
-                    auth.stripe_subscription_id, limit=5
+        for auth, invoices in zip(auths, results):
+            if isinstance(invoices, StripeRequestError) and (
+                "no such subscription" in str(invoices).lower()
+            ):
+                logger.warning(
+                    "Subscription %s not found in Stripe, disabling authorization %d",
+                    auth.stripe_subscription_id,
+                    auth.id,
                 )
-            except StripeRequestError as exc:
-                if "no such subscription" in str(exc).lower():
-                    logger.warning(
-                        "Subscription %s not found in Stripe, disabling authorization %d",
-                        auth.stripe_subscription_id,
-                        auth.id,
-                    )
-                    auth.active = False
-                    auth.modified_at = datetime.datetime.now()
-                    self.db.flush()
-                else:
-                    logger.warning(
-                        "Failed to list invoices for subscription %s",
-                        auth.stripe_subscription_id,
-                        exc_info=True,
-                    )
+                auth.active = False
+                auth.modified_at = datetime.datetime.now()
+                self.db.flush()
                 continue
-            except Exception:
+            if isinstance(invoices, Exception):
                 logger.warning(
                     "Failed to list invoices for subscription %s",
                     auth.stripe_subscription_id,
-                    exc_info=True,
+                    exc_info=invoices,
                 )
                 continue
             logger.debug(
@@ -555,8 +589,15 @@ class StripeAuthorizationService:
                         invoice.id,
                         auth.stripe_subscription_id,
                     )
+            next_poll_at[auth.id] = self.stripe_service.next_poll_at(
+                auth.last_success_at or auth.created_at or now, now
+            )
         return processed
 
+    @classmethod
+    def reset_subscription_poll_schedule(cls) -> None:
+        cls._subscription_next_poll_at.clear()
+
     def handle_subscription_deleted(self, subscription_obj) -> None:
         """Deactivate the StripeAuthorization when its Stripe subscription is cancelled."""
         subscription_id = self.stripe_service._extract_object_id(subscription_obj)
@@ -632,36 +673,119 @@ class StripeAuthorizationService:
 
     # ── Recurring Charges ──────────────────────────────────────────────────
 
-    def run_weekly_entity_dynamic_charges(self) -> int:
+    def run_weekly_entity_dynamic_charges(self) -> EntityChargeRunReport:
+        """Charge every eligible entity's net debt for the current cycle.
+
+        Owed amounts for all candidates come from one invoice query and one
+        balance query. The pending deposits are committed, the Stripe charges
+        then run ``stripe_entity_charge_concurrency`` at a time with no
+        transaction open, and the outcomes are recorded together. Each charge
+        is keyed per entity/currency/cycle, so a re-run neither creates a
+        second deposit nor, via the Stripe idempotency key, a second charge.
+        """
+        started = time.perf_counter()
         now = datetime.datetime.now()
         week_key = f"{now.isocalendar().year}-W{now.isocalendar().week:02d}"
-        authorizations = self._list_active_authorizations(
+        report = EntityChargeRunReport()
+
+        cards_by_entity: dict[int, list[_Card]] = {}
+        for auth in self._list_active_authorizations(
             mode=StripeAuthorizationMode.ENTITY_DYNAMIC
-        )
-        entity_ids = sorted({a.entity_id for a in authorizations})
-        if not entity_ids:
-            return 0
+        ):
+            cards_by_entity.setdefault(auth.entity_id, []).append(_Card.of(auth))
+        if not cards_by_entity:
+            return report
 
-        eligible = set(self._list_resident_or_member_entity_ids(entity_ids))
-        processed = 0
-        for entity_id in entity_ids:
-            if entity_id not in eligible:
-                continue
-            try:
-                charges = self._compute_entity_dynamic_charges(entity_id)
-            except Exception:
-                logger.error(
-                    "entity_dynamic charge: skipping entity_id=%s due to error",
-                    entity_id,
-                    exc_info=True,
+        eligible = sorted(
+            self._list_resident_or_member_entity_ids(sorted(cards_by_entity))
+        )
+        report.entities = len(eligible)
+
+        # an entity left out has had its error logged by calculate_many
+        summaries = self.entity_owed_service.calculate_many(eligible)
+        charges: list[tuple[int, str, Decimal, str]] = []
+        for entity_id in eligible:
+            summary = summaries.get(entity_id)
+            if summary is None:
+                report.failures.append(
+                    {
+                        "entity_id": entity_id,
+                        "currency": None,
+                        "error": "owed amount could not be calculated",
+                    }
                 )
                 continue
-            for currency, amount in charges.items():
-                if amount > 0 and self._charge_entity_cycle(
-                    entity_id, currency, amount, week_key
-                ):
-                    processed += 1
-        return processed
+            for currency, amount in self._dynamic_charges(summary).items():
+                if amount > 0:
+                    cycle_key = f"entity:{entity_id}:{currency.lower()}:{week_key}"
+                    charges.append((entity_id, currency, amount, cycle_key))
+
+        existing = self._existing_cycle_keys([charge[3] for charge in charges])
+        report.skipped = sum(1 for charge in charges if charge[3] in existing)
+        jobs: list[tuple[int, int, str, Decimal, str]] = []
+        for entity_id, currency, amount, cycle_key in charges:
+            if cycle_key in existing:
+                continue
+            deposit = self._create_pending_charge_deposit(
+                target_entity_id=entity_id,
+                amount=amount,
+                currency=currency,
+                details={
+                    "stripe": {
+                        "mode": "authorization_charge",
+                        "charge_mode": StripeAuthorizationMode.ENTITY_DYNAMIC.value,
+                        "cycle_key": cycle_key,
+                        "attempts": [],
+                    }
+                },
+                comment=f"weekly authorization charge {cycle_key}",
+            )
+            jobs.append((deposit.id, entity_id, currency, amount, cycle_key))
+        self.db.commit()
+
+        results = self.stripe_service.call_concurrently(
+            lambda job: self._attempt_cards(
+                cards_by_entity[job[1]],
+                amount=job[3],
+                currency=job[2],
+                idempotency_prefix=job[4],
+                metadata={"entity_id": str(job[1]), "cycle_key": job[4]},
+            ),
+            jobs,
+            concurrency=self.config.stripe_entity_charge_concurrency,
+        )
+        for (deposit_id, entity_id, currency, _, _), attempts in zip(jobs, results):
+            if isinstance(attempts, Exception):
+                attempts = [{"result": "failed", "error": str(attempts)}]
+            self._record_charge_attempts(deposit_id, attempts)
+            if attempts and attempts[-1]["result"] == "success":
+                report.succeeded += 1
+            else:
+                report.failures.append(
+                    {
+                        "entity_id": entity_id,
+                        "currency": currency,
+                        "error": attempts[-1]["error"] if attempts else "no card",
+                    }
+                )
+        self.db.commit()
+
+        report.processed = len(jobs)
+        elapsed = time.perf_counter() - started
+        report.duration_seconds = round(elapsed, 3)
+        report.charges_per_second = round(len(jobs) / elapsed, 2) if elapsed else 0.0
+        logger.info(
+            "entity_dynamic charge: %d entities, %d charged (%d ok, %d failed), "
+            "%d already charged this cycle, %.3fs, %.2f charges/s",
+            report.entities,
+            report.processed,
+            report.succeeded,
+            report.processed - report.succeeded,
+            report.skipped,
+            report.duration_seconds,
+            report.charges_per_second,
+        )
+        return report
 
     def preview_weekly_entity_dynamic_charges(self) -> list[dict]:
         authorizations = self._list_active_authorizations(
@@ -717,52 +841,18 @@ class StripeAuthorizationService:
             comment="on-demand top-up",
         )
 
-        attempts: list[dict] = []
-        for auth in authorizations:
-            try:
-                pi_raw = self.stripe_service.create_off_session_payment_intent(
-                    amount=amount,
-                    currency=currency,
-                    customer_id=auth.stripe_customer_id,
-                    payment_method_id=auth.stripe_payment_method_id,
-                    idempotency_key=f"ondemand:{deposit.id}:auth:{auth.id}",
-                    metadata={
-                        "entity_id": str(entity_id),
-                        "authorization_id": str(auth.id),
-                    },
-                )
-                pi = self.stripe_service.normalize_payment_intent(pi_raw)
-                attempts.append(
-                    {
-                        "authorization_id": auth.id,
-                        "result": "success",
-                        "payment_intent_id": pi.id,
-                        "status": pi.status,
-                    }
-                )
-                self._record_charge_success(auth)
-                self._update_deposit_details(
-                    deposit,
-                    attempts,
-                    extra={
-                        "payment_intent_id": pi.id,
-                        "payment_intent_status": pi.status,
-                        "authorization_id": auth.id,
-                    },
-                )
-                self.deposit_service.complete(deposit.id)
-                return self.deposit_service.get(deposit.id)
-            except Exception as exc:
-                message = str(exc)
-                self._record_charge_failure(auth, message)
-                attempts.append(
-                    {"authorization_id": auth.id, "result": "failed", "error": message}
-                )
-
-        self._update_deposit_details(deposit, attempts)
-        self.deposit_service.update(
-            deposit.id, DepositUpdateSchema(status=DepositStatus.FAILED)
+        deposit_id = deposit.id
+        attempts = self._charge_cards(
+            deposit_id,
+            [_Card.of(auth) for auth in authorizations],
+            amount=amount,
+            currency=currency,
+            idempotency_prefix=f"ondemand:{deposit_id}",
+            metadata={"entity_id": str(entity_id)},
         )
+        if attempts[-1]["result"] == "success":
+            return self.deposit_service.get(deposit_id)
+
         last_error = next(
             (a["error"] for a in reversed(attempts) if a.get("result") == "failed"),
             None,
@@ -770,85 +860,6 @@ class StripeAuthorizationService:
         detail = f": {last_error}" if last_error else "."
         raise StripeRequestError(f"All Stripe card attempts failed{detail}")
 
-    def _charge_entity_cycle(
-        self,
-        entity_id: int,
-        currency: str,
-        amount: Decimal,
-        week_key: str,
-    ) -> bool:
-        cycle_key = f"entity:{entity_id}:{currency.lower()}:{week_key}"
-        if self._cycle_exists(cycle_key):
-            return False
-
-        deposit = self._create_pending_charge_deposit(
-            target_entity_id=entity_id,
-            amount=amount,
-            currency=currency,
-            details={
-                "stripe": {
-                    "mode": "authorization_charge",
-                    "charge_mode": StripeAuthorizationMode.ENTITY_DYNAMIC.value,
-                    "cycle_key": cycle_key,
-                    "attempts": [],
-                }
-            },
-            comment=f"weekly authorization charge {cycle_key}",
-        )
-
-        authorizations = self._list_active_authorizations(
-            entity_id=entity_id, mode=StripeAuthorizationMode.ENTITY_DYNAMIC
-        )
-        attempts: list[dict] = []
-
-        for auth in authorizations:
-            try:
-                pi_raw = self.stripe_service.create_off_session_payment_intent(
-                    amount=amount,
-                    currency=currency,
-                    customer_id=auth.stripe_customer_id,
-                    payment_method_id=auth.stripe_payment_method_id,
-                    idempotency_key=f"{cycle_key}:auth:{auth.id}",
-                    metadata={
-                        "entity_id": str(entity_id),
-                        "authorization_id": str(auth.id),
-                        "cycle_key": cycle_key,
-                    },
-                )
-                pi = self.stripe_service.normalize_payment_intent(pi_raw)
-                attempts.append(
-                    {
-                        "authorization_id": auth.id,
-                        "result": "success",
-                        "payment_intent_id": pi.id,
-                        "status": pi.status,
-                    }
-                )
-                self._record_charge_success(auth)
-                self._update_deposit_details(
-                    deposit,
-                    attempts,
-                    extra={
-                        "payment_intent_id": pi.id,
-                        "payment_intent_status": pi.status,
-                        "authorization_id": auth.id,
-                    },
-                )
-                self.deposit_service.complete(deposit.id)
-                return True
-            except Exception as exc:
-                message = str(exc)
-                self._record_charge_failure(auth, message)
-                attempts.append(
-                    {"authorization_id": auth.id, "result": "failed", "error": message}
-                )
-
-        self._update_deposit_details(deposit, attempts)
-        self.deposit_service.update(
-            deposit.id, DepositUpdateSchema(status=DepositStatus.FAILED)
-        )
-        return True
-
     def _charge_guest_authorization(
         self,
         auth: StripeAuthorization,
@@ -879,49 +890,134 @@ class StripeAuthorizationService:
             actor_entity_id=auth.entity_id,
         )
 
-        try:
-            pi_raw = self.stripe_service.create_off_session_payment_intent(
-                amount=amount,
-                currency=currency,
-                customer_id=auth.stripe_customer_id,
-                payment_method_id=auth.stripe_payment_method_id,
-                idempotency_key=f"{cycle_key}:auth:{auth.id}",
-                metadata={
-                    "entity_id": str(auth.entity_id),
-                    "authorization_id": str(auth.id),
-                    "cycle_key": cycle_key,
-                },
-            )
-            pi = self.stripe_service.normalize_payment_intent(pi_raw)
-            self._record_charge_success(auth)
-            self._update_deposit_details(
-                deposit,
-                [
-                    {
-                        "authorization_id": auth.id,
-                        "result": "success",
-                        "payment_intent_id": pi.id,
-                        "status": pi.status,
-                    }
-                ],
-            )
-            self.deposit_service.complete(deposit.id)
-        except Exception as exc:
-            self._record_charge_failure(auth, str(exc))
-            self._update_deposit_details(
-                deposit,
-                [
+        self._charge_cards(
+            deposit.id,
+            [_Card.of(auth)],
+            amount=amount,
+            currency=currency,
+            idempotency_prefix=cycle_key,
+            metadata={"entity_id": str(auth.entity_id), "cycle_key": cycle_key},
+        )
+        return True
+
+    def _charge_cards(
+        self,
+        deposit_id: int,
+        cards: list[_Card],
+        *,
+        amount: Decimal,
+        currency: str,
+        idempotency_prefix: str,
+        metadata: dict[str, str],
+    ) -> list[dict]:
+        """Charge *cards* in order until one succeeds and settle the pending deposit.
+
+        The pending deposit is committed first and Stripe is called with no
+        transaction open, so a slow Stripe response holds neither a pooled
+        connection nor row locks. The outcome is then written in a new short
+        transaction. If the process dies in between, the deposit stays pending
+        with its cycle key, and the idempotency keys make a retried charge safe.
+        Returns the attempts; the last one is the success, if any.
+        """
+        self.db.commit()
+        attempts = self._attempt_cards(
+            cards,
+            amount=amount,
+            currency=currency,
+            idempotency_prefix=idempotency_prefix,
+            metadata=metadata,
+        )
+        self._record_charge_attempts(deposit_id, attempts)
+        self.db.commit()
+        return attempts
+
+    def _attempt_cards(
+        self,
+        cards: list[_Card],
+        *,
+        amount: Decimal,
+        currency: str,
+        idempotency_prefix: str,
+        metadata: dict[str, str],
+    ) -> list[dict]:
+        """Try *cards* in order until one is charged; touches Stripe only."""
+        attempts: list[dict] = []
+        for card in cards:
+            try:
+                pi_raw = self.stripe_service.create_off_session_payment_intent(
+                    amount=amount,
+                    currency=currency,
+                    customer_id=card.customer_id,
+                    payment_method_id=card.payment_method_id,
+                    idempotency_key=(
+                        f"{idempotency_prefix}:auth:{card.authorization_id}"
+                    ),
+                    metadata={
+                        **metadata,
+                        "authorization_id": str(card.authorization_id),
+                    },
+                )
+                pi = self.stripe_service.normalize_payment_intent(pi_raw)
+            except Exception as exc:
+                attempts.append(
                     {
-                        "authorization_id": auth.id,
+                        "authorization_id": card.authorization_id,
                         "result": "failed",
                         "error": str(exc),
                     }
-                ],
+                )
+                continue
+            attempts.append(
+                {
+                    "authorization_id": card.authorization_id,
+                    "result": "success",
+                    "payment_intent_id": pi.id,
+                    "status": pi.status,
+                }
+            )
+            break
+
+        return attempts
+
+    def _record_charge_attempts(self, deposit_id: int, attempts: list[dict]) -> None:
+        # a job that failed before reaching a card leaves attempts without an id
+        authorizations = {
+            auth.id: auth
+            for auth in self.db.query(StripeAuthorization).filter(
+                StripeAuthorization.id.in_(
+                    [a["authorization_id"] for a in attempts if "authorization_id" in a]
+                )
             )
+        }
+        for attempt in attempts:
+            auth = authorizations.get(attempt.get("authorization_id"))
+            if auth is None:
+                continue
+            if attempt["result"] == "success":
+                self._record_charge_success(auth)
+            else:
+                self._record_charge_failure(auth, attempt["error"])
+
+        deposit = self.deposit_service.get(deposit_id)
+        success = (
+            attempts[-1] if attempts and attempts[-1]["result"] == "success" else None
+        )
+        if success is None:
+            self._update_deposit_details(deposit, attempts)
             self.deposit_service.update(
-                deposit.id, DepositUpdateSchema(status=DepositStatus.FAILED)
+                deposit_id, DepositUpdateSchema(status=DepositStatus.FAILED)
             )
-        return True
+            return
+        self._update_deposit_details(
+            deposit,
+            attempts,
+            extra={
+                "payment_intent_id": success["payment_intent_id"],
+                "payment_intent_status": success["status"],
+                "authorization_id": success["authorization_id"],
+            },
+        )
+        self.deposit_service.complete(deposit_id)
 
     def _update_deposit_details(
         self,
@@ -991,8 +1087,8 @@ class StripeAuthorizationService:
 
     # ── Charge Calculation ─────────────────────────────────────────────────
 
-    def _compute_entity_dynamic_charges(self, entity_id: int) -> dict[str, Decimal]:
-        summary = self._calculate_entity_owed_summary(entity_id)
+    @staticmethod
+    def _dynamic_charges(summary: EntityOwedSummary) -> dict[str, Decimal]:
         if not summary.minimum_topup_currency or not summary.minimum_topup_amount:
             return {}
         return {
@@ -1015,7 +1111,7 @@ class StripeAuthorizationService:
             else False
         )
 
-        summary = self._calculate_entity_owed_summary(entity_id)
+        summary = self.entity_owed_service.calculate(entity_id)
         minimum_currency = summary.minimum_topup_currency
         minimum_amount = summary.minimum_topup_amount
 
@@ -1074,62 +1170,6 @@ class StripeAuthorizationService:
 
     # ── Financial Helpers ──────────────────────────────────────────────────
 
-    def _calculate_entity_owed_summary(self, entity_id: int) -> EntityOwedSummary:
-        pending_invoices = (
-            self.db.query(Invoice)
-            .filter(
-                Invoice.from_entity_id == entity_id,
-                Invoice.status == InvoiceStatus.PENDING,
-            )
-            .all()
-        )
-        invoice_list: list[dict[str, Decimal]] = []
-        for inv in pending_invoices:
-            options = invoice_currency_options(inv)
-            if options:
-                invoice_list.append(options)
-
-        balances = self.balance_service.get_balances(entity_id)
-        completed_totals: dict[str, Decimal] = {
-            str(c or "").lower().strip(): Decimal(str(a or "0"))
-            for c, a in (balances.completed or {}).items()
-            if str(c or "").strip()
-        }
-
-        return calculate_entity_owed(
-            pending_invoices=invoice_list,
-            completed_balances=completed_totals,
-            convert_amount=self._convert_amount,
-        )
-
-    def _convert_amount(
-        self, amount: Decimal, source_currency: str, target_currency: str
-    ) -> Decimal:
-        source = str(source_currency or "").lower().strip()
-        target = str(target_currency or "").lower().strip()
-        decimal_amount = Decimal(str(amount or "0"))
-        if decimal_amount == 0:
-            return Decimal("0")
-        if source == target:
-            return decimal_amount
-        try:
-            _, target_amount, _ = self.currency_exchange_service.calculate_conversion(
-                source_amount=decimal_amount,
-                target_amount=None,
-                source_currency=source,
-                target_currency=target,
-            )
-            return Decimal(str(target_amount))
-        except Exception:
-            logger.error(
-                "Currency conversion failed: %s %s -> %s",
-                decimal_amount,
-                source,
-                target,
-                exc_info=True,
-            )
-            raise
-
     # ── DB Helpers ─────────────────────────────────────────────────────────
 
     def _list_active_authorizations(
@@ -1163,6 +1203,17 @@ class StripeAuthorizationService:
         )
         return [row[0] for row in rows]
 
+    def _existing_cycle_keys(self, cycle_keys: list[str]) -> set[str]:
+        if not cycle_keys:
+            return set()
+        cycle_key = Deposit.details["stripe"]["cycle_key"].as_string()
+        rows = (
+            self.db.query(cycle_key)
+            .filter(Deposit.provider == "stripe", cycle_key.in_(cycle_keys))
+            .all()
+        )
+        return {row[0] for row in rows}
+
     def _cycle_exists(self, cycle_key: str) -> bool:
         return bool(
             self.deposit_service.get_all(
@@ -1,7 +1,7 @@
 """Transaction service"""
 
 from decimal import Decimal
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, Iterable
 
 from app.dependencies.services import (
     get_balance_service,
@@ -13,7 +13,9 @@ from app.errors.transaction import (
     CompletedTransactionNotEditable,
     TransactionWillOverdraftTreasury,
 )
-from app.models.transaction import Transaction, TransactionStatus
+from app.events import TRANSACTION_CREATED, EventBroker
+from app.models.entity import Entity
+from app.models.transaction import Transaction, TransactionStatus, transactions_tags
 from app.schemas.transaction import (
     TransactionCreateSchema,
     TransactionFiltersSchema,
@@ -26,8 +28,9 @@ from app.services.tag import TagService
 from app.services.treasury import TreasuryService
 from app.uow import get_uow
 from fastapi import Depends
-from sqlalchemy import or_
-from sqlalchemy.orm import Query, Session
+from sqlalchemy import insert, or_
+from sqlalchemy.orm import Query, Session, selectinload
+from sqlalchemy.orm.interfaces import LoaderOption
 
 if TYPE_CHECKING:
     from app.services.invoice import InvoiceService
@@ -68,25 +71,82 @@ class TransactionService(TaggableServiceMixin[Transaction], BaseService[Transact
         invalidate_stats: bool = False,
     ) -> None:
         """Invalidate cache entries for affected entities and treasuries."""
+        self._invalidate_caches_many(
+            (from_entity_id, to_entity_id),
+            treasury_ids,
+            invalidate_stats=invalidate_stats,
+        )
 
+    def _invalidate_caches_many(
+        self,
+        entity_ids_to_invalidate: Iterable[int | None],
+        treasury_ids_to_invalidate: Iterable[int | None],
+        *,
+        invalidate_stats: bool = False,
+    ) -> None:
         entity_ids: set[int] = set()
         affected_treasury_ids: set[int] = set()
-        for entity_id in (from_entity_id, to_entity_id):
-            if entity_id is None:
+        for entity_id in entity_ids_to_invalidate:
+            if entity_id is None or entity_id in entity_ids:
                 continue
             self._balance_service.invalidate_cache_entry(entity_id)
             entity_ids.add(entity_id)
 
-        for tid in treasury_ids:
-            if tid is not None:
+        for tid in treasury_ids_to_invalidate:
+            if tid is not None and tid not in affected_treasury_ids:
                 self._balance_service.invalidate_treasury_cache_entry(tid)
                 affected_treasury_ids.add(tid)
 
-        if invalidate_stats and (entity_ids or affected_treasury_ids):
-            from app.services.stats import StatsService
+        if invalidate_stats:
+            self._invalidate_stats_caches(entity_ids, affected_treasury_ids)
 
-            StatsService.invalidate_entity_cache(*entity_ids)
-            StatsService.invalidate_treasury_cache(*affected_treasury_ids)
+    def _publish_created(
+        self,
+        tx_id: int,
+        from_entity_id: int,
+        to_entity_id: int,
+        from_treasury_id: int | None = None,
+        to_treasury_id: int | None = None,
+    ) -> None:
+        subjects = [f"entity:{from_entity_id}", f"entity:{to_entity_id}"]
+        subjects += [
+            f"treasury:{treasury_id}"
+            for treasury_id in (from_treasury_id, to_treasury_id)
+            if treasury_id is not None
+        ]
+        for subject in dict.fromkeys(subjects):
+            EventBroker.publish_on_commit(
+                self.db, subject, TRANSACTION_CREATED, transaction_id=tx_id
+            )
+
+    @staticmethod
+    def _invalidate_stats_caches(
+        entity_ids: Iterable[int], treasury_ids: Iterable[int] = ()
+    ) -> None:
+        entity_ids, treasury_ids = set(entity_ids), set(treasury_ids)
+        if not entity_ids and not treasury_ids:
+            return
+        from app.services.fee import FeeService
+        from app.services.stats import StatsService
+
+        StatsService.invalidate_entity_cache(*entity_ids)
+        StatsService.invalidate_treasury_cache(*treasury_ids)
+        # Invoice payments always come from the invoice's debtor.
+        FeeService.invalidate_entity_cache(*entity_ids)
+
+    def _list_loaders(self) -> dict[str, LoaderOption]:
+        return {
+            "actor_entity": selectinload(self.model.actor_entity).selectinload(
+                Entity.tags
+            ),
+            "from_entity": selectinload(self.model.from_entity).selectinload(
+                Entity.tags
+            ),
+            "to_entity": selectinload(self.model.to_entity).selectinload(Entity.tags),
+            "tags": selectinload(self.model.tags),
+            "from_treasury": selectinload(self.model.from_treasury),
+            "to_treasury": selectinload(self.model.to_treasury),
+        }
 
     def _apply_filters(  # type: ignore[override]
         self, query: Query[Transaction], filters: TransactionFiltersSchema
@@ -215,7 +275,101 @@ class TransactionService(TaggableServiceMixin[Transaction], BaseService[Transact
             schema.to_treasury_id,
             invalidate_stats=True,
         )
-        return super().create(schema, overrides)
+        tx = super().create(schema, overrides)
+        self._publish_created(
+            tx.id,
+            tx.from_entity_id,
+            tx.to_entity_id,
+            tx.from_treasury_id,
+            tx.to_treasury_id,
+        )
+        return tx
+
+    def create_many(
+        self, rows: list[dict[str, Any]], tag_ids: list[list[int]]
+    ) -> list[int]:
+        """Insert pre-validated transactions with one multi-row INSERT.
+
+        Unlike ``create`` this does not validate invoices, balances or
+        treasuries: batch jobs are expected to plan payments up front. Every
+        row must carry the same keys. Returns new ids in ``rows`` order.
+        """
+        if not rows:
+            return []
+        tx_ids = list(
+            self.db.scalars(
+                insert(Transaction).returning(
+                    Transaction.id, sort_by_parameter_order=True
+                ),
+                rows,
+            )
+        )
+        tag_rows = [
+            {"transaction_id": tx_id, "tag_id": tag_id}
+            for tx_id, row_tag_ids in zip(tx_ids, tag_ids)
+            for tag_id in dict.fromkeys(row_tag_ids)
+        ]
+        if tag_rows:
+            self.db.execute(insert(transactions_tags), tag_rows)
+        for tx_id, row in zip(tx_ids, rows):
+            self._publish_created(
+                tx_id,
+                row["from_entity_id"],
+                row["to_entity_id"],
+                row.get("from_treasury_id"),
+                row.get("to_treasury_id"),
+            )
+        self._invalidate_caches_many(
+            [row["from_entity_id"] for row in rows]
+            + [row["to_entity_id"] for row in rows],
+            [row.get("from_treasury_id") for row in rows]
+            + [row.get("to_treasury_id") for row in rows],
+            invalidate_stats=any(
+                row.get("status") == TransactionStatus.COMPLETED for row in rows
+            ),
+        )
+        return tx_ids
+
+    def create_completed_transfer(
+        self, schema: TransactionCreateSchema, overrides: dict = {}
+    ) -> int:
+        """Insert a COMPLETED entity-to-entity transfer on the hot path (POS).
+
+        One INSERT ... RETURNING plus one tags INSERT, without the ORM flush and
+        refresh of ``create``. Invoice and treasury transactions are not
+        supported: they need the validation in ``create``. Cached balances of
+        both entities are adjusted on commit rather than invalidated.
+        """
+        data = {**schema.dump(), **overrides, "status": TransactionStatus.COMPLETED}
+        tag_ids = data.pop("tag_ids", [])
+        if any(
+            data.get(key) is not None
+            for key in (
+                "invoice_id",
+                "invoice_item_id",
+                "from_treasury_id",
+                "to_treasury_id",
+            )
+        ):
+            raise ValueError("Use create() for invoice and treasury transactions")
+        tx_id = self.db.scalar(insert(Transaction).returning(Transaction.id), data)
+        if tag_ids:
+            self.db.execute(
+                insert(transactions_tags),
+                [
+                    {"transaction_id": tx_id, "tag_id": tag_id}
+                    for tag_id in dict.fromkeys(tag_ids)
+                ],
+            )
+        self._balance_service.apply_completed_transfer(
+            data["from_entity_id"],
+            data["to_entity_id"],
+            data["currency"],
+            data["amount"],
+        )
+        self._invalidate_stats_caches({data["from_entity_id"], data["to_entity_id"]})
+        self._publish_created(tx_id, data["from_entity_id"], data["to_entity_id"])
+        return tx_id
 
     def update(  # type: ignore[override]
         self, obj_id: int, schema: TransactionUpdateSchema, overrides: dict = {}
@@ -0,0 +1,47 @@
+"""Webhook inbox service – persists provider callbacks for asynchronous processing.
+
+Callback routes only verify and store the event here, then reply right away;
+the inbox worker (``app.tasks.webhook_inbox``) applies it in its own unit of
+work. A redelivered event hits the unique ``(provider, event_id)`` constraint
+and is dropped.
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import Any
+
+from app.models.webhook_inbox import WebhookInbox
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+
+class WebhookInboxService:
+    def __init__(self, db: Session) -> None:
+        self.db = db
+
+    def enqueue(
+        self,
+        *,
+        provider: str,
+        event_id: str,
+        payload: dict[str, Any],
+        event_type: str | None = None,
+    ) -> bool:
+        """Store an event. Returns False if it was already received."""
+        try:
+            with self.db.begin_nested():
+                self.db.add(
+                    WebhookInbox(
+                        provider=provider,
+                        event_id=event_id,
+                        event_type=event_type,
+                        payload=payload,
+                    )
+                )
+        except IntegrityError:
+            logger.info("Duplicate %s webhook %s ignored", provider, event_id)
+            return False
+        return True
@@ -14,14 +14,17 @@ from __future__ import annotations
 import datetime
 import logging
 import random
+from collections import defaultdict
 from decimal import ROUND_UP, Decimal
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Mapping
 
 from app.config import Config
 from app.dependencies.services import ServiceContainer
 from app.models.entity import Entity
 from app.models.invoice import Invoice, InvoiceStatus
-from app.services.entity_owed import calculate_entity_owed, invoice_currency_options
+from app.schemas.balance import BalanceSchema
+from app.services.entity_owed import calculate_entity_owed
+from app.services.invoice_queries import sum_invoice_currency_options
 from app.services.notification import NotificationService
 from app.tasks import PeriodicTask
 from sqlalchemy import nullslast
@@ -50,32 +53,27 @@ _GREETINGS = (
 # ---------------------------------------------------------------------------
 
 
-def _fmt_amounts(amounts: list[dict]) -> str:
-    """Return a human-readable string for a list of {currency, amount} dicts."""
-    parts = []
-    for entry in amounts:
-        currency = str(entry.get("currency", "")).upper()
-        amount = Decimal(str(entry.get("amount", "0")))
-        parts.append(f"{amount:,.2f} {currency}")
-    return " or ".join(parts)
+def _fmt_amounts(amounts: Mapping[str, Decimal]) -> str:
+    """Return a human-readable string for ``{currency: amount}`` alternatives."""
+    return " or ".join(
+        f"{amount:,.2f} {currency.upper()}" for currency, amount in amounts.items()
+    )
 
 
-def _per_invoice_amounts(invoices: list[Invoice]) -> list[dict[str, Decimal]]:
+def _per_invoice_amounts(
+    invoices: list[Invoice], invoice_options: Mapping[int, dict[str, Decimal]]
+) -> list[dict[str, Decimal]]:
     """Return per-invoice alternative currency amounts.
 
     Each element is one invoice represented as ``{currency: amount}`` where the
     currencies are *alternatives* — paying in any single one satisfies the invoice.
     """
-    result: list[dict[str, Decimal]] = []
-    for inv in invoices:
-        options = invoice_currency_options(inv)
-        if options:
-            result.append(options)
-    return result
+    return [options for inv in invoices if (options := invoice_options.get(inv.id))]
 
 
 def _calc_recommended_topup(
     pending_invoices: list[Invoice],
+    invoice_options: Mapping[int, dict[str, Decimal]],
     all_balances: dict[str, Decimal],
     convert_amount,
 ) -> dict[str, Decimal]:
@@ -84,7 +82,7 @@ def _calc_recommended_topup(
     Uses the shared owed calculation so reminders match Stripe auto-charge logic.
     """
     summary = calculate_entity_owed(
-        pending_invoices=_per_invoice_amounts(pending_invoices),
+        pending_invoices=_per_invoice_amounts(pending_invoices, invoice_options),
         completed_balances=all_balances,
         convert_amount=convert_amount,
     )
@@ -100,13 +98,16 @@ def _calc_recommended_topup(
 def _build_reminder_message(
     negative_balances: dict[str, Decimal],
     pending_invoices: list[Invoice],
+    invoice_options: Mapping[int, dict[str, Decimal]],
     all_balances: dict[str, Decimal],
     entity_name: str,
     convert_amount,
 ) -> str:
     lines: list[str] = [f"{random.choice(_GREETINGS)}, <b>{entity_name}</b>."]
 
-    topup = _calc_recommended_topup(pending_invoices, all_balances, convert_amount)
+    topup = _calc_recommended_topup(
+        pending_invoices, invoice_options, all_balances, convert_amount
+    )
     if topup:
         topup_rounded = {
             currency: int(amount.to_integral_value(rounding=ROUND_UP))
@@ -134,7 +135,7 @@ def _build_reminder_message(
         lines.append("\n📋 Unpaid invoices:")
         for inv in pending_invoices:
             period = inv.billing_period.strftime("%b %Y") if inv.billing_period else "—"
-            amounts_str = _fmt_amounts(inv.amounts or [])
+            amounts_str = _fmt_amounts(invoice_options.get(inv.id, {}))
             lines.append(f"  • Invoice #{inv.id} — {period} — {amounts_str}")
 
     return "\n".join(lines)
@@ -147,13 +148,18 @@ def _build_reminder_message(
 
 def send_balance_reminder(
     entity: Entity,
-    db: "Session",
-    balance_service: "BalanceService",
+    *,
+    balance: BalanceSchema,
+    pending_invoices: list[Invoice],
+    invoice_options: Mapping[int, dict[str, Decimal]],
     currency_exchange_service: "CurrencyExchangeService",
     notification_service: NotificationService,
 ) -> dict[str, bool] | None:
     """Send a balance reminder to a single entity if needed.
 
+    ``balance``, ``pending_invoices`` and ``invoice_options`` are prefetched by
+    :func:`send_reminders_to_all`, so building the message runs no queries.
+
     Returns the per-channel delivery results if a message was sent,
     or ``None`` if the entity had nothing to report (or no channels configured).
     """
@@ -161,25 +167,11 @@ def send_balance_reminder(
     if not auth.get("telegram_id"):
         return None
 
-    balance = balance_service.get_balances(entity.id)
     negative_balances: dict[str, Decimal] = {}
     for currency, cd in balance.completed.items():
         if cd.value < Decimal(0):
             negative_balances[currency] = cd.value
 
-    pending_invoices: list[Invoice] = (
-        db.query(Invoice)
-        .filter(
-            Invoice.from_entity_id == entity.id,
-            Invoice.status == InvoiceStatus.PENDING,
-        )
-        .order_by(
-            nullslast(Invoice.billing_period.asc()),
-            Invoice.id.asc(),
-        )
-        .all()
-    )
-
     if not negative_balances and not pending_invoices:
         return None
 
@@ -207,6 +199,7 @@ def send_balance_reminder(
     message = _build_reminder_message(
         negative_balances,
         pending_invoices,
+        invoice_options,
         all_balances={
             currency: cd.value
             for currency, cd in balance.completed.items()
@@ -230,19 +223,55 @@ def send_reminders_to_all(
     currency_exchange_service: "CurrencyExchangeService",
     notification_service: NotificationService,
 ) -> int:
-    """Send reminders to all active entities that need attention. Returns number sent."""
-    entities: list[Entity] = (
-        db.query(Entity)
-        .filter(Entity.active.is_(True))
-        .filter(Entity.auth.isnot(None))
+    """Send reminders to all active entities that need attention. Returns number sent.
+
+    Balances, pending invoices and their payment options are prefetched for
+    every recipient up front, so the number of queries does not depend on
+    how many entities are reminded.
+    """
+    entities: list[Entity] = [
+        entity
+        for entity in (
+            db.query(Entity)
+            .filter(Entity.active.is_(True))
+            .filter(Entity.auth.isnot(None))
+            .all()
+        )
+        if (entity.auth or {}).get("telegram_id")
+    ]
+    if not entities:
+        return 0
+    entity_ids = [entity.id for entity in entities]
+
+    balances = balance_service.get_balances_many(entity_ids)
+    pending_filters = [
+        Invoice.from_entity_id.in_(entity_ids),
+        Invoice.status == InvoiceStatus.PENDING,
+    ]
+    pending_by_entity: dict[int, list[Invoice]] = defaultdict(list)
+    for invoice in (
+        db.query(Invoice)
+        .filter(*pending_filters)
+        .order_by(
+            nullslast(Invoice.billing_period.asc()),
+            Invoice.id.asc(),
+        )
         .all()
+    ):
+        pending_by_entity[invoice.from_entity_id].append(invoice)
+    invoice_options = (
+        sum_invoice_currency_options(db=db, filters=pending_filters)
+        if pending_by_entity
+        else {}
     )
+
     sent_count = 0
     for entity in entities:
         results = send_balance_reminder(
             entity,
-            db=db,
-            balance_service=balance_service,
+            balance=balances[entity.id],
+            pending_invoices=pending_by_entity.get(entity.id, []),
+            invoice_options=invoice_options,
             currency_exchange_service=currency_exchange_service,
             notification_service=notification_service,
         )
@@ -277,7 +306,7 @@ class BalanceReminderTask(PeriodicTask):
             db=container.db,
             balance_service=container.balance_service,
             currency_exchange_service=container.currency_exchange_service,
-            notification_service=NotificationService(config),
+            notification_service=container.notification_service,
         )
 
 
@@ -0,0 +1,319 @@
+"""Notification outbox dispatch task.
+
+Request paths only insert ``notification_outbox`` rows. This task claims due
+rows, sends them to Telegram concurrently through the shared pooled HTTP client and
+paces requests with token buckets so Telegram's limits (about 30 messages per
+second per bot, one per second per chat and 20 per minute per group) are not
+hit. A 429 or transient error reschedules the row through ``next_attempt_at``
+instead of sleeping in the caller. Each chat's share of a batch is capped at what
+its bucket lets through well within the claim lease, so no row is still waiting
+to be sent when another dispatcher may claim it again.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import datetime
+import logging
+import time
+from dataclasses import dataclass
+from typing import Callable
+
+import requests
+from app.config import Config, get_config
+from app.db import DatabaseConnection
+from app.http import HttpClient, get_http_client
+from app.models.notification_outbox import NotificationOutbox, NotificationOutboxStatus
+from app.uow import UnitOfWork
+from sqlalchemy import case, func, select
+
+logger = logging.getLogger(__name__)
+
+_GLOBAL_RATE_PER_SECOND = 30.0
+_CHAT_RATE_PER_SECOND = 1.0
+_GROUP_RATE_PER_SECOND = 20 / 60
+_BATCH_SIZE = 50
+_POLL_INTERVAL_SECONDS = 1.0
+# A claimed row becomes due again after this long, e.g. if the process dies.
+_CLAIM_LEASE_SECONDS = 120
+# A batch claims per chat only what its bucket sends in this long: well inside
+# the lease, and short enough that a busy group does not hold up other chats.
+_CLAIM_SEND_SECONDS = 15
+_MAX_ATTEMPTS = 6
+_MAX_BACKOFF_SECONDS = 600
+_REQUEST_TIMEOUT = (3.05, 10)
+
+
+class TokenBucket:
+    """Token bucket that hands out send slots at ``rate`` per second.
+
+    ``reserve`` consumes a token immediately and returns how long the caller
+    has to wait for it, so concurrent coroutines queue up in call order without
+    a lock (the event loop runs ``reserve`` atomically).
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.rate = rate
+        self.capacity = capacity
+        self._clock = clock
+        self._tokens = capacity
+        self._updated_at = clock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(
+            self.capacity, self._tokens + (now - self._updated_at) * self.rate
+        )
+        self._updated_at = now
+
+    def reserve(self) -> float:
+        self._refill()
+        self._tokens -= 1
+        if self._tokens >= 0:
+            return 0.0
+        return -self._tokens / self.rate
+
+    @property
+    def idle(self) -> bool:
+        self._refill()
+        return self._tokens >= self.capacity
+
+    async def acquire(self) -> None:
+        delay = self.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+@dataclass(frozen=True, slots=True)
+class _Delivery:
+    id: int
+    chat_id: int
+    payload: dict
+    attempts: int
+
+
+@dataclass(frozen=True, slots=True)
+class _Outcome:
+    id: int
+    sent: bool = False
+    retry_after: float | None = None
+    error: str | None = None
+    # payload to store when the message was changed before a retry
+    payload: dict | None = None
+
+
+def _claim_limit(chat_rate: float) -> int:
+    """Rows of one chat that its bucket sends within ``_CLAIM_SEND_SECONDS``."""
+    return max(1, int(chat_rate * _CLAIM_SEND_SECONDS))
+
+
+def _backoff_seconds(attempts: int) -> float:
+    return min(2**attempts * 5, _MAX_BACKOFF_SECONDS)
+
+
+class NotificationDispatcher:
+    def __init__(
+        self,
+        config: Config,
+        db_conn: DatabaseConnection | None = None,
+        http: HttpClient | None = None,
+    ) -> None:
+        self.config = config
+        self.db_conn = db_conn or DatabaseConnection(config)
+        # POSTs are not retried by the client; failures are rescheduled below.
+        self.http = http or get_http_client()
+        self._global_bucket = TokenBucket(
+            _GLOBAL_RATE_PER_SECOND, capacity=_GLOBAL_RATE_PER_SECOND
+        )
+        self._chat_buckets: dict[int, TokenBucket] = {}
+
+    def _chat_bucket(self, chat_id: int) -> TokenBucket:
+        bucket = self._chat_buckets.get(chat_id)
+        if bucket is None:
+            # Negative chat ids are groups and channels, which have a lower limit.
+            rate = _GROUP_RATE_PER_SECOND if chat_id < 0 else _CHAT_RATE_PER_SECOND
+            bucket = self._chat_buckets[chat_id] = TokenBucket(rate)
+        return bucket
+
+    def _prune_chat_buckets(self) -> None:
+        for chat_id in [
+            chat_id for chat_id, bucket in self._chat_buckets.items() if bucket.idle
+        ]:
+            del self._chat_buckets[chat_id]
+
+    def claim_due(self, limit: int = _BATCH_SIZE) -> list[_Delivery]:
+        """Lease due rows so that concurrent dispatchers never pick the same one.
+
+        At most ``_CLAIM_SEND_SECONDS`` worth of sends is claimed per chat, e.g.
+        5 rows of a group chat; the rest wait for a later batch.
+        """
+        now = datetime.datetime.now()
+        ranked = (
+            select(
+                NotificationOutbox.id,
+                NotificationOutbox.chat_id,
+                func.row_number()
+                .over(
+                    partition_by=NotificationOutbox.chat_id,
+                    order_by=NotificationOutbox.id,
+                )
+                .label("position"),
+            )
+            .where(
+                NotificationOutbox.status == NotificationOutboxStatus.PENDING,
+                NotificationOutbox.next_attempt_at <= now,
+            )
+            .subquery()
+        )
+        per_chat_limit = case(
+            (ranked.c.chat_id < 0, _claim_limit(_GROUP_RATE_PER_SECOND)),
+            else_=_claim_limit(_CHAT_RATE_PER_SECOND),
+        )
+        claimable_ids = (
+            select(ranked.c.id)
+            .where(ranked.c.position <= per_chat_limit)
+            .order_by(ranked.c.id)
+            .limit(limit)
+        )
+        with UnitOfWork(self.db_conn.get_session()) as uow:
+            # FOR UPDATE cannot lock a window query, so the capped ids are
+            # picked first and their rows locked here. The due check is repeated
+            # so a row leased meanwhile by another dispatcher is passed over.
+            rows = (
+                uow.db.query(NotificationOutbox)
+                .filter(
+                    NotificationOutbox.id.in_(claimable_ids),
+                    NotificationOutbox.status == NotificationOutboxStatus.PENDING,
+                    NotificationOutbox.next_attempt_at <= now,
+                )
+                .order_by(NotificationOutbox.id)
+                .with_for_update(skip_locked=True)
+                .all()
+            )
+            deliveries = []
+            for row in rows:
+                row.attempts += 1
+                row.next_attempt_at = now + datetime.timedelta(
+                    seconds=_CLAIM_LEASE_SECONDS
+                )
+                deliveries.append(
+                    _Delivery(
+                        id=row.id,
+                        chat_id=row.chat_id,
+                        payload=dict(row.payload),
+                        attempts=row.attempts,
+                    )
+                )
+            return deliveries
+
+    def record(self, outcome: _Outcome, attempts: int) -> None:
+        now = datetime.datetime.now()
+        with UnitOfWork(self.db_conn.get_session()) as uow:
+            row = uow.db.get(NotificationOutbox, outcome.id)
+            if row is None:
+                return
+            row.modified_at = now
+            if outcome.payload is not None:
+                row.payload = outcome.payload
+            if outcome.sent:
+                row.status = NotificationOutboxStatus.SENT
+                row.sent_at = now
+                row.last_error = None
+                return
+            row.last_error = outcome.error
+            if outcome.retry_after is None or attempts >= _MAX_ATTEMPTS:
+                row.status = NotificationOutboxStatus.FAILED
+                logger.error(
+                    "Notification id=%s to chat_id=%s failed: %s",
+                    row.id,
+                    row.chat_id,
+                    outcome.error,
+                )
+                return
+            row.next_attempt_at = now + datetime.timedelta(seconds=outcome.retry_after)
+
+    def _post(self, delivery: _Delivery) -> _Outcome:
+        url = (
+            f"https://api.telegram.org/bot{self.config.telegram_bot_api_token}"
+            "/sendMessage"
+        )
+        payload = {"chat_id": delivery.chat_id, **delivery.payload}
+        try:
+            response = self.http.post(url, data=payload, timeout=_REQUEST_TIMEOUT)
+        except requests.RequestException as exc:
+            return _Outcome(
+                delivery.id,
+                retry_after=_backoff_seconds(delivery.attempts),
+                error=f"{type(exc).__name__}: {exc}",
+            )
+
+        if response.status_code == 200:
+            return _Outcome(delivery.id, sent=True)
+        if response.status_code == 429:
+            retry_after = _backoff_seconds(delivery.attempts)
+            try:
+                retry_after = float(
+                    response.json().get("parameters", {}).get("retry_after")
+                    or retry_after
+                )
+            except Exception:
+                pass
+            return _Outcome(
+                delivery.id, retry_after=retry_after, error="429 rate limited"
+            )
+        error = f"{response.status_code} {response.text[:500]}"
+        if response.status_code >= 500:
+            return _Outcome(
+                delivery.id,
+                retry_after=_backoff_seconds(delivery.attempts),
+                error=error,
+            )
+        if "reply_markup" in delivery.payload:
+            # The markup may be what Telegram rejected; retry once without it.
+            payload = {
+                key: value
+                for key, value in delivery.payload.items()
+                if key != "reply_markup"
+            }
+            return _Outcome(delivery.id, retry_after=0, error=error, payload=payload)
+        return _Outcome(delivery.id, error=error)
+
+    async def _deliver(self, delivery: _Delivery) -> None:
+        await self._chat_bucket(delivery.chat_id).acquire()
+        await self._global_bucket.acquire()
+        outcome = await asyncio.to_thread(self._post, delivery)
+        # Recorded right away, so a sent row is not left leased behind the
+        # slowest chat of the batch.
+        await asyncio.to_thread(self.record, outcome, delivery.attempts)
+
+    async def dispatch_once(self) -> int:
+        """Send one batch of due notifications. Returns the number claimed."""
+        deliveries = await asyncio.to_thread(self.claim_due)
+        if not deliveries:
+            self._prune_chat_buckets()
+            return 0
+        await asyncio.gather(*(self._deliver(delivery) for delivery in deliveries))
+        return len(deliveries)
+
+    async def run(self) -> None:
+        logger.info("Notification dispatcher started.")
+        while True:
+            try:
+                if await self.dispatch_once():
+                    continue
+            except Exception:
+                logger.exception("Notification dispatch failed")
+            await asyncio.sleep(_POLL_INTERVAL_SECONDS)
+
+
+async def schedule_notification_dispatch() -> None:
+    config = get_config()
+    if not config.telegram_bot_api_token:
+        logger.info("Notification dispatcher disabled: Telegram bot token not set")
+        return
+    await NotificationDispatcher(config).run()
@@ -26,9 +26,10 @@ class StripeEntityAuthorizationChargeTask(PeriodicTask):
     def execute(self, container: ServiceContainer, config: Config) -> int:
         if not config.stripe_entity_charge_enabled:
             return 0
-        return (
+        report = (
             container.stripe_authorization_service.run_weekly_entity_dynamic_charges()
         )
+        return report.processed
 
 
 async def schedule_stripe_entity_authorization_charges() -> None:
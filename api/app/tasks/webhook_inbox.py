@@ -0,0 +1,191 @@
+"""Webhook inbox worker.
+
+Provider callback routes only store events in ``webhook_inbox`` and reply
+immediately. This worker applies them in arrival order, each in its own unit
+of work. Failures are retried with exponential back-off; an event that is
+rejected by the application (e.g. unknown deposit) or runs out of attempts is
+marked dead and kept for inspection.
+
+Callbacks and the lifespan loop share one worker per database, whose engine
+lives as long as the process and whose drains never overlap.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import datetime
+import logging
+import threading
+from collections.abc import Callable
+from uuid import UUID
+
+from app.config import Config, get_config
+from app.db import DatabaseConnection
+from app.dependencies.services import ServiceContainer
+from app.errors.base import ApplicationError
+from app.models.webhook_inbox import WebhookInbox, WebhookInboxStatus
+from app.schemas.deposit_providers.cryptapi import CryptAPICallbackSchema
+from app.uow import UnitOfWork
+
+logger = logging.getLogger(__name__)
+
+_BATCH_SIZE = 20
+_POLL_INTERVAL_SECONDS = 5.0
+# A claimed event becomes due again after this long, e.g. if the process dies.
+_CLAIM_LEASE_SECONDS = 300
+_MAX_ATTEMPTS = 8
+_MAX_BACKOFF_SECONDS = 3600
+
+
+def _backoff_seconds(attempts: int) -> float:
+    return min(2**attempts * 10, _MAX_BACKOFF_SECONDS)
+
+
+def handle_stripe_event(container: ServiceContainer, event: dict) -> None:
+    container.stripe_deposit_provider_service.handle_webhook_event(event)
+    event_type = str(event.get("type") or "")
+    data_object = (event.get("data") or {}).get("object") or {}
+    session_mode = str(data_object.get("mode") or "")
+    stripe_authorization_service = container.stripe_authorization_service
+    if event_type == "checkout.session.completed" and session_mode in (
+        "setup",
+        "subscription",
+    ):
+        stripe_authorization_service.handle_setup_session_completed(data_object)
+    elif event_type == "invoice.paid":
+        invoice = container.stripe_service.normalize_invoice(data_object)
+        stripe_authorization_service.handle_subscription_invoice_paid(invoice)
+    elif event_type == "customer.subscription.deleted":
+        stripe_authorization_service.handle_subscription_deleted(data_object)
+
+
+def handle_cryptapi_callback(container: ServiceContainer, payload: dict) -> None:
+    container.cryptapi_deposit_provider_service.complete_deposit(
+        deposit_uuid=UUID(payload["deposit_uuid"]),
+        cryptapi_callback=CryptAPICallbackSchema(**payload["callback"]),
+    )
+
+
+_HANDLERS: dict[str, Callable[[ServiceContainer, dict], None]] = {
+    "stripe": handle_stripe_event,
+    "cryptapi": handle_cryptapi_callback,
+}
+
+
+class WebhookInboxWorker:
+    def __init__(self, config: Config, db_conn: DatabaseConnection | None = None):
+        self.config = config
+        self.db_conn = db_conn or DatabaseConnection(config)
+        self._drain_lock = threading.Lock()
+
+    def claim_due(self, limit: int = _BATCH_SIZE) -> list[int]:
+        """Lease due events so that concurrent workers never pick the same one."""
+        now = datetime.datetime.now()
+        with UnitOfWork(self.db_conn.get_session()) as uow:
+            rows = (
+                uow.db.query(WebhookInbox)
+                .filter(
+                    WebhookInbox.status == WebhookInboxStatus.PENDING,
+                    WebhookInbox.next_attempt_at <= now,
+                )
+                .order_by(WebhookInbox.id)
+                .limit(limit)
+                .with_for_update(skip_locked=True)
+                .all()
+            )
+            for row in rows:
+                row.attempts += 1
+                row.next_attempt_at = now + datetime.timedelta(
+                    seconds=_CLAIM_LEASE_SECONDS
+                )
+            return [row.id for row in rows]
+
+    def process(self, inbox_id: int) -> bool:
+        """Apply one claimed event. Returns whether it was processed."""
+        try:
+            with UnitOfWork(self.db_conn.get_session()) as uow:
+                row = uow.db.get(WebhookInbox, inbox_id)
+                if row is None or row.status != WebhookInboxStatus.PENDING:
+                    return False
+                _HANDLERS[row.provider](
+                    ServiceContainer(uow.db, self.config), row.payload
+                )
+                now = datetime.datetime.now()
+                row.status = WebhookInboxStatus.PROCESSED
+                row.processed_at = now
+                row.modified_at = now
+                row.last_error = None
+            return True
+        except Exception as exc:
+            self._record_failure(inbox_id, exc)
+            return False
+
+    def _record_failure(self, inbox_id: int, exc: Exception) -> None:
+        now = datetime.datetime.now()
+        with UnitOfWork(self.db_conn.get_session()) as uow:
+            row = uow.db.get(WebhookInbox, inbox_id)
+            if row is None:
+                return
+            row.modified_at = now
+            row.last_error = f"{type(exc).__name__}: {exc}"[:2000]
+            if isinstance(exc, ApplicationError) or row.attempts >= _MAX_ATTEMPTS:
+                row.status = WebhookInboxStatus.DEAD
+                logger.error(
+                    "Webhook %s/%s is dead after %d attempt(s): %s",
+                    row.provider,
+                    row.event_id,
+                    row.attempts,
+                    row.last_error,
+                )
+                return
+            row.next_attempt_at = now + datetime.timedelta(
+                seconds=_backoff_seconds(row.attempts)
+            )
+            logger.warning(
+                "Webhook %s/%s failed (attempt %d), retrying at %s",
+                row.provider,
+                row.event_id,
+                row.attempts,
+                row.next_attempt_at,
+                exc_info=exc,
+            )
+
+    def drain(self) -> int:
+        """Process due events until none are left. Returns the number processed."""
+        processed = 0
+        with self._drain_lock:
+            while inbox_ids := self.claim_due():
+                for inbox_id in inbox_ids:
+                    processed += self.process(inbox_id)
+        return processed
+
+    async def run(self) -> None:
+        logger.info("Webhook inbox worker started.")
+        while True:
+            try:
+                await asyncio.to_thread(self.drain)
+            except Exception:
+                logger.exception("Webhook inbox drain failed")
+            await asyncio.sleep(_POLL_INTERVAL_SECONDS)
+
+
+_shared_workers: dict[str, WebhookInboxWorker] = {}
+_shared_workers_lock = threading.Lock()
+
+
+def shared_webhook_inbox_worker(config: Config) -> WebhookInboxWorker:
+    """The worker of this process for the database of *config*."""
+    with _shared_workers_lock:
+        worker = _shared_workers.get(config.database_url)
+        if worker is None:
+            worker = _shared_workers[config.database_url] = WebhookInboxWorker(config)
+        return worker
+
+
+def drain_webhook_inbox(config: Config) -> int:
+    """Process the inbox right after a callback was acknowledged."""
+    return shared_webhook_inbox_worker(config).drain()
+
+
+async def schedule_webhook_inbox() -> None:
+    await shared_webhook_inbox_worker(get_config()).run()
@@ -117,7 +117,9 @@ def test_app():
             # Clear in-memory caches so stale data from one test class
             # does not bleed into the next (each class uses its own DB).
             from app.services.balance import BalanceService
+            from app.services.fee import FeeService
             from app.services.stats import StatsService
+            from app.services.stripe_authorization import StripeAuthorizationService
 
             BalanceService._cache.clear()
             BalanceService._treasury_cache.clear()
@@ -125,6 +127,10 @@ def test_app():
                 StatsService._cache.clear()
                 StatsService._entity_cache_index.clear()
                 StatsService._treasury_cache_index.clear()
+            with FeeService._cache_lock:
+                FeeService._cache.clear()
+                FeeService._invalidated_at.clear()
+            StripeAuthorizationService.reset_subscription_poll_schedule()
 
 
 # general fixture to get the token of any entity
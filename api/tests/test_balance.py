@@ -233,8 +233,8 @@ class TestBalanceEndpoints:
 
         monkeypatch.setattr(
             CurrencyExchangeService,
-            "calculate_conversion",
-            unavailable_rates,
+            "_raw_rates",
+            property(unavailable_rates),
         )
 
         response = test_app.get(
@@ -275,3 +275,112 @@ class TestBalanceEndpoints:
             "currency": "gel",
             "amount": "135.00",
         }
+
+    def test_owed_batch_matches_per_entity_results(self, test_app: TestClient, token):
+        recipient = test_app.post(
+            "/entities",
+            json={"name": "Owed Batch Recipient"},
+            headers={"x-token": token},
+        ).json()
+        payers = [
+            test_app.post(
+                "/entities",
+                json={"name": f"Owed Batch Payer {n}"},
+                headers={"x-token": token},
+            ).json()
+            for n in range(3)
+        ]
+        for payer, amount in zip(payers, ("20.00", "7.50")):
+            invoice_response = test_app.post(
+                "/invoices",
+                json={
+                    "from_entity_id": payer["id"],
+                    "to_entity_id": recipient["id"],
+                    "amounts": [{"currency": "usd", "amount": amount}],
+                },
+                headers={"x-token": token},
+            )
+            assert invoice_response.status_code == status.HTTP_200_OK
+        transaction_response = test_app.post(
+            "/transactions/",
+            json={
+                "from_entity_id": 1,
+                "to_entity_id": payers[1]["id"],
+                "amount": "2.50",
+                "currency": "usd",
+                "status": "completed",
+            },
+            headers={"x-token": token},
+        )
+        assert transaction_response.status_code == status.HTTP_200_OK
+
+        response = test_app.get(
+            "/balances/owed",
+            params={"entity_ids": [payer["id"] for payer in payers]},
+            headers={"x-token": token},
+        )
+        assert response.status_code == status.HTTP_200_OK
+        owed = response.json()
+        assert owed[str(payers[0]["id"])] == {
+            "owed_by_currency": {"usd": "20.00"},
+            "total_owed_usd": "20.00",
+            "available_credit_usd": "0.00",
+            "net_owed_usd": "20.00",
+            "minimum_topup_currency": "usd",
+            "minimum_topup_amount": "20.00",
+        }
+        assert owed[str(payers[1]["id"])]["net_owed_usd"] == "5.00"
+        assert owed[str(payers[2]["id"])]["net_owed_usd"] == "0.00"
+        assert owed[str(payers[2]["id"])]["minimum_topup_currency"] is None
+
+        for payer in payers:
+            single = test_app.get(
+                f"/balances/{payer['id']}/recommended-deposit",
+                headers={"x-token": token},
+            ).json()
+            assert single["currency"] == (
+                owed[str(payer["id"])]["minimum_topup_currency"]
+            )
+
+        missing = test_app.get(
+            "/balances/owed",
+            params={"entity_ids": [payers[0]["id"], 999999]},
+            headers={"x-token": token},
+        )
+        assert missing.status_code == 418  # NotFoundError
+
+    def test_owed_batch_leaves_out_an_entity_it_cannot_calculate(
+        self, test_app: TestClient, token
+    ):
+        payers = [
+            test_app.post(
+                "/entities",
+                json={"name": f"Owed Isolation Payer {n}"},
+                headers={"x-token": token},
+            ).json()
+            for n in range(2)
+        ]
+        for payer, currency in zip(payers, ("usd", "xyz")):
+            transaction_response = test_app.post(
+                "/transactions/",
+                json={
+                    "from_entity_id": payer["id"],
+                    "to_entity_id": 1,
+                    "amount": "4.00",
+                    "currency": currency,
+                    "status": "completed",
+                },
+                headers={"x-token": token},
+            )
+            assert transaction_response.status_code == status.HTTP_200_OK
+
+        response = test_app.get(
+            "/balances/owed",
+            params={"entity_ids": [payer["id"] for payer in payers]},
+            headers={"x-token": token},
+        )
+        assert response.status_code == status.HTTP_200_OK
+        owed = response.json()
+        # "xyz" has no rate, so only the usd payer's debt can be calculated
+        assert list(owed) == [str(payers[0]["id"])]
+        assert owed[str(payers[0]["id"])]["net_owed_usd"] == "4.00"
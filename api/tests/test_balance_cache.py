@@ -1,3 +1,12 @@
+from decimal import Decimal
+
+import pytest
+from app.app import app
+from app.config import get_config
+from app.db import DatabaseConnection
+from app.dependencies.services import ServiceContainer
+from app.schemas.transaction import TransactionCreateSchema
+from app.uow import UnitOfWork
 from fastapi import status
 from fastapi.testclient import TestClient
 
@@ -136,3 +145,52 @@ class TestBalanceServiceCache:
         assert balance_a_3 == expected_balance_a
         assert balance_b_3 == expected_balance_b
         assert balance_c_3 == expected_balance_c
+
+    def test_completed_transfer_reaches_cache_only_when_committed(
+        self, test_app: TestClient, token
+    ):
+        payer_id, payee_id = (
+            test_app.post(
+                "/entities", json={"name": name}, headers={"x-token": token}
+            ).json()["id"]
+            for name in ("Transfer Payer", "Transfer Payee")
+        )
+        # cache both balances
+        for entity_id in (payer_id, payee_id):
+            test_app.get(f"/balances/{entity_id}", headers={"x-token": token})
+        transfer = TransactionCreateSchema(
+            from_entity_id=payer_id,
+            to_entity_id=payee_id,
+            amount=Decimal("5.00"),
+            currency="usd",
+        )
+
+        config = app.dependency_overrides.get(get_config, get_config)()
+        db_conn = DatabaseConnection(config)
+        try:
+            with pytest.raises(RuntimeError):
+                with UnitOfWork(db_conn.get_session()) as uow:
+                    container = ServiceContainer(uow.db, config)
+                    container.transaction_service.create_completed_transfer(
+                        transfer, overrides={"actor_entity_id": payer_id}
+                    )
+                    # the session reads its own transfer
+                    balance = container.balance_service.get_balances(payer_id)
+                    assert balance.completed["usd"].value == Decimal("-5.00")
+                    raise RuntimeError("rolled back")
+            response = test_app.get(f"/balances/{payer_id}", headers={"x-token": token})
+            assert response.json()["completed"] == {}
+
+            with UnitOfWork(db_conn.get_session()) as uow:
+                ServiceContainer(
+                    uow.db, config
+                ).transaction_service.create_completed_transfer(
+                    transfer, overrides={"actor_entity_id": payer_id}
+                )
+        finally:
+            db_conn.engine.dispose()
+
+        response = test_app.get(f"/balances/{payer_id}", headers={"x-token": token})
+        assert response.json()["completed"] == {"usd": "-5.00"}
+        response = test_app.get(f"/balances/{payee_id}", headers={"x-token": token})
+        assert response.json()["completed"] == {"usd": "5.00"}
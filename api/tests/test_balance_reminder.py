@@ -0,0 +1,119 @@
+"""Tests for the weekly balance reminder task"""
+
+import pytest
+from app.app import app
+from app.config import get_config
+from app.db import DatabaseConnection
+from app.dependencies.services import ServiceContainer
+from app.services.notification import NotificationService
+from app.tasks.balance_reminder import send_reminders_to_all
+from app.uow import UnitOfWork
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+FIXED_RATES = property(
+    lambda self: [
+        {
+            "currencies": [
+                {"code": "usd", "rate": "2.50", "quantity": "1"},
+                {"code": "gel", "rate": "1", "quantity": "1"},
+            ]
+        }
+    ]
+)
+
+
+class RecordingNotificationService(NotificationService):
+    def __init__(self, config) -> None:
+        self.config = config
+        self.messages: dict[int, str] = {}
+
+    def send(self, entity, message, *, telegram_reply_markup=None):
+        self.messages[entity.id] = message
+        return {"telegram": True}
+
+
+def _run_reminders(statements: list[str]) -> RecordingNotificationService:
+    config = app.dependency_overrides.get(get_config, get_config)()
+    db_conn = DatabaseConnection(config=config)
+
+    @event.listens_for(db_conn.engine, "before_cursor_execute")
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    notification_service = RecordingNotificationService(config)
+    try:
+        with UnitOfWork(db_conn.get_session()) as uow:
+            container = ServiceContainer(uow, config)
+            send_reminders_to_all(
+                db=container.db,
+                balance_service=container.balance_service,
+                currency_exchange_service=container.currency_exchange_service,
+                notification_service=notification_service,
+            )
+    finally:
+        db_conn.engine.dispose()
+    return notification_service
+
+
+class TestBalanceReminder:
+    @pytest.fixture(autouse=True)
+    def patch_rates(self, monkeypatch):
+        from app.services.currency_exchange import CurrencyExchangeService
+
+        monkeypatch.setattr(CurrencyExchangeService, "_raw_rates", FIXED_RATES)
+
+    def _create_debtor(self, test_app: TestClient, token, index: int) -> int:
+        entity_id = test_app.post(
+            "/entities",
+            json={
+                "name": f"Reminder debtor {index}",
+                "auth": {"telegram_id": 7000 + index},
+            },
+            headers={"x-token": token},
+        ).json()["id"]
+        response = test_app.post(
+            "/invoices",
+            json={
+                "from_entity_id": entity_id,
+                "items": [
+                    {
+                        "to_entity_id": 1,
+                        "amounts": [
+                            {"currency": "usd", "amount": "40"},
+                            {"currency": "gel", "amount": "100"},
+                        ],
+                    },
+                    {
+                        "to_entity_id": 1,
+                        "amounts": [
+                            {"currency": "usd", "amount": "10"},
+                            {"currency": "gel", "amount": "25"},
+                        ],
+                    },
+                ],
+            },
+            headers={"x-token": token},
+        )
+        assert response.status_code == 200, response.text
+        return entity_id
+
+    def test_reminders_prefetch_data_in_constant_queries(
+        self, test_app: TestClient, token
+    ):
+        debtors = [self._create_debtor(test_app, token, i) for i in range(2)]
+        statements: list[str] = []
+        notifications = _run_reminders(statements)
+        assert set(debtors) <= set(notifications.messages)
+        baseline = len(statements)
+
+        debtors += [self._create_debtor(test_app, token, i) for i in range(2, 8)]
+        statements = []
+        notifications = _run_reminders(statements)
+        assert set(debtors) <= set(notifications.messages)
+        assert len(statements) == baseline
+
+        # Multi-item invoices list their summed per-currency alternatives.
+        message = notifications.messages[debtors[-1]]
+        assert "50.00 USD or 125.00 GEL" in message
+        assert "You owe <b>125 GEL</b>" in message
@@ -1,6 +1,7 @@
 from decimal import Decimal
 
 import requests
+from app.http import get_http_client
 from app.services.currency_exchange import CurrencyExchangeService
 
 
@@ -39,7 +40,7 @@ def test_frankfurter_is_used_when_nbg_is_unavailable(monkeypatch):
             ]
         )
 
-    monkeypatch.setattr(requests, "get", get)
+    monkeypatch.setattr(get_http_client(), "get", get)
     monkeypatch.setattr(CurrencyExchangeService, "_rates_cache", None)
     monkeypatch.setattr(CurrencyExchangeService, "_rates_cached_at", 0.0)
     service = CurrencyExchangeService.__new__(CurrencyExchangeService)
@@ -73,7 +74,7 @@ def test_nbg_remains_primary_when_available(monkeypatch):
         calls.append(url)
         return _Response(nbg_payload)
 
-    monkeypatch.setattr(requests, "get", get)
+    monkeypatch.setattr(get_http_client(), "get", get)
     monkeypatch.setattr(CurrencyExchangeService, "_rates_cache", None)
     monkeypatch.setattr(CurrencyExchangeService, "_rates_cached_at", 0.0)
     service = CurrencyExchangeService.__new__(CurrencyExchangeService)
@@ -95,7 +96,7 @@ def test_stale_cache_is_used_only_after_both_providers_fail(monkeypatch):
         calls.append(url)
         raise requests.ConnectionError("provider unavailable")
 
-    monkeypatch.setattr(requests, "get", get)
+    monkeypatch.setattr(get_http_client(), "get", get)
     monkeypatch.setattr(CurrencyExchangeService, "_rates_cache", stale_rates)
     monkeypatch.setattr(CurrencyExchangeService, "_rates_cached_at", 0.0)
     service = CurrencyExchangeService.__new__(CurrencyExchangeService)
@@ -0,0 +1,103 @@
+"""Tests for the entity dashboard"""
+
+import pytest
+import requests
+from app.services.currency_exchange import CurrencyExchangeService
+from fastapi import status
+from fastapi.testclient import TestClient
+
+RATES = property(
+    lambda self: [
+        {
+            "currencies": [
+                {"code": "usd", "rate": "3.00", "quantity": "1"},
+                {"code": "gel", "rate": "1", "quantity": "1"},
+            ]
+        }
+    ]
+)
+
+
+@pytest.fixture
+def payer(test_app: TestClient, token, token_factory):
+    recipient = test_app.post(
+        "/entities", json={"name": "Dashboard Recipient"}, headers={"x-token": token}
+    ).json()
+    payer = test_app.post(
+        "/entities", json={"name": "Dashboard Payer"}, headers={"x-token": token}
+    ).json()
+    for amounts in (
+        [{"currency": "usd", "amount": "10.00"}, {"currency": "gel", "amount": "33"}],
+        [{"currency": "usd", "amount": "5.00"}],
+    ):
+        response = test_app.post(
+            "/invoices",
+            json={
+                "from_entity_id": payer["id"],
+                "to_entity_id": recipient["id"],
+                "amounts": amounts,
+            },
+            headers={"x-token": token},
+        )
+        assert response.status_code == status.HTTP_200_OK
+    response = test_app.post(
+        "/transactions",
+        json={
+            "from_entity_id": recipient["id"],
+            "to_entity_id": payer["id"],
+            "amount": "3.00",
+            "currency": "usd",
+            "status": "completed",
+        },
+        headers={"x-token": token},
+    )
+    assert response.status_code == status.HTTP_200_OK
+    return payer["id"], token_factory(payer["id"])
+
+
+def test_dashboard_has_everything_the_landing_page_shows(
+    test_app: TestClient, payer, monkeypatch
+):
+    payer_id, payer_token = payer
+    monkeypatch.setattr(CurrencyExchangeService, "_raw_rates", RATES)
+
+    response = test_app.get("/dashboard/me", headers={"x-token": payer_token})
+
+    assert response.status_code == status.HTTP_200_OK
+    dashboard = response.json()
+    assert dashboard["entity"]["id"] == payer_id
+    assert dashboard["balances"]["completed"] == {"usd": "3.00"}
+    assert dashboard["pending_invoices"]["total"] == 2
+    assert [i["from_entity_id"] for i in dashboard["recent_invoices"]] == [
+        payer_id,
+        payer_id,
+    ]
+    # 10 + 5 USD owed, 3 USD of it covered by the balance
+    assert dashboard["owed"]["owed_by_currency"] == {"usd": "15.00"}
+    assert dashboard["owed"]["net_owed_usd"] == "12.00"
+    assert dashboard["recommended_deposit"] == {
+        "entity_id": payer_id,
+        "currency": "usd",
+        "amount": "12.00",
+    }
+    assert dashboard["stripe_authorizations"] == []
+
+
+def test_dashboard_without_currency_rates(test_app: TestClient, payer, monkeypatch):
+    payer_id, payer_token = payer
+
+    def unavailable_rates(*args, **kwargs):
+        raise requests.ConnectionError("rates unavailable")
+
+    monkeypatch.setattr(
+        CurrencyExchangeService, "_raw_rates", property(unavailable_rates)
+    )
+
+    response = test_app.get("/dashboard/me", headers={"x-token": payer_token})
+
+    assert response.status_code == status.HTTP_200_OK
+    dashboard = response.json()
+    assert dashboard["owed"] is None
+    # only USD settles both invoices without an exchange
+    assert dashboard["recommended_deposit"]["currency"] == "usd"
+    assert dashboard["recommended_deposit"]["amount"] == "12.00"
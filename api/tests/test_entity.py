@@ -310,9 +310,7 @@ class TestEntityTelegramIdFilter:
     ):
         """Entities with auth.telegram_id == "" must not match any numeric filter
         and must not cause a DB cast error."""
-        self._create_entity_with_telegram_id(
-            test_app, token, "TgFilter EmptyStr", ""
-        )
+        self._create_entity_with_telegram_id(test_app, token, "TgFilter EmptyStr", "")
 
         # Filtering by any numeric telegram_id must not return the empty-string entity
         response = test_app.get(
@@ -363,3 +361,62 @@ class TestEntityTelegramIdFilter:
         data = response.json()
         assert data["total"] == 1
         assert data["items"][0]["id"] == eid_a
+
+
+class TestEntitySearchAndFacets:
+    def _create(self, test_app: TestClient, token, **data) -> int:
+        r = test_app.post("/entities", json=data, headers={"x-token": token})
+        assert r.status_code == 200, r.text
+        return r.json()["id"]
+
+    def test_search_matches_name_or_comment_case_insensitively(
+        self, test_app: TestClient, token
+    ):
+        by_name = self._create(test_app, token, name="Haystack Needle")
+        by_comment = self._create(
+            test_app, token, name="Haystack Other", comment="has a NEEDLE inside"
+        )
+        self._create(test_app, token, name="Haystack 50% off")
+
+        response = test_app.get(
+            "/entities", params={"q": "needle"}, headers={"x-token": token}
+        ).json()
+        assert [item["id"] for item in response["items"]] == [by_comment, by_name]
+        assert response["total"] == 2
+
+        # LIKE wildcards in the query are matched literally.
+        response = test_app.get(
+            "/entities", params={"q": "0%_"}, headers={"x-token": token}
+        ).json()
+        assert response["total"] == 0
+
+    def test_facets_count_entities_per_tag(self, test_app: TestClient, token):
+        tag = test_app.post(
+            "/tags", json={"name": "facet-tag"}, headers={"x-token": token}
+        )
+        assert tag.status_code == 200, tag.text
+        tag_id = tag.json()["id"]
+        for name in ("Facet A", "Facet B"):
+            self._create(test_app, token, name=name, tag_ids=[tag_id])
+        inactive = self._create(test_app, token, name="Facet C", tag_ids=[tag_id])
+        test_app.patch(
+            f"/entities/{inactive}", json={"active": False}, headers={"x-token": token}
+        )
+
+        facets = test_app.get(
+            "/entities/facets", params={"active": True}, headers={"x-token": token}
+        ).json()
+        assert facets["tags"][str(tag_id)] == 2
+        assert (
+            facets["total"]
+            == test_app.get(
+                "/entities", params={"active": True}, headers={"x-token": token}
+            ).json()["total"]
+        )
+
+        facets = test_app.get(
+            "/entities/facets",
+            params={"active": False, "q": "facet"},
+            headers={"x-token": token},
+        ).json()
+        assert facets == {"total": 1, "tags": {str(tag_id): 1}}
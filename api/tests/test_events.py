@@ -0,0 +1,128 @@
+"""Tests for the subject event streams"""
+
+import json
+import threading
+import time
+
+import pytest
+from app.app import app
+from app.config import get_config
+from app.db import DatabaseConnection
+from app.events import BALANCE_CHANGED, EventBroker
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+
+
+@pytest.fixture
+def entities(test_app: TestClient, token) -> tuple[int, int]:
+    ids = []
+    for name in ("Events Payer", "Events Payee"):
+        response = test_app.post(
+            "/entities", json={"name": name}, headers={"x-token": token}
+        )
+        assert response.status_code == 200
+        ids.append(response.json()["id"])
+    return ids[0], ids[1]
+
+
+def _events_while(test_app: TestClient, token, subject: str, action) -> list:
+    """Events of *subject* streamed while *action* runs, as (name, data)."""
+    subject_type, subject_id = subject.split(":")
+    result = {}
+
+    def _stream():
+        result["response"] = test_app.get(
+            f"/events/{subject_type}/{subject_id}",
+            params={"timeout": 1.5},
+            headers={"x-token": token},
+        )
+
+    thread = threading.Thread(target=_stream)
+    thread.start()
+    for _ in range(100):
+        if subject in EventBroker._subscribers:
+            break
+        time.sleep(0.01)
+    action()
+    thread.join()
+
+    response = result["response"]
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = []
+    for block in response.text.split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines() if ": " in line)
+        if "event" in lines:
+            events.append((lines["event"], json.loads(lines["data"])))
+    assert subject not in EventBroker._subscribers
+    return events
+
+
+def test_new_transactions_are_pushed_to_both_sides(
+    test_app: TestClient, token, entities
+):
+    payer, payee = entities
+    created = {}
+
+    def _pay():
+        response = test_app.post(
+            "/transactions",
+            json={
+                "from_entity_id": payer,
+                "to_entity_id": payee,
+                "amount": "4.00",
+                "currency": "gel",
+                "status": "completed",
+            },
+            headers={"x-token": token},
+        )
+        assert response.status_code == 200
+        created["id"] = response.json()["id"]
+
+    events = _events_while(test_app, token, f"entity:{payee}", _pay)
+    assert (
+        "transaction_created",
+        {
+            "subject": f"entity:{payee}",
+            "transaction_id": created["id"],
+        },
+    ) in events
+    assert ("balance_changed", {"subject": f"entity:{payee}"}) in events
+
+
+def test_stats_cache_miss_announces_readiness(test_app: TestClient, token, entities):
+    payer, _ = entities
+    url = f"/stats/entity/{payer}"
+
+    def _probe():
+        # the miss schedules the computation instead of waiting for a poll
+        response = test_app.get(
+            url, params={"cached_only": True}, headers={"x-token": token}
+        )
+        assert response.json()["cached"] is False
+
+    events = _events_while(test_app, token, f"entity:{payer}", _probe)
+    assert ("stats_ready", {"subject": f"entity:{payer}"}) in events
+    response = test_app.get(
+        url, params={"cached_only": True}, headers={"x-token": token}
+    )
+    assert response.json()["cached"] is True
+
+
+def test_events_of_a_rolled_back_transaction_are_dropped(
+    test_app: TestClient, monkeypatch
+):
+    published = []
+    monkeypatch.setattr(
+        EventBroker, "publish", lambda subject, name, **data: published.append(name)
+    )
+    db_conn = DatabaseConnection(app.dependency_overrides.get(get_config, get_config)())
+    try:
+        with db_conn.get_session() as session:
+            session.execute(text("SELECT 1"))
+            EventBroker.publish_on_commit(session, "entity:1", BALANCE_CHANGED)
+            session.rollback()
+            session.commit()
+    finally:
+        db_conn.engine.dispose()
+    assert published == []
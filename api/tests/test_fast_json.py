@@ -0,0 +1,134 @@
+"""Tests for the orjson fast serialization path"""
+
+import datetime
+import time
+from decimal import Decimal
+from types import SimpleNamespace
+
+import orjson
+import pytest
+from app.models.transaction import TransactionStatus
+from app.schemas.base import PaginationSchema
+from app.schemas.entity import EntityFiltersSchema
+from app.schemas.fast import FastJSONResponse, encode, fast_page
+from app.schemas.transaction import TransactionSchema
+from fastapi.testclient import TestClient
+
+_NOW = datetime.datetime(2025, 3, 1, 12, 30, 15, 250000)
+
+
+def _page(rows: int = 1000, entities: int = 20) -> SimpleNamespace:
+    tag = SimpleNamespace(
+        id=1, name="pos", comment=None, created_at=_NOW, modified_at=None
+    )
+    people = [
+        SimpleNamespace(
+            id=i,
+            name=f"entity {i}",
+            active=i % 3 != 0,
+            tags=[tag] if i % 2 else [],
+            auth={"telegram_id": 1000 + i, "extra": "not in schema"} if i % 4 else None,
+            comment=None,
+            created_at=_NOW,
+            modified_at=_NOW if i % 5 else None,
+        )
+        for i in range(entities)
+    ]
+    treasury = SimpleNamespace(
+        id=7,
+        name="cash",
+        active=True,
+        balances={"completed": {"gel": Decimal("10.005")}, "draft": {}},
+        comment=None,
+        created_at=_NOW,
+        modified_at=None,
+    )
+    items = [
+        SimpleNamespace(
+            id=i,
+            actor_entity_id=1,
+            actor_entity=people[i % entities],
+            to_entity_id=2,
+            to_entity=people[(i + 1) % entities],
+            from_entity_id=3,
+            from_entity=people[(i + 2) % entities],
+            invoice_id=i if i % 7 == 0 else None,
+            invoice_item_id=None,
+            amount=Decimal("12.3456") + i,
+            currency="gel",
+            status=TransactionStatus.COMPLETED if i % 2 else TransactionStatus.DRAFT,
+            tags=[tag],
+            from_treasury_id=7 if i % 10 == 0 else None,
+            to_treasury_id=None,
+            from_treasury=treasury if i % 10 == 0 else None,
+            to_treasury=None,
+            comment=f"row {i}",
+            created_at=_NOW.replace(tzinfo=datetime.timezone.utc) if i % 3 else _NOW,
+            modified_at=None,
+        )
+        for i in range(rows)
+    ]
+    return SimpleNamespace(items=items, total=rows, skip=0, limit=rows)
+
+
+def _standard(page) -> bytes:
+    schema = PaginationSchema[TransactionSchema]
+    validated = schema.model_validate(page, from_attributes=True)
+    return FastJSONResponse(validated.model_dump(mode="json")).body
+
+
+def test_fast_path_matches_standard_serialization():
+    page = _page(rows=50, entities=6)
+    fast = fast_page(page, TransactionSchema).body
+    assert orjson.loads(fast) == orjson.loads(_standard(page))
+    # shared entities are encoded once and reused
+    encoded = encode(PaginationSchema[TransactionSchema], page)
+    assert encoded["items"][0]["to_entity"] is encoded["items"][1]["actor_entity"]
+
+
+def test_schemas_with_validators_are_rejected():
+    with pytest.raises(TypeError):
+        encode(EntityFiltersSchema, SimpleNamespace())
+
+
+def test_fast_path_microbenchmark():
+    """Serialization time of a 1000-row transaction page, best of 5."""
+    page = _page()
+
+    def _best(serialize) -> float:
+        timings = []
+        for _ in range(5):
+            started = time.perf_counter()
+            serialize(page)
+            timings.append(time.perf_counter() - started)
+        return min(timings)
+
+    standard = _best(_standard)
+    fast = _best(lambda page: fast_page(page, TransactionSchema).body)
+    assert fast < standard
+
+
+def test_transactions_endpoint_uses_fast_path(test_app: TestClient, token):
+    entity_id = test_app.post(
+        "/entities", json={"name": "Fast JSON"}, headers={"x-token": token}
+    ).json()["id"]
+    created = test_app.post(
+        "/transactions",
+        json={
+            "from_entity_id": entity_id,
+            "to_entity_id": entity_id,
+            "amount": "3.10",
+            "currency": "gel",
+        },
+        headers={"x-token": token},
+    ).json()
+
+    response = test_app.get(
+        "/transactions", params={"ids": created["id"]}, headers={"x-token": token}
+    )
+    assert response.status_code == 200
+    assert response.json()["items"] == [
+        test_app.get(
+            f"/transactions/{created['id']}", headers={"x-token": token}
+        ).json()
+    ]
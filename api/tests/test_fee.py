@@ -5,6 +5,7 @@ from datetime import date
 
 from app.seeding import fee_tag, resident_tag
 from fastapi.testclient import TestClient
+from sqlalchemy import Engine, event
 from sqlalchemy.exc import SAWarning
 
 
@@ -268,3 +269,80 @@ class TestFeeService:
         assert fees2[0]["year"] == current_year
         assert fees2[0]["month"] == current_month
         assert fees2[0]["amounts"] == {}
+
+    def test_get_fees_caches_full_history_and_refreshes_changed_residents(
+        self, test_app: TestClient, token
+    ):
+        today = date.today()
+        old_idx = today.year * 12 + today.month - 1 - 30
+        old_year, old_month = divmod(old_idx, 12)
+        old_month += 1
+
+        resident = test_app.post(
+            "/entities",
+            json={"name": "Long-history resident", "tag_ids": [resident_tag.id]},
+            headers={"x-token": token},
+        ).json()["id"]
+        invoice_resp = test_app.post(
+            "/invoices",
+            json={
+                "from_entity_id": resident,
+                "to_entity_id": 1,
+                "amounts": [{"currency": "usd", "amount": "100"}],
+                "billing_period": f"{old_year}-{old_month:02d}-01",
+                "tag_ids": [fee_tag.id],
+            },
+            headers={"x-token": token},
+        )
+        assert invoice_resp.status_code == 200, invoice_resp.text
+        invoice_id = invoice_resp.json()["id"]
+
+        def get_resident_fees(statements: list[str] | None = None) -> dict:
+            def record(conn, cursor, statement, parameters, context, executemany):
+                statements.append(statement)
+
+            if statements is not None:
+                event.listen(Engine, "before_cursor_execute", record)
+            try:
+                response = test_app.get("/fees/?months=60", headers={"x-token": token})
+            finally:
+                if statements is not None:
+                    event.remove(Engine, "before_cursor_execute", record)
+            assert response.status_code == 200, response.text
+            record_data = next(
+                r for r in response.json() if r["entity"]["id"] == resident
+            )
+            return {(f["year"], f["month"]): f for f in record_data["fees"]}
+
+        # The months cap is gone: a 30-month-old invoice is still reported.
+        fees = get_resident_fees()
+        assert fees[(old_year, old_month)]["unpaid_invoice_id"] == invoice_id
+        assert len(fees) == 31
+
+        statements: list[str] = []
+        assert get_resident_fees(statements) == fees
+        assert not any("FROM invoices" in statement for statement in statements)
+
+        bank = test_app.post(
+            "/entities", json={"name": "Long-history bank"}, headers={"x-token": token}
+        ).json()["id"]
+        for payload in (
+            {"from_entity_id": bank, "to_entity_id": resident},
+            {"from_entity_id": resident, "to_entity_id": 1, "invoice_id": invoice_id},
+        ):
+            tx_resp = test_app.post(
+                "/transactions",
+                json={
+                    **payload,
+                    "amount": "100",
+                    "currency": "usd",
+                    "status": "completed",
+                },
+                headers={"x-token": token},
+            )
+            assert tx_resp.status_code == 200, tx_resp.text
+
+        old_fee = get_resident_fees()[(old_year, old_month)]
+        assert old_fee["unpaid_invoice_id"] is None
+        assert old_fee["paid_invoice_id"] == invoice_id
+        assert old_fee["amounts"] == {"usd": "100.00"}
@@ -0,0 +1,86 @@
+"""Tests for the shared outbound HTTP client"""
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+from app.http import HttpClient, RetryBudget
+
+
+class _Handler(BaseHTTPRequestHandler):
+    # statuses to answer with, in order; 200 once exhausted
+    statuses: list[int] = []
+    seen: list[str] = []
+
+    def _reply(self) -> None:
+        type(self).seen.append(f"{self.command} {self.path}")
+        status = type(self).statuses.pop(0) if type(self).statuses else 200
+        self.send_response(status)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"{}")
+
+    do_GET = _reply
+    do_POST = _reply
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+@pytest.fixture
+def server():
+    _Handler.statuses = []
+    _Handler.seen = []
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_retry_budget_limits_retries_to_a_share_of_requests():
+    budget = RetryBudget(ratio=0.5, capacity=2)
+    assert [budget.withdraw() for _ in range(3)] == [True, True, False]
+    budget.deposit()
+    budget.deposit()
+    assert budget.withdraw()
+    assert not budget.withdraw()
+
+
+def test_idempotent_requests_are_retried_and_measured(server):
+    client = HttpClient(retry_backoff_seconds=0)
+    _Handler.statuses = [503, 200]
+
+    response = client.get(f"{server}/rates")
+    assert response.status_code == 200
+    assert _Handler.seen == ["GET /rates", "GET /rates"]
+
+    # POST is not retried unless asked to.
+    _Handler.statuses = [503]
+    assert client.post(f"{server}/send").status_code == 503
+
+    host = server.removeprefix("http://")
+    assert client.metrics()[host] == {
+        **client.metrics()[host],
+        "requests": 3,
+        "errors": 2,
+        "retries": 1,
+    }
+    assert client.metrics()[host]["p95_seconds"] is not None
+    # one keep-alive session per host
+    assert client.session_for(host) is client.session_for(host)
+
+
+def test_connection_errors_stop_retrying_when_budget_is_spent():
+    client = HttpClient(max_retries=5, retry_backoff_seconds=0)
+    client.session_for("127.0.0.1:9")
+    client._budgets["127.0.0.1:9"] = RetryBudget(ratio=0, capacity=1)
+
+    with pytest.raises(requests.ConnectionError):
+        client.get("http://127.0.0.1:9/", timeout=(0.5, 0.5))
+    metrics = client.metrics()["127.0.0.1:9"]
+    assert metrics["requests"] == 2
+    assert metrics["retries"] == 1
+    assert metrics["errors"] == 2
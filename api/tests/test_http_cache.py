@@ -0,0 +1,137 @@
+"""Tests for response compression and version-based conditional GET"""
+
+import pytest
+from app.services.transaction import TransactionService
+from fastapi.testclient import TestClient
+
+
+@pytest.fixture
+def entities(test_app: TestClient, token) -> tuple[int, int]:
+    ids = []
+    for name in ("Cache Payer", "Cache Payee"):
+        response = test_app.post(
+            "/entities", json={"name": name}, headers={"x-token": token}
+        )
+        assert response.status_code == 200
+        ids.append(response.json()["id"])
+    return ids[0], ids[1]
+
+
+def _pay(test_app: TestClient, token, from_id: int, to_id: int) -> None:
+    response = test_app.post(
+        "/transactions",
+        json={
+            "from_entity_id": from_id,
+            "to_entity_id": to_id,
+            "amount": "1.00",
+            "currency": "gel",
+            "status": "completed",
+        },
+        headers={"x-token": token},
+    )
+    assert response.status_code == 200, response.text
+
+
+def test_large_responses_are_compressed(test_app: TestClient, token, entities):
+    for _ in range(5):
+        _pay(test_app, token, *entities)
+
+    response = test_app.get(
+        "/transactions",
+        headers={"x-token": token, "Accept-Encoding": "br"},
+    )
+    assert response.headers["content-encoding"] == "br"
+    assert "Accept-Encoding" in response.headers["vary"]
+    assert response.json()["total"] >= 5
+
+    response = test_app.get(
+        "/transactions",
+        headers={"x-token": token, "Accept-Encoding": "gzip, br;q=0"},
+    )
+    assert response.headers["content-encoding"] == "gzip"
+
+    # below the size threshold
+    response = test_app.get(
+        f"/entities/{entities[0]}",
+        headers={"x-token": token, "Accept-Encoding": "gzip, br"},
+    )
+    assert "content-encoding" not in response.headers
+
+
+def test_unchanged_transaction_pages_are_not_modified(
+    test_app: TestClient, token, entities, monkeypatch
+):
+    for _ in range(5):
+        _pay(test_app, token, *entities)
+    headers = {"x-token": token, "Accept-Encoding": "br"}
+    first = test_app.get("/transactions", headers=headers)
+    etag = first.headers["etag"]
+    assert etag.endswith('-br"')
+
+    def _not_called(*args, **kwargs):
+        raise AssertionError("handler ran for a fresh ETag")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(TransactionService, "get_all", _not_called)
+        # either representation of the ETag matches
+        for candidate in (etag, etag.replace('-br"', '"')):
+            response = test_app.get(
+                "/transactions", headers={**headers, "If-None-Match": candidate}
+            )
+            assert response.status_code == 304
+            assert response.content == b""
+
+    # other query strings have their own ETag
+    response = test_app.get(
+        "/transactions", params={"limit": 1}, headers={**headers, "If-None-Match": etag}
+    )
+    assert response.status_code == 200
+
+    _pay(test_app, token, *entities)
+    response = test_app.get("/transactions", headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+
+
+def test_stats_bundle_etag_follows_its_subject(test_app: TestClient, token, entities):
+    payer, payee = entities
+    other = test_app.post(
+        "/entities", json={"name": "Cache Bystander"}, headers={"x-token": token}
+    ).json()["id"]
+    url = f"/stats/entity/{payer}"
+    headers = {"x-token": token}
+    etag = test_app.get(url, headers=headers).headers["etag"]
+
+    # changes of other entities keep the payer's bundle fresh
+    _pay(test_app, token, payee, other)
+    response = test_app.get(url, headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 304
+
+    _pay(test_app, token, payer, payee)
+    response = test_app.get(url, headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+
+    # cache probes are never answered from an ETag
+    response = test_app.get(url, params={"cached_only": True}, headers=headers)
+    assert response.status_code == 200
+    assert "etag" not in response.headers
+
+
+@pytest.mark.parametrize("path", ["/tags", "/treasuries", "/entities", "/entities/1"])
+def test_reference_data_can_be_revalidated(test_app: TestClient, token, path):
+    headers = {"x-token": token}
+    etag = test_app.get(path, headers=headers).headers["etag"]
+    response = test_app.get(path, headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 304
+
+
+@pytest.mark.parametrize(
+    "path", ["/fees/", "/stats/entity/1", "/stats/treasury/1", "/transactions"]
+)
+def test_revalidation_requires_a_token(test_app: TestClient, token, path):
+    etag = test_app.get(path, headers={"x-token": token}).headers["etag"]
+    response = test_app.get(path, headers={"If-None-Match": etag})
+    assert response.status_code != 304
+    response = test_app.get(path, headers={"x-token": "invalid", "If-None-Match": etag})
+    assert response.status_code == 403
@@ -8,6 +8,7 @@ from app.db import DatabaseConnection
 from app.dependencies.services import ServiceContainer
 from app.uow import UnitOfWork
 from fastapi.testclient import TestClient
+from sqlalchemy import Engine, event, insert
 
 
 @pytest.fixture(scope="class")
@@ -96,10 +97,16 @@ def _fund_entity(test_app: TestClient, token, entity_id, amount: str, currency:
     assert r.status_code == 200, r.text
 
 
-def _run_auto_pay_job() -> int:
+def _run_auto_pay_job(statements: list[str] | None = None) -> int:
     config_provider = app.dependency_overrides.get(get_config, get_config)
     config = config_provider()
     db_conn = DatabaseConnection(config=config)
+    if statements is not None:
+
+        @event.listens_for(db_conn.engine, "before_cursor_execute")
+        def _record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
     session = db_conn.get_session()
     try:
         with UnitOfWork(session) as uow:
@@ -474,6 +481,44 @@ class TestInvoiceEndpoints:
         entity_items = entity_response.json()["items"]
         assert any(item["id"] == pending_invoice["id"] for item in entity_items)
 
+    def test_invoice_filtering_by_currency_follows_amount_edits(
+        self, test_app: TestClient, token, invoice_entity_from, invoice_entity_to
+    ):
+        invoice = _create_invoice_with_amounts(
+            test_app,
+            token,
+            invoice_entity_from,
+            invoice_entity_to,
+            [{"currency": "EUR", "amount": "5.00"}],
+        ).json()
+
+        def ids_payable_in(currency: str) -> set[int]:
+            response = test_app.get(
+                "/invoices",
+                params={"currency": currency, "limit": 1000},
+                headers={"x-token": token},
+            )
+            assert response.status_code == 200
+            return {item["id"] for item in response.json()["items"]}
+
+        assert invoice["id"] in ids_payable_in("eur")
+        assert invoice["id"] not in ids_payable_in("gel")
+
+        update_response = test_app.patch(
+            f"/invoices/{invoice['id']}",
+            json={"amounts": [{"currency": "gel", "amount": "14.00"}]},
+            headers={"x-token": token},
+        )
+        assert update_response.status_code == 200
+        assert invoice["id"] in ids_payable_in("GEL")
+        assert invoice["id"] not in ids_payable_in("eur")
+
+        delete_response = test_app.delete(
+            f"/invoices/{invoice['id']}", headers={"x-token": token}
+        )
+        assert delete_response.status_code == 200
+        assert invoice["id"] not in ids_payable_in("gel")
+
 
 class TestInvoiceAutoPayTask:
     def test_auto_pay_oldest_invoices_max_per_entity(self, test_app: TestClient, token):
@@ -703,3 +748,230 @@ class TestInvoiceAutoPayTask:
         assert invoice_after["status"] == "paid"
         assert invoice_after["transaction_id"] is not None
         assert any(tag["id"] == fee_tag.id for tag in invoice_after["tags"])
+
+    def test_auto_pay_batch_credits_recipients_and_keeps_query_count_flat(
+        self, test_app: TestClient, token, invoice_tag
+    ):
+        funding_entity = test_app.post(
+            "/entities",
+            json={"name": "AutoPay Batch Funding"},
+            headers={"x-token": token},
+        ).json()["id"]
+        payee_entity = test_app.post(
+            "/entities",
+            json={"name": "AutoPay Batch Payee"},
+            headers={"x-token": token},
+        ).json()["id"]
+        payers = [
+            test_app.post(
+                "/entities",
+                json={"name": f"AutoPay Batch Payer {index}"},
+                headers={"x-token": token},
+            ).json()["id"]
+            for index in range(6)
+        ]
+        # The last payer has no funds of its own: it can only pay with what the
+        # previous payer sends to it during the same run.
+        relay_payer = payers[-1]
+        invoice_ids: list[int] = []
+        for payer in payers[:-1]:
+            _fund_entity(test_app, token, payer, "20.00", "usd")
+            for amount in ("5.00", "7.00"):
+                invoice_ids.append(
+                    _create_invoice_with_amounts(
+                        test_app,
+                        token,
+                        payer,
+                        payee_entity,
+                        [{"currency": "usd", "amount": amount}],
+                    ).json()["id"]
+                )
+        relay_invoice = test_app.post(
+            "/invoices",
+            json={
+                "from_entity_id": payers[-2],
+                "to_entity_id": relay_payer,
+                "amounts": [{"currency": "usd", "amount": "8.00"}],
+                "tag_ids": [invoice_tag],
+            },
+            headers={"x-token": token},
+        ).json()
+        relayed_invoice = _create_invoice_with_amounts(
+            test_app,
+            token,
+            relay_payer,
+            funding_entity,
+            [{"currency": "usd", "amount": "8.00"}],
+        ).json()
+
+        statements: list[str] = []
+        paid_count = _run_auto_pay_job(statements)
+        assert paid_count == len(invoice_ids) + 2
+        # Invoices, items, tags, balances, one INSERT per table and one UPDATE.
+        assert len(statements) <= 15
+
+        for invoice_id in invoice_ids + [relay_invoice["id"], relayed_invoice["id"]]:
+            invoice = test_app.get(
+                f"/invoices/{invoice_id}", headers={"x-token": token}
+            ).json()
+            assert invoice["status"] == "paid"
+            assert invoice["transaction_id"] is not None
+
+        relay_tx = test_app.get(
+            "/transactions",
+            params={"invoice_id": relay_invoice["id"]},
+            headers={"x-token": token},
+        ).json()["items"][0]
+        from app.seeding import automatic_tag
+
+        assert {tag["id"] for tag in relay_tx["tags"]} == {
+            automatic_tag.id,
+            invoice_tag,
+        }
+        assert Decimal(relay_tx["amount"]) == Decimal("8.00")
+
+        balances = test_app.get(
+            f"/balances/{relay_payer}", headers={"x-token": token}
+        ).json()
+        assert Decimal(balances["completed"]["usd"]) == Decimal("0")
+
+
+class TestInvoiceBulkIssue:
+    def test_bulk_create_reports_skipped_and_copies_items_and_tags(
+        self, test_app: TestClient, token, invoice_tag
+    ):
+        payer_tag = test_app.post(
+            "/tags", json={"name": "bulk-issue-payers"}, headers={"x-token": token}
+        ).json()["id"]
+        payee = test_app.post(
+            "/entities", json={"name": "Bulk Issue Payee"}, headers={"x-token": token}
+        ).json()["id"]
+        active_ids = [
+            test_app.post(
+                "/entities",
+                json={"name": f"Bulk Issue Payer {index}", "tag_ids": [payer_tag]},
+                headers={"x-token": token},
+            ).json()["id"]
+            for index in range(3)
+        ]
+        inactive_id = test_app.post(
+            "/entities",
+            json={"name": "Bulk Issue Inactive", "tag_ids": [payer_tag]},
+            headers={"x-token": token},
+        ).json()["id"]
+        test_app.patch(
+            f"/entities/{inactive_id}",
+            json={"active": False},
+            headers={"x-token": token},
+        )
+
+        response = test_app.post(
+            "/invoices/bulk",
+            json={
+                "from_tag_ids": [payer_tag],
+                "from_entity_ids": [active_ids[0], 999999],
+                "billing_period": "2024-03-15",
+                "items": [
+                    {
+                        "to_entity_id": payee,
+                        "amounts": [{"currency": "usd", "amount": "3"}],
+                    },
+                    {
+                        "to_entity_id": payee,
+                        "amounts": [
+                            {"currency": "usd", "amount": "1.5"},
+                            {"currency": "gel", "amount": "4"},
+                        ],
+                    },
+                ],
+                # a repeated tag is linked once
+                "tag_ids": [invoice_tag, invoice_tag],
+                "comment": "bulk issue",
+            },
+            headers={"x-token": token},
+        )
+        assert response.status_code == 200
+        report = response.json()
+        assert report["billing_period"] == "2024-03-01"
+        assert report["created_count"] == 3
+        assert report["skipped_count"] == 2
+        assert len(report["invoice_ids"]) == 3
+
+        for invoice_id, entity_id in zip(report["invoice_ids"], active_ids):
+            invoice = test_app.get(
+                f"/invoices/{invoice_id}", headers={"x-token": token}
+            ).json()
+            assert invoice["from_entity_id"] == entity_id
+            assert invoice["status"] == "pending"
+            assert invoice["comment"] == "bulk issue"
+            assert invoice["amounts"] == []
+            assert [tag["id"] for tag in invoice["tags"]] == [invoice_tag]
+            assert [item["amounts"] for item in invoice["items"]] == [
+                [{"currency": "usd", "amount": "3.00"}],
+                [
+                    {"currency": "usd", "amount": "1.50"},
+                    {"currency": "gel", "amount": "4.00"},
+                ],
+            ]
+
+    def test_bulk_create_benchmark_thousand_entities(
+        self, test_app: TestClient, token, invoice_tag
+    ):
+        from app.models.entity import Entity, entities_tags
+
+        payer_tag = test_app.post(
+            "/tags", json={"name": "bulk-issue-benchmark"}, headers={"x-token": token}
+        ).json()["id"]
+        payee = test_app.post(
+            "/entities",
+            json={"name": "Bulk Issue Benchmark Payee"},
+            headers={"x-token": token},
+        ).json()["id"]
+        config = app.dependency_overrides.get(get_config, get_config)()
+        connection = DatabaseConnection(config)
+        try:
+            with UnitOfWork(connection.get_session()) as uow:
+                entity_ids = list(
+                    uow.db.scalars(
+                        insert(Entity).returning(Entity.id),
+                        [{"name": f"bulk-benchmark-{index}"} for index in range(1000)],
+                    )
+                )
+                uow.db.execute(
+                    insert(entities_tags),
+                    [
+                        {"entity_id": entity_id, "tag_id": payer_tag}
+                        for entity_id in entity_ids
+                    ],
+                )
+        finally:
+            connection.engine.dispose()
+
+        statements: list[str] = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(Engine, "before_cursor_execute", record)
+        try:
+            response = test_app.post(
+                "/invoices/bulk",
+                json={
+                    "from_tag_ids": [payer_tag],
+                    "to_entity_id": payee,
+                    "amounts": [
+                        {"currency": "usd", "amount": "25"},
+                        {"currency": "gel", "amount": "70"},
+                    ],
+                    "tag_ids": [invoice_tag],
+                },
+                headers={"x-token": token},
+            )
+        finally:
+            event.remove(Engine, "before_cursor_execute", record)
+
+        assert response.status_code == 200
+        assert response.json()["created_count"] == 1000
+        assert response.json()["skipped_count"] == 0
+        # Auth, entity resolution, tag lookup and two INSERTs; not one per entity.
+        assert len(statements) <= 15
@@ -0,0 +1,139 @@
+"""Tests for the Keepz deposit provider transaction sync"""
+
+import pytest
+from app.app import app
+from app.config import get_config
+from app.db import DatabaseConnection
+from app.dependencies.services import ServiceContainer
+from app.libs.keepz_cli.keepz_api import (
+    Transaction,
+    TransactionsPage,
+    TransactionsResponse,
+)
+from app.services.keepz import KeepzService
+from app.uow import UnitOfWork
+from fastapi.testclient import TestClient
+
+
+class FakeKeepz:
+    """In-memory Keepz account listing transactions newest first."""
+
+    def __init__(self) -> None:
+        self.transactions: dict[int, Transaction] = {}
+        self.pages_read: list[int] = []
+        self.fetched: list[int] = []
+
+    def add(self, tx_id: int, note: str, status: str = "SUCCESS") -> None:
+        self.transactions[tx_id] = Transaction(
+            id=tx_id, note=note, status=status, amount=10.0, currencyCode="GEL"
+        )
+
+    def install(self, monkeypatch) -> None:
+        fake = self
+
+        def _list_transactions(self, *, page=0, limit=20):
+            fake.pages_read.append(page)
+            ordered = sorted(fake.transactions.values(), key=lambda tx: -tx.id)
+            content = ordered[page * limit : (page + 1) * limit]
+            return TransactionsResponse(
+                transactionsPage=TransactionsPage(
+                    content=content, last=(page + 1) * limit >= len(ordered)
+                )
+            )
+
+        def _get_transaction(self, transaction_id):
+            fake.fetched.append(transaction_id)
+            return fake.transactions[transaction_id]
+
+        monkeypatch.setattr(KeepzService, "list_transactions", _list_transactions)
+        monkeypatch.setattr(KeepzService, "get_transaction", _get_transaction)
+        monkeypatch.setattr(
+            KeepzService,
+            "create_payment_link",
+            lambda self, *, amount, currency, commission_type, note: "https://keepz.test/p",
+        )
+        monkeypatch.setattr(KeepzService, "resolve_payment_url", lambda self, url: url)
+
+
+class TestKeepzSync:
+    @pytest.fixture
+    def keepz(self, monkeypatch) -> FakeKeepz:
+        fake = FakeKeepz()
+        fake.install(monkeypatch)
+        return fake
+
+    def _create_deposit(self, test_app: TestClient, token, note: str) -> int:
+        response = test_app.post(
+            "/deposits/providers/keepz",
+            params={"to_entity_id": 1, "amount": "10.00", "note": note},
+            headers={"x-token": token},
+        )
+        assert response.status_code == 200, response.text
+        return response.json()["id"]
+
+    def _status(self, test_app: TestClient, token, deposit_id: int) -> str:
+        return test_app.get(
+            f"/deposits/{deposit_id}", headers={"x-token": token}
+        ).json()["status"]
+
+    def _poll(self) -> int:
+        config = app.dependency_overrides.get(get_config, get_config)()
+        db_conn = DatabaseConnection(config=config)
+        try:
+            with UnitOfWork(db_conn.get_session()) as uow:
+                container = ServiceContainer(uow, config)
+                return container.keepz_deposit_provider_service.poll_pending_deposits()
+        finally:
+            db_conn.engine.dispose()
+
+    def test_sync_pages_only_through_new_transactions(
+        self, test_app: TestClient, token, keepz: FakeKeepz
+    ):
+        for tx_id in range(1, 121):
+            keepz.add(tx_id, note=f"old{tx_id}")
+        first = self._create_deposit(test_app, token, "kz1")
+        second = self._create_deposit(test_app, token, "kz2")
+
+        # First sync only sets the cursor from the latest page.
+        assert self._poll() == 0
+        assert keepz.pages_read == [0]
+
+        keepz.add(121, note="kz1")
+        keepz.add(122, note="kz2", status="PROCESSING")
+        keepz.pages_read.clear()
+        assert self._poll() == 1
+        assert keepz.pages_read == [0]
+        assert self._status(test_app, token, first) == "completed"
+        assert self._status(test_app, token, second) == "pending"
+
+        # The unfinished transaction is re-fetched by id until it settles.
+        keepz.add(122, note="kz2")
+        keepz.pages_read.clear()
+        assert self._poll() == 1
+        assert keepz.pages_read == [0]
+        assert keepz.fetched == [122]
+        assert self._status(test_app, token, second) == "completed"
+
+        # Nothing pending: only the newest transaction is read.
+        keepz.pages_read.clear()
+        assert self._poll() == 0
+        assert keepz.pages_read == [0]
+
+    def test_idle_sync_skips_transactions_made_while_nothing_was_pending(
+        self, test_app: TestClient, token, keepz: FakeKeepz
+    ):
+        keepz.add(1001, note="old1001")
+        assert self._poll() == 0
+
+        # A payment with a reused note lands while no deposit is pending.
+        keepz.add(1002, note="kz3")
+        assert self._poll() == 0
+
+        deposit = self._create_deposit(test_app, token, "kz3")
+        keepz.pages_read.clear()
+        assert self._poll() == 0
+        assert self._status(test_app, token, deposit) == "pending"
+
+        keepz.add(1003, note="kz3")
+        assert self._poll() == 1
+        assert self._status(test_app, token, deposit) == "completed"
@@ -0,0 +1,230 @@
+"""Tests for the notification outbox and its dispatcher"""
+
+import asyncio
+import datetime
+import time
+
+import pytest
+from app.app import app
+from app.config import get_config
+from app.db import DatabaseConnection
+from app.models.notification_outbox import NotificationOutbox, NotificationOutboxStatus
+from app.tasks.notification_dispatch import NotificationDispatcher, TokenBucket
+from fastapi.testclient import TestClient
+
+
+class FakeResponse:
+    def __init__(self, status_code: int, body: dict | None = None) -> None:
+        self.status_code = status_code
+        self._body = body or {}
+        self.text = str(self._body)
+
+    def json(self) -> dict:
+        return self._body
+
+
+class FakeTelegram:
+    """Stands in for the pooled HTTP session; replies from a scripted queue."""
+
+    def __init__(self, *responses: FakeResponse) -> None:
+        self.responses = list(responses)
+        self.requests: list[dict] = []
+
+    def post(self, url, data, timeout):
+        self.requests.append(data)
+        return self.responses.pop(0)
+
+
+def _active_config():
+    return app.dependency_overrides.get(get_config, get_config)()
+
+
+def _outbox_rows(db_conn: DatabaseConnection) -> list[NotificationOutbox]:
+    with db_conn.get_session() as session:
+        return session.query(NotificationOutbox).order_by(NotificationOutbox.id).all()
+
+
+def _make_due(db_conn: DatabaseConnection) -> None:
+    with db_conn.get_session() as session:
+        session.query(NotificationOutbox).update(
+            {NotificationOutbox.next_attempt_at: datetime.datetime.now()}
+        )
+        session.commit()
+
+
+class TestTokenBucket:
+    def test_reserve_spaces_out_requests_beyond_capacity(self):
+        now = [0.0]
+        bucket = TokenBucket(rate=2.0, capacity=2.0, clock=lambda: now[0])
+
+        assert [bucket.reserve() for _ in range(4)] == [0.0, 0.0, 0.5, 1.0]
+        now[0] = 2.0
+        assert bucket.reserve() == 0.0
+        assert not bucket.idle
+        now[0] = 10.0
+        assert bucket.idle
+
+
+class TestNotificationOutbox:
+    @pytest.fixture(autouse=True)
+    def telegram_token(self, test_app: TestClient, monkeypatch):
+        monkeypatch.setattr(_active_config(), "telegram_bot_api_token", "test-token")
+
+    def test_send_only_enqueues_and_dispatcher_delivers(
+        self, test_app: TestClient, token
+    ):
+        entity_id = test_app.post(
+            "/entities",
+            json={"name": "Outbox recipient", "auth": {"telegram_id": 4242}},
+            headers={"x-token": token},
+        ).json()["id"]
+
+        response = test_app.post(
+            "/notifications/send",
+            json={"entity_id": entity_id, "message": "hello <b>there</b>"},
+            headers={"x-token": token},
+        )
+        assert response.status_code == 200, response.text
+        assert response.json()["results"] == {"telegram": True}
+
+        db_conn = DatabaseConnection(config=_active_config())
+        try:
+            [row] = _outbox_rows(db_conn)
+            assert row.entity_id == entity_id
+            assert row.chat_id == 4242
+            assert row.status == NotificationOutboxStatus.PENDING
+            assert row.payload == {"text": "hello <b>there</b>", "parse_mode": "HTML"}
+
+            telegram = FakeTelegram(
+                FakeResponse(429, {"parameters": {"retry_after": 30}}),
+                FakeResponse(200, {"ok": True}),
+            )
+            dispatcher = NotificationDispatcher(
+                _active_config(), db_conn=db_conn, http=telegram
+            )
+
+            # Rate limited: the row is rescheduled rather than slept on.
+            assert asyncio.run(dispatcher.dispatch_once()) == 1
+            [row] = _outbox_rows(db_conn)
+            assert row.status == NotificationOutboxStatus.PENDING
+            assert row.attempts == 1
+            assert row.next_attempt_at > datetime.datetime.now()
+            assert asyncio.run(dispatcher.dispatch_once()) == 0
+
+            _make_due(db_conn)
+            assert asyncio.run(dispatcher.dispatch_once()) == 1
+            [row] = _outbox_rows(db_conn)
+            assert row.status == NotificationOutboxStatus.SENT
+            assert row.sent_at is not None
+            assert telegram.requests[-1]["chat_id"] == 4242
+        finally:
+            db_conn.engine.dispose()
+
+    def test_rejected_reply_markup_is_dropped_before_failing(
+        self, test_app: TestClient, token
+    ):
+        db_conn = DatabaseConnection(config=_active_config())
+        try:
+            with db_conn.get_session() as session:
+                session.query(NotificationOutbox).delete()
+                session.add(
+                    NotificationOutbox(
+                        chat_id=500100,
+                        payload={"text": "hi", "reply_markup": "{bad"},
+                    )
+                )
+                session.commit()
+
+            telegram = FakeTelegram(
+                FakeResponse(400, {"description": "can't parse reply markup"}),
+                FakeResponse(400, {"description": "chat not found"}),
+            )
+            dispatcher = NotificationDispatcher(
+                _active_config(), db_conn=db_conn, http=telegram
+            )
+            assert asyncio.run(dispatcher.dispatch_once()) == 1
+            [row] = _outbox_rows(db_conn)
+            assert row.status == NotificationOutboxStatus.PENDING
+            assert "reply_markup" not in row.payload
+
+            assert asyncio.run(dispatcher.dispatch_once()) == 1
+            [row] = _outbox_rows(db_conn)
+            assert row.status == NotificationOutboxStatus.FAILED
+            assert "chat not found" in row.last_error
+            assert "reply_markup" not in telegram.requests[-1]
+        finally:
+            db_conn.engine.dispose()
+
+    def test_claim_caps_rows_per_chat_to_its_send_rate(
+        self, test_app: TestClient, token
+    ):
+        db_conn = DatabaseConnection(config=_active_config())
+        try:
+            with db_conn.get_session() as session:
+                session.query(NotificationOutbox).delete()
+                session.add_all(
+                    [
+                        NotificationOutbox(chat_id=-500200, payload={"text": "group"})
+                        for _ in range(8)
+                    ]
+                    + [
+                        NotificationOutbox(chat_id=500200, payload={"text": "direct"})
+                        for _ in range(3)
+                    ]
+                )
+                session.commit()
+
+            dispatcher = NotificationDispatcher(
+                _active_config(), db_conn=db_conn, http=FakeTelegram()
+            )
+            claimed = dispatcher.claim_due()
+            # A group sends 20 per minute, so 15 seconds' worth is 5 rows.
+            assert [delivery.chat_id for delivery in claimed].count(-500200) == 5
+            assert [delivery.chat_id for delivery in claimed].count(500200) == 3
+            # The group's other rows are left for the next batch.
+            assert [delivery.chat_id for delivery in dispatcher.claim_due()] == [
+                -500200
+            ] * 3
+        finally:
+            db_conn.engine.dispose()
+
+    def test_outcome_is_recorded_before_the_batch_finishes(
+        self, test_app: TestClient, token
+    ):
+        db_conn = DatabaseConnection(config=_active_config())
+        try:
+            with db_conn.get_session() as session:
+                session.query(NotificationOutbox).delete()
+                session.add_all(
+                    [
+                        NotificationOutbox(chat_id=500300, payload={"text": "fast"}),
+                        NotificationOutbox(chat_id=500301, payload={"text": "slow"}),
+                    ]
+                )
+                session.commit()
+            fast_id = _outbox_rows(db_conn)[0].id
+            seen = []
+
+            class SlowTelegram:
+                def post(self, url, data, timeout):
+                    if data["chat_id"] == 500301:
+                        deadline = time.monotonic() + 5
+                        while time.monotonic() < deadline:
+                            with db_conn.get_session() as session:
+                                row = session.get(NotificationOutbox, fast_id)
+                                if row.status == NotificationOutboxStatus.SENT:
+                                    seen.append(fast_id)
+                                    break
+                            time.sleep(0.05)
+                    return FakeResponse(200, {"ok": True})
+
+            dispatcher = NotificationDispatcher(
+                _active_config(), db_conn=db_conn, http=SlowTelegram()
+            )
+            assert asyncio.run(dispatcher.dispatch_once()) == 2
+            assert seen == [fast_id]
+            assert {row.status for row in _outbox_rows(db_conn)} == {
+                NotificationOutboxStatus.SENT
+            }
+        finally:
+            db_conn.engine.dispose()
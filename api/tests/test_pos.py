@@ -1,5 +1,16 @@
+import time
+
 import pytest
+from app.app import app
+from app.config import get_config
+from app.db import DatabaseConnection
+from app.models.entity import Entity
+from app.models.invoice import Invoice, InvoiceStatus
+from app.schemas.pos import POSSyncSale
+from app.services.pos import pos_sale_signature
+from app.uow import UnitOfWork
 from fastapi.testclient import TestClient
+from sqlalchemy import Engine, event, insert
 
 
 @pytest.fixture(scope="class")
@@ -160,3 +171,152 @@ class TestPOSBlockedByUnpaidInvoices:
         )
         assert r.status_code == 200, r.text
         assert r.json()["balance"]["completed"]["usd"] == "-5.00"
+
+
+class TestPOSSync:
+    def _sale(self, client_id: str, entity_name: str, to_entity_id: int, **kwargs):
+        sale = {
+            "client_id": client_id,
+            "entity_name": entity_name,
+            "amount": "2.50",
+            "currency": "usd",
+            "to_entity_id": to_entity_id,
+            "recorded_at": "2026-01-01T12:00:00",
+            "signature": "",
+            **kwargs,
+        }
+        sale["signature"] = pos_sale_signature("test-pos-secret", POSSyncSale(**sale))
+        return sale
+
+    def test_offline_queue_is_applied_once_with_partial_failures(
+        self, test_app: TestClient, token, pos_headers
+    ):
+        ids = {}
+        for name in ("Sync Payer", "Sync Debtor", "Sync Merchant"):
+            r = test_app.post(
+                "/entities", json={"name": name}, headers={"x-token": token}
+            )
+            assert r.status_code == 200, r.text
+            ids[name] = r.json()["id"]
+        merchant_id = ids["Sync Merchant"]
+        inv = test_app.post(
+            "/invoices",
+            json={
+                "from_entity_id": ids["Sync Debtor"],
+                "to_entity_id": merchant_id,
+                "amounts": [{"currency": "usd", "amount": "5.00"}],
+            },
+            headers={"x-token": token},
+        )
+        assert inv.status_code == 200, inv.text
+
+        forged = self._sale("sync-3", "Sync Payer", merchant_id)
+        forged["amount"] = "0.01"
+        sales = [
+            self._sale("sync-1", "Sync Payer", merchant_id, comment="tea"),
+            self._sale("sync-2", "sync payer", merchant_id, amount="4"),
+            forged,
+            self._sale("sync-4", "Sync Debtor", merchant_id),
+            self._sale("sync-5", "Nobody", merchant_id),
+            self._sale("sync-1", "Sync Payer", merchant_id, comment="tea"),
+        ]
+        r = test_app.post("/pos/sync", json={"sales": sales}, headers=pos_headers)
+        assert r.status_code == 200, r.text
+        data = r.json()
+        assert [(x["client_id"], x["status"]) for x in data["results"]] == [
+            ("sync-1", "applied"),
+            ("sync-2", "applied"),
+            ("sync-3", "failed"),
+            ("sync-4", "failed"),
+            ("sync-5", "failed"),
+            ("sync-1", "duplicate"),
+        ]
+        assert [x["error_code"] for x in data["results"][2:5]] == [10002, 10001, 1404]
+        assert (data["applied"], data["duplicates"], data["failed"]) == (2, 1, 3)
+        payer_id = ids["Sync Payer"]
+        assert data["results"][0]["entity_id"] == payer_id
+        assert data["balances"][str(payer_id)]["completed"]["usd"] == "-6.50"
+
+        # Resending the whole queue charges nothing twice; fixed sales go through.
+        sales[2] = self._sale("sync-3", "Sync Payer", merchant_id, amount="0.01")
+        r = test_app.post("/pos/sync", json={"sales": sales}, headers=pos_headers)
+        assert r.status_code == 200, r.text
+        data = r.json()
+        assert [x["status"] for x in data["results"]] == [
+            "duplicate",
+            "duplicate",
+            "applied",
+            "failed",
+            "failed",
+            "duplicate",
+        ]
+        assert data["balances"][str(payer_id)]["completed"]["usd"] == "-6.51"
+        balance = test_app.get(f"/balances/{payer_id}", headers={"x-token": token})
+        assert balance.json()["completed"]["usd"] == "-6.51"
+
+
+class TestPOSLatency:
+    # p95 budget for one charge through the test client, in seconds
+    P95_BUDGET_SECONDS = 0.1
+
+    def test_pos_charge_p95_under_load(self, test_app: TestClient, pos_headers):
+        config = app.dependency_overrides.get(get_config, get_config)()
+        connection = DatabaseConnection(config)
+        try:
+            with UnitOfWork(connection.get_session()) as uow:
+                entity_ids = list(
+                    uow.db.scalars(
+                        insert(Entity).returning(Entity.id),
+                        [{"name": f"POS Load Member {n}"} for n in range(2000)],
+                    )
+                )
+                # Other members' unpaid invoices must not slow the probe down.
+                uow.db.execute(
+                    insert(Invoice),
+                    [
+                        {
+                            "actor_entity_id": entity_id,
+                            "from_entity_id": entity_id,
+                            "to_entity_id": entity_ids[0],
+                            "amounts": [{"currency": "usd", "amount": "1.00"}],
+                            "status": InvoiceStatus.PENDING,
+                        }
+                        for entity_id in entity_ids[2:]
+                    ],
+                )
+        finally:
+            connection.engine.dispose()
+        payer_name = "pos load member 1"
+
+        statements: list[str] = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        latencies = []
+        event.listen(Engine, "before_cursor_execute", record)
+        try:
+            for _ in range(100):
+                started = time.perf_counter()
+                response = test_app.post(
+                    "/pos/charge",
+                    json={
+                        "entity_name": payer_name,
+                        "amount": "1.50",
+                        "currency": "usd",
+                        "to_entity_id": entity_ids[0],
+                    },
+                    headers=pos_headers,
+                )
+                latencies.append(time.perf_counter() - started)
+                assert response.status_code == 200, response.text
+        finally:
+            event.remove(Engine, "before_cursor_execute", record)
+
+        assert response.json()["balance"]["completed"]["usd"] == "-150.00"
+        latencies.sort()
+        p95 = latencies[int(len(latencies) * 0.95) - 1]
+        # Name lookup, invoice probe, two INSERTs and the response's tags; the
+        # cached balance is adjusted rather than recomputed.
+        assert len(statements) <= 100 * 6
+        assert p95 < self.P95_BUDGET_SECONDS
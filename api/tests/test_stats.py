@@ -264,7 +264,8 @@ def test_entity_stats_bundle_has_bounded_query_count(test_app: TestClient, token
         event.remove(Engine, "before_cursor_execute", count_selects)
 
     assert response.status_code == 200, response.text
-    assert select_count <= 8
+    # one of them looks up the X-Token's entity
+    assert select_count <= 9
 
 
 def test_monthly_fee_stats_include_f0_share_of_multi_recipient_invoice(
@@ -1,6 +1,13 @@
+import datetime
+import threading
+import time
 from decimal import Decimal
 
 import pytest
+from app.app import app
+from app.config import get_config
+from app.db import DatabaseConnection
+from app.models.deposit import Deposit
 from app.services.stripe import StripeService
 from fastapi.testclient import TestClient
 
@@ -13,6 +20,48 @@ class _FakeCheckoutSession:
         self.payment_status = "unpaid"
 
 
+class FakeStripe:
+    """Local stand-in for the Stripe checkout API with a fixed per-call latency."""
+
+    def __init__(self, latency: float = 0.0) -> None:
+        self.latency = latency
+        self.sessions: dict[str, dict] = {}
+        self.calls: list[str] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def install(self, monkeypatch) -> None:
+        fake = self
+
+        def _retrieve_checkout_session(self, session_id, *, expand_setup_intent=False):
+            return fake.retrieve_checkout_session(session_id)
+
+        monkeypatch.setattr(
+            StripeService, "retrieve_checkout_session", _retrieve_checkout_session
+        )
+
+    def retrieve_checkout_session(self, session_id: str) -> dict:
+        with self._lock:
+            self.calls.append(session_id)
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            time.sleep(self.latency)
+            return dict(
+                self.sessions.get(session_id)
+                or {
+                    "id": session_id,
+                    "mode": "payment",
+                    "payment_status": "unpaid",
+                    "status": "open",
+                }
+            )
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+
 @pytest.fixture
 def patch_stripe_create(monkeypatch):
     def _fake_create_checkout_session(
@@ -175,3 +224,73 @@ class TestStripeDepositEndpoints:
         deposit = test_app.get(f"/deposits/{deposit_id}", headers={"x-token": token})
         assert deposit.status_code == 200
         assert deposit.json()["status"] == "cancelled"
+
+    def test_stripe_poll_is_concurrent_and_backs_off_stale_deposits(
+        self, test_app: TestClient, token, patch_stripe_create, monkeypatch
+    ):
+        deposit_ids = []
+        for _ in range(6):
+            create = test_app.post(
+                "/deposits/providers/stripe",
+                params={"to_entity_id": 1, "amount": "5.00", "currency": "GEL"},
+                headers={"x-token": token},
+            )
+            assert create.status_code == 200
+            deposit_ids.append(create.json()["id"])
+
+        fake = FakeStripe(latency=0.3)
+        fake.install(monkeypatch)
+
+        started = time.monotonic()
+        poll = test_app.post("/tasks/stripe-poll/run", headers={"x-token": token})
+        elapsed = time.monotonic() - started
+        assert poll.status_code == 200
+        assert {f"cs_test_{i}" for i in deposit_ids} <= set(fake.calls)
+        assert fake.max_in_flight > 1
+        assert elapsed < fake.latency * len(deposit_ids)
+
+        # Fresh deposits wait one poll interval before they are fetched again.
+        fake.calls.clear()
+        poll = test_app.post("/tasks/stripe-poll/run", headers={"x-token": token})
+        assert poll.status_code == 200
+        assert fake.calls == []
+
+        # A deposit untouched for days backs off to the maximum interval.
+        stale_id, fresh_id = deposit_ids[0], deposit_ids[1]
+        now = datetime.datetime.now()
+        config = app.dependency_overrides.get(get_config, get_config)()
+        db_conn = DatabaseConnection(config=config)
+        try:
+            with db_conn.get_session() as session:
+                for deposit in session.query(Deposit).filter(
+                    Deposit.id.in_(deposit_ids)
+                ):
+                    details = dict(deposit.details)
+                    details["stripe"] = {
+                        **details["stripe"],
+                        "next_poll_at": now.isoformat(),
+                    }
+                    deposit.details = details
+                    if deposit.id == stale_id:
+                        deposit.created_at = now - datetime.timedelta(days=3)
+                session.commit()
+        finally:
+            db_conn.engine.dispose()
+
+        poll = test_app.post("/tasks/stripe-poll/run", headers={"x-token": token})
+        assert poll.status_code == 200
+        assert {f"cs_test_{i}" for i in deposit_ids} <= set(fake.calls)
+
+        def _next_poll_in(deposit_id: int) -> float:
+            deposit = test_app.get(
+                f"/deposits/{deposit_id}", headers={"x-token": token}
+            ).json()
+            next_poll_at = datetime.datetime.fromisoformat(
+                deposit["details"]["stripe"]["next_poll_at"]
+            )
+            return (next_poll_at - now).total_seconds()
+
+        assert _next_poll_in(fresh_id) < 5 * 60
+        assert _next_poll_in(stale_id) == pytest.approx(
+            config.stripe_poll_max_interval_seconds, abs=60
+        )
@@ -1,8 +1,17 @@
+import datetime
+import threading
+import time
 from decimal import Decimal
 
 import pytest
+from app.app import app
+from app.config import get_config
+from app.db import DatabaseConnection
+from app.models.stripe_authorization import StripeAuthorization, StripeAuthorizationMode
 from app.services.stripe import StripeInvoiceData, StripeService
+from app.services.stripe_authorization import StripeAuthorizationService
 from fastapi.testclient import TestClient
+from sqlalchemy import text
 
 
 class _FakeCheckoutSession:
@@ -735,6 +744,353 @@ class TestStripeAuthorizationChargeFallback:
         assert fail_auth["consecutive_error_count"] >= 1
         assert ok_auth["consecutive_error_count"] == 0
 
+    def test_on_demand_charge_calls_stripe_outside_a_transaction(
+        self,
+        test_app: TestClient,
+        token,
+        monkeypatch,
+    ):
+        resident_id = test_app.post(
+            "/entities",
+            json={"name": "resident_no_open_tx", "tag_ids": [2], "auth": {}},
+            headers={"x-token": token},
+        ).json()["id"]
+
+        monkeypatch.setattr(
+            StripeService,
+            "construct_webhook_event",
+            lambda self, payload, signature: {
+                "id": "evt_setup_no_open_tx",
+                "type": "checkout.session.completed",
+                "data": {
+                    "object": {
+                        "id": "cs_setup_no_open_tx",
+                        "mode": "setup",
+                        "setup_intent": "si_no_open_tx",
+                        "metadata": {
+                            "entity_id": str(resident_id),
+                            "mode": "entity_dynamic",
+                            "static_amount": "0.00",
+                            "static_currency": "",
+                        },
+                    }
+                },
+            },
+        )
+        monkeypatch.setattr(
+            StripeService,
+            "retrieve_setup_intent",
+            lambda self, setup_intent_id: {
+                "id": setup_intent_id,
+                "payment_method": "pm_no_open_tx",
+                "customer": "cus_no_open_tx",
+            },
+        )
+        monkeypatch.setattr(
+            StripeService,
+            "retrieve_payment_method",
+            lambda self, payment_method_id: {
+                "id": payment_method_id,
+                "card": {"brand": "visa", "last4": "4242"},
+            },
+        )
+        callback = test_app.post(
+            "/deposit-callbacks/stripe",
+            data="{}",
+            headers={"Stripe-Signature": "testsig"},
+        )
+        assert callback.status_code == 200
+
+        db_conn = DatabaseConnection(
+            config=app.dependency_overrides.get(get_config, get_config)()
+        )
+        seen = {}
+
+        def _fake_create_payment_intent(self, **kwargs):
+            # Runs while the request is in flight: the pending deposit must
+            # already be committed and no connection may sit in a transaction.
+            with db_conn.get_session() as session:
+                seen["pending"] = session.execute(
+                    text(
+                        "SELECT status FROM deposits WHERE to_entity_id = :id"
+                        " ORDER BY id DESC LIMIT 1"
+                    ),
+                    {"id": resident_id},
+                ).scalar()
+                seen["idle_in_transaction"] = session.execute(
+                    text(
+                        "SELECT count(*) FROM pg_stat_activity"
+                        " WHERE datname = current_database()"
+                        " AND state = 'idle in transaction'"
+                        " AND pid <> pg_backend_pid()"
+                    )
+                ).scalar()
+            seen["idempotency_key"] = kwargs["idempotency_key"]
+            return _FakePaymentIntent(intent_id="pi_no_open_tx")
+
+        monkeypatch.setattr(
+            StripeService,
+            "create_off_session_payment_intent",
+            _fake_create_payment_intent,
+        )
+        try:
+            response = test_app.post(
+                "/deposits/providers/stripe/authorizations/charge",
+                params={
+                    "entity_id": resident_id,
+                    "amount": "12.00",
+                    "currency": "usd",
+                },
+                headers={"x-token": token},
+            )
+        finally:
+            db_conn.engine.dispose()
+
+        assert response.status_code == 200, response.text
+        deposit = response.json()
+        assert deposit["status"] == "completed"
+        assert deposit["details"]["stripe"]["payment_intent_id"] == "pi_no_open_tx"
+        assert seen["pending"] == "PENDING"
+        assert seen["idle_in_transaction"] == 0
+        assert seen["idempotency_key"].startswith(f"ondemand:{deposit['id']}:auth:")
+
+
+class TestStripeEntityChargeRun:
+    def test_weekly_run_charges_entities_concurrently_and_reports(
+        self,
+        test_app: TestClient,
+        token,
+        token_factory,
+        monkeypatch,
+    ):
+        entity_ids = []
+        for n in range(4):
+            entity_id = test_app.post(
+                "/entities",
+                json={"name": f"resident_batch_{n}", "tag_ids": [2], "auth": {}},
+                headers={"x-token": token},
+            ).json()["id"]
+            tx = test_app.post(
+                "/transactions/",
+                json={
+                    "from_entity_id": entity_id,
+                    "to_entity_id": 1,
+                    "amount": "5.00",
+                    "currency": "usd",
+                    "status": "completed",
+                },
+                headers={"x-token": token_factory(entity_id)},
+            )
+            assert tx.status_code == 200
+            entity_ids.append(entity_id)
+
+        db_conn = DatabaseConnection(
+            config=app.dependency_overrides.get(get_config, get_config)()
+        )
+        try:
+            with db_conn.get_session() as session:
+                for entity_id in entity_ids:
+                    session.add(
+                        StripeAuthorization(
+                            entity_id=entity_id,
+                            stripe_customer_id=f"cus_batch_{entity_id}",
+                            stripe_payment_method_id=f"pm_batch_{entity_id}",
+                            mode=StripeAuthorizationMode.ENTITY_DYNAMIC,
+                        )
+                    )
+                session.commit()
+        finally:
+            db_conn.engine.dispose()
+
+        declined = f"pm_batch_{entity_ids[0]}"
+        lock = threading.Lock()
+        stripe = {"keys": [], "in_flight": 0, "max_in_flight": 0}
+
+        def _slow_create_payment_intent(self, **kwargs):
+            with lock:
+                stripe["keys"].append(kwargs["idempotency_key"])
+                stripe["in_flight"] += 1
+                stripe["max_in_flight"] = max(
+                    stripe["max_in_flight"], stripe["in_flight"]
+                )
+            try:
+                time.sleep(0.2)
+                if kwargs["payment_method_id"] == declined:
+                    raise Exception("card declined")
+                return _FakePaymentIntent(intent_id=f"pi_{kwargs['customer_id']}")
+            finally:
+                with lock:
+                    stripe["in_flight"] -= 1
+
+        monkeypatch.setattr(
+            StripeService,
+            "create_off_session_payment_intent",
+            _slow_create_payment_intent,
+        )
+
+        run = test_app.post(
+            "/tasks/stripe-entity-charge/run", headers={"x-token": token}
+        )
+        assert run.status_code == 200
+        report = run.json()["details"]
+        assert run.json()["result"] == 4
+        assert report["entities"] == 4
+        assert report["succeeded"] == 3
+        assert report["skipped"] == 0
+        assert report["charges_per_second"] > 0
+        assert report["failures"] == [
+            {"entity_id": entity_ids[0], "currency": "usd", "error": "card declined"}
+        ]
+        assert stripe["max_in_flight"] > 1
+        now = datetime.datetime.now()
+        week_key = f"{now.isocalendar().year}-W{now.isocalendar().week:02d}"
+        assert {key.rsplit(":auth:", 1)[0] for key in stripe["keys"]} == {
+            f"entity:{entity_id}:usd:{week_key}" for entity_id in entity_ids
+        }
+
+        # Same cycle again: the paid entities owe nothing and the declined
+        # one is not charged twice.
+        stripe["keys"].clear()
+        rerun = test_app.post(
+            "/tasks/stripe-entity-charge/run", headers={"x-token": token}
+        )
+        assert rerun.json()["result"] == 0
+        assert rerun.json()["details"]["skipped"] == 1
+        assert stripe["keys"] == []
+
+    def test_weekly_run_reports_an_entity_whose_debt_cannot_be_calculated(
+        self,
+        test_app: TestClient,
+        token,
+        token_factory,
+        monkeypatch,
+    ):
+        entity_ids = []
+        for n, currency in enumerate(("usd", "xyz")):
+            entity_id = test_app.post(
+                "/entities",
+                json={"name": f"resident_owed_{n}", "tag_ids": [2], "auth": {}},
+                headers={"x-token": token},
+            ).json()["id"]
+            tx = test_app.post(
+                "/transactions/",
+                json={
+                    "from_entity_id": entity_id,
+                    "to_entity_id": 1,
+                    "amount": "5.00",
+                    "currency": currency,
+                    "status": "completed",
+                },
+                headers={"x-token": token_factory(entity_id)},
+            )
+            assert tx.status_code == 200
+            entity_ids.append(entity_id)
+
+        db_conn = DatabaseConnection(
+            config=app.dependency_overrides.get(get_config, get_config)()
+        )
+        try:
+            with db_conn.get_session() as session:
+                for entity_id in entity_ids:
+                    session.add(
+                        StripeAuthorization(
+                            entity_id=entity_id,
+                            stripe_customer_id=f"cus_owed_{entity_id}",
+                            stripe_payment_method_id=f"pm_owed_{entity_id}",
+                            mode=StripeAuthorizationMode.ENTITY_DYNAMIC,
+                        )
+                    )
+                session.commit()
+        finally:
+            db_conn.engine.dispose()
+
+        monkeypatch.setattr(
+            StripeService,
+            "create_off_session_payment_intent",
+            lambda self, **kwargs: _FakePaymentIntent(
+                intent_id=f"pi_{kwargs['customer_id']}"
+            ),
+        )
+
+        run = test_app.post(
+            "/tasks/stripe-entity-charge/run", headers={"x-token": token}
+        )
+        assert run.status_code == 200
+        report = run.json()["details"]
+        # "xyz" has no rate; the usd entity is charged all the same
+        assert report["succeeded"] == 1
+        assert report["failures"] == [
+            {
+                "entity_id": entity_ids[1],
+                "currency": None,
+                "error": "owed amount could not be calculated",
+            }
+        ]
+
+    def test_weekly_run_records_a_job_that_failed_before_any_card(
+        self,
+        test_app: TestClient,
+        token,
+        token_factory,
+        monkeypatch,
+    ):
+        entity_id = test_app.post(
+            "/entities",
+            json={"name": "resident_job_error", "tag_ids": [2], "auth": {}},
+            headers={"x-token": token},
+        ).json()["id"]
+        tx = test_app.post(
+            "/transactions/",
+            json={
+                "from_entity_id": entity_id,
+                "to_entity_id": 1,
+                "amount": "5.00",
+                "currency": "usd",
+                "status": "completed",
+            },
+            headers={"x-token": token_factory(entity_id)},
+        )
+        assert tx.status_code == 200
+
+        db_conn = DatabaseConnection(
+            config=app.dependency_overrides.get(get_config, get_config)()
+        )
+        try:
+            with db_conn.get_session() as session:
+                session.add(
+                    StripeAuthorization(
+                        entity_id=entity_id,
+                        stripe_customer_id=f"cus_job_error_{entity_id}",
+                        stripe_payment_method_id=f"pm_job_error_{entity_id}",
+                        mode=StripeAuthorizationMode.ENTITY_DYNAMIC,
+                    )
+                )
+                session.commit()
+        finally:
+            db_conn.engine.dispose()
+
+        def _unreachable(self, cards, **kwargs):
+            raise RuntimeError("stripe unreachable")
+
+        monkeypatch.setattr(StripeAuthorizationService, "_attempt_cards", _unreachable)
+
+        run = test_app.post(
+            "/tasks/stripe-entity-charge/run", headers={"x-token": token}
+        )
+        assert run.status_code == 200
+        assert {
+            "entity_id": entity_id,
+            "currency": "usd",
+            "error": "stripe unreachable",
+        } in run.json()["details"]["failures"]
+
+        listing = test_app.get(
+            "/deposits",
+            params={"provider": "stripe", "to_entity_id": entity_id, "limit": 20},
+            headers={"x-token": token},
+        )
+        assert [item["status"] for item in listing.json()["items"]] == ["failed"]
+
 
 class TestStripeSubscriptionInvoicePaid:
     """Test that invoice.paid webhooks from Stripe subscriptions create deposits."""
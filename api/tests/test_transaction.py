@@ -2,6 +2,7 @@ from decimal import Decimal
 
 import pytest
 from fastapi.testclient import TestClient
+from sqlalchemy import Engine, event
 
 
 @pytest.fixture(scope="class")
@@ -356,6 +357,163 @@ class TestTransactionTreasuryFiltering:
             )
 
 
+class TestFetchByIds:
+    def _get(self, test_app: TestClient, token, path: str, ids: list[int]):
+        statements: list[str] = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(Engine, "before_cursor_execute", record)
+        try:
+            response = test_app.get(
+                path,
+                params={"ids": ",".join(map(str, ids))},
+                headers={"x-token": token},
+            )
+        finally:
+            event.remove(Engine, "before_cursor_execute", record)
+        assert response.status_code == 200, response.text
+        return [item["id"] for item in response.json()["items"]], len(statements)
+
+    def test_ids_load_in_request_order_with_constant_queries(
+        self, test_app: TestClient, entity_one, entity_two, token
+    ):
+        tx_ids = []
+        for amount in ("1.00", "2.00", "3.00", "4.00", "5.00"):
+            response = test_app.post(
+                "/transactions",
+                json={
+                    "from_entity_id": entity_one,
+                    "to_entity_id": entity_two,
+                    "amount": amount,
+                    "currency": "usd",
+                },
+                headers={"x-token": token},
+            )
+            assert response.status_code == 200
+            tx_ids.append(response.json()["id"])
+
+        wanted = [tx_ids[2], tx_ids[0], tx_ids[4], tx_ids[0]]
+        ids, few = self._get(test_app, token, "/transactions", wanted[:2])
+        assert ids == wanted[:2]
+        ids, many = self._get(test_app, token, "/transactions", wanted)
+        assert ids == [tx_ids[2], tx_ids[0], tx_ids[4]]
+        # Relationships are eager-loaded: more ids do not mean more queries.
+        assert many == few
+
+        ids, _ = self._get(test_app, token, "/entities", [entity_two, entity_one])
+        assert ids == [entity_two, entity_one]
+
+        invoice_ids = []
+        for _ in range(2):
+            response = test_app.post(
+                "/invoices",
+                json={
+                    "from_entity_id": entity_one,
+                    "to_entity_id": entity_two,
+                    "amounts": [{"currency": "usd", "amount": "1.00"}],
+                },
+                headers={"x-token": token},
+            )
+            assert response.status_code == 200
+            invoice_ids.append(response.json()["id"])
+        ids, _ = self._get(test_app, token, "/invoices", invoice_ids)
+        assert ids == invoice_ids
+
+        ids, _ = self._get(test_app, token, "/tags", [1, 3, 2])
+        assert ids == [1, 3, 2]
+
+        response = test_app.get(
+            "/transactions", params={"ids": "1,a"}, headers={"x-token": token}
+        )
+        assert response.status_code == 422
+
+
+class TestSparseFields:
+    def _get(self, test_app: TestClient, token, path: str, **params):
+        statements: list[str] = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(Engine, "before_cursor_execute", record)
+        try:
+            response = test_app.get(path, params=params, headers={"x-token": token})
+        finally:
+            event.remove(Engine, "before_cursor_execute", record)
+        return response, len(statements)
+
+    def test_fields_and_expand_limit_payload_and_loading(
+        self, test_app: TestClient, entity_one, entity_two, token
+    ):
+        response = test_app.post(
+            "/transactions",
+            json={
+                "from_entity_id": entity_one,
+                "to_entity_id": entity_two,
+                "amount": "7.50",
+                "currency": "usd",
+            },
+            headers={"x-token": token},
+        )
+        assert response.status_code == 200
+        tx_id = response.json()["id"]
+
+        full, full_statements = self._get(
+            test_app, token, "/transactions", ids=str(tx_id)
+        )
+        sparse, sparse_statements = self._get(
+            test_app, token, "/transactions", ids=str(tx_id), fields="amount,currency"
+        )
+        assert sparse.status_code == 200, sparse.text
+        assert sparse.json()["items"] == [
+            {"id": tx_id, "amount": "7.50", "currency": "usd"}
+        ]
+        assert sparse.json()["total"] == 1
+        # Relations that are not requested are not loaded either.
+        assert sparse_statements < full_statements
+
+        expanded, _ = self._get(
+            test_app, token, "/transactions", ids=str(tx_id), expand="to_entity"
+        )
+        item = expanded.json()["items"][0]
+        assert item["to_entity"] == full.json()["items"][0]["to_entity"]
+        assert item["from_entity_id"] == entity_one
+        assert "from_entity" not in item and "tags" not in item
+
+        entities, _ = self._get(
+            test_app, token, "/entities", ids=str(entity_two), fields="name,tags"
+        )
+        assert entities.json()["items"] == [
+            {"id": entity_two, "name": "User Two 2", "tags": []}
+        ]
+
+        response = test_app.post(
+            "/invoices",
+            json={
+                "from_entity_id": entity_one,
+                "to_entity_id": entity_two,
+                "amounts": [{"currency": "usd", "amount": "1.00"}],
+            },
+            headers={"x-token": token},
+        )
+        assert response.status_code == 200
+        invoices, _ = self._get(
+            test_app,
+            token,
+            "/invoices",
+            ids=str(response.json()["id"]),
+            fields="status,transaction_id",
+        )
+        assert invoices.status_code == 200, invoices.text
+        assert set(invoices.json()["items"][0]) == {"id", "status", "transaction_id"}
+
+        response, _ = self._get(test_app, token, "/invoices", expand="amounts")
+        assert response.status_code == 418
+        assert response.json()["error_code"] == 1422
+
+
 # @pytest.fixture
 # def multiple_transactions(test_app: TestClient, entity_one, entity_two, token):
 #     """Create multiple transactions to test filtering."""
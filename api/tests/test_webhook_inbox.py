@@ -0,0 +1,171 @@
+"""Tests for the webhook inbox and its worker"""
+
+import datetime
+
+import pytest
+import stripe
+from app.app import app
+from app.config import get_config
+from app.db import DatabaseConnection
+from app.models.webhook_inbox import WebhookInbox, WebhookInboxStatus
+from app.services.deposit_providers.stripe import StripeDepositProviderService
+from app.services.stripe import StripeService
+from app.tasks.webhook_inbox import WebhookInboxWorker, shared_webhook_inbox_worker
+from fastapi.testclient import TestClient
+
+
+def _active_config():
+    return app.dependency_overrides.get(get_config, get_config)()
+
+
+def _inbox_row(db_conn: DatabaseConnection, event_id: str) -> WebhookInbox:
+    with db_conn.get_session() as session:
+        return session.query(WebhookInbox).filter_by(event_id=event_id).one()
+
+
+def _checkout_completed(event_id: str, deposit_id: int) -> dict:
+    return {
+        "id": event_id,
+        "type": "checkout.session.completed",
+        "data": {
+            "object": {
+                "id": f"cs_inbox_{deposit_id}",
+                "mode": "payment",
+                "payment_status": "paid",
+                "status": "complete",
+                "amount_total": 700,
+                "currency": "gel",
+                "metadata": {"deposit_id": str(deposit_id)},
+            }
+        },
+    }
+
+
+class TestWebhookInbox:
+    @pytest.fixture
+    def db_conn(self, test_app: TestClient):
+        db_conn = DatabaseConnection(config=_active_config())
+        yield db_conn
+        db_conn.engine.dispose()
+
+    def _deliver(self, test_app: TestClient, monkeypatch, event: dict) -> None:
+        monkeypatch.setattr(
+            StripeService,
+            "construct_webhook_event",
+            lambda self, payload, signature: event,
+        )
+        response = test_app.post(
+            "/deposit-callbacks/stripe",
+            data="{}",
+            headers={"Stripe-Signature": "testsig"},
+        )
+        assert response.status_code == 200
+
+    def _create_deposit(self, test_app: TestClient, token, monkeypatch) -> int:
+        class _Session:
+            id = "cs_inbox"
+            url = "https://checkout.stripe.test/inbox"
+            status = "open"
+            payment_status = "unpaid"
+
+        monkeypatch.setattr(
+            StripeService, "create_checkout_session", lambda self, **kwargs: _Session
+        )
+        response = test_app.post(
+            "/deposits/providers/stripe",
+            params={"to_entity_id": 1, "amount": "7.00", "currency": "GEL"},
+            headers={"x-token": token},
+        )
+        assert response.status_code == 200
+        return response.json()["id"]
+
+    def test_redelivered_event_is_processed_once(
+        self, test_app: TestClient, token, monkeypatch, db_conn
+    ):
+        deposit_id = self._create_deposit(test_app, token, monkeypatch)
+        event = _checkout_completed("evt_inbox_dup", deposit_id)
+        calls = []
+        handle = StripeDepositProviderService.handle_webhook_event
+
+        def _counting_handle(self, event):
+            calls.append(event["id"])
+            return handle(self, event)
+
+        monkeypatch.setattr(
+            StripeDepositProviderService, "handle_webhook_event", _counting_handle
+        )
+        self._deliver(test_app, monkeypatch, event)
+        self._deliver(test_app, monkeypatch, event)
+
+        assert calls == ["evt_inbox_dup"]
+        row = _inbox_row(db_conn, "evt_inbox_dup")
+        assert row.status == WebhookInboxStatus.PROCESSED
+        assert row.event_type == "checkout.session.completed"
+        deposit = test_app.get(f"/deposits/{deposit_id}", headers={"x-token": token})
+        assert deposit.json()["status"] == "completed"
+
+    def test_failures_are_retried_then_dead_lettered(
+        self, test_app: TestClient, token, monkeypatch, db_conn
+    ):
+        deposit_id = self._create_deposit(test_app, token, monkeypatch)
+        handle = StripeDepositProviderService.handle_webhook_event
+        failures = [RuntimeError("database went away")]
+
+        def _flaky_handle(self, event):
+            if failures:
+                raise failures.pop()
+            return handle(self, event)
+
+        monkeypatch.setattr(
+            StripeDepositProviderService, "handle_webhook_event", _flaky_handle
+        )
+
+        # The provider still gets its 200; the event waits for a retry.
+        self._deliver(
+            test_app, monkeypatch, _checkout_completed("evt_inbox_retry", deposit_id)
+        )
+        row = _inbox_row(db_conn, "evt_inbox_retry")
+        assert row.status == WebhookInboxStatus.PENDING
+        assert row.attempts == 1
+        assert "database went away" in row.last_error
+        assert row.next_attempt_at > datetime.datetime.now()
+
+        with db_conn.get_session() as session:
+            session.query(WebhookInbox).filter_by(event_id="evt_inbox_retry").update(
+                {WebhookInbox.next_attempt_at: datetime.datetime.now()}
+            )
+            session.commit()
+        assert WebhookInboxWorker(_active_config(), db_conn=db_conn).drain() == 1
+        row = _inbox_row(db_conn, "evt_inbox_retry")
+        assert row.status == WebhookInboxStatus.PROCESSED
+        assert row.attempts == 2
+
+        # Application errors are not retried.
+        self._deliver(
+            test_app, monkeypatch, _checkout_completed("evt_inbox_dead", 999999)
+        )
+        row = _inbox_row(db_conn, "evt_inbox_dead")
+        assert row.status == WebhookInboxStatus.DEAD
+        assert row.attempts == 1
+        assert "NotFoundError" in row.last_error
+
+    def test_stripe_object_event_is_stored_as_plain_json(
+        self, test_app: TestClient, token, monkeypatch, db_conn
+    ):
+        deposit_id = self._create_deposit(test_app, token, monkeypatch)
+        event = stripe.StripeObject.construct_from(
+            _checkout_completed("evt_inbox_object", deposit_id), "sk_test"
+        )
+        self._deliver(test_app, monkeypatch, event)
+
+        row = _inbox_row(db_conn, "evt_inbox_object")
+        assert row.status == WebhookInboxStatus.PROCESSED
+        assert row.payload["data"]["object"]["metadata"] == {
+            "deposit_id": str(deposit_id)
+        }
+
+    def test_callbacks_share_one_worker(self):
+        config = _active_config()
+        assert shared_webhook_inbox_worker(config) is shared_webhook_inbox_worker(
+            config
+        )
@@ -0,0 +1,25 @@
+-- Normalized invoice payment options: one row per currency alternative of an
+-- invoice (item_id NULL) or of a multi-recipient invoice item.
+--
+-- The table itself is created by BaseModel.metadata.create_all() on startup,
+-- but invoices issued before it existed need their rows backfilled. Run this
+-- once against any database that already has invoices (e.g. prod); it only
+-- fills invoices that have no option rows yet:
+--
+--   docker compose -f docker-compose.yml -f docker-compose.prod.yml \
+--       exec -T db psql -U postgres -d refinance < docs/invoice_amount_options.sql
+
+-- 1) Simple invoices (amounts stored on the invoice)
+INSERT INTO invoice_amount_options (invoice_id, item_id, currency, amount, rank)
+SELECT i.id, NULL, lower(a.value ->> 'currency'), (a.value ->> 'amount')::numeric, a.ordinality - 1
+FROM invoices i
+CROSS JOIN LATERAL json_array_elements(i.amounts) WITH ORDINALITY AS a(value, ordinality)
+WHERE NOT EXISTS (SELECT 1 FROM invoice_items it WHERE it.invoice_id = i.id)
+  AND NOT EXISTS (SELECT 1 FROM invoice_amount_options o WHERE o.invoice_id = i.id);
+
+-- 2) Multi-recipient invoice items
+INSERT INTO invoice_amount_options (invoice_id, item_id, currency, amount, rank)
+SELECT it.invoice_id, it.id, lower(a.value ->> 'currency'), (a.value ->> 'amount')::numeric, a.ordinality - 1
+FROM invoice_items it
+CROSS JOIN LATERAL json_array_elements(it.amounts) WITH ORDINALITY AS a(value, ordinality)
+WHERE NOT EXISTS (SELECT 1 FROM invoice_amount_options o WHERE o.item_id = it.id);
@@ -0,0 +1,19 @@
+-- Indexed Keepz payment note on deposits, used by the Keepz poller to match
+-- incoming transactions to pending deposits without scanning them all.
+--
+-- create_all() does not add columns to existing tables. Run this once against
+-- any database that already has deposits (e.g. prod) before deploying:
+--
+--   docker compose -f docker-compose.yml -f docker-compose.prod.yml \
+--       exec -T db psql -U postgres -d refinance < docs/keepz_note.sql
+
+ALTER TABLE deposits
+    ADD COLUMN IF NOT EXISTS keepz_note VARCHAR;
+
+UPDATE deposits
+SET keepz_note = details -> 'keepz' ->> 'note'
+WHERE provider = 'keepz'
+  AND keepz_note IS NULL
+  AND details -> 'keepz' ->> 'note' IS NOT NULL;
+
+CREATE INDEX IF NOT EXISTS ix_deposits_keepz_note ON deposits (keepz_note);
@@ -1,9 +1,11 @@
 import re
 from datetime import datetime, timedelta, timezone
 from os import getenv
-from secrets import token_hex
 from urllib.parse import urlencode
 
+from app.assets import asset_url
+from app.config import Config
+from app.controllers.assets import assets_bp
 from app.controllers.auth import auth_bp
 from app.controllers.deposit import deposit_bp
 from app.controllers.donation import donation_bp
@@ -20,6 +22,7 @@ from app.controllers.treasury import treasury_bp
 from app.exceptions.base import ApplicationError
 from app.external.refinance import get_refinance_api_client
 from app.middlewares.auth import token_required
+from app.middlewares.compression import compress_response
 from flask import (
     Flask,
     flash,
@@ -37,7 +40,6 @@ from markupsafe import Markup, escape
 
 app = Flask(__name__)
 app.secret_key = getenv("REFINANCE_UI_SECRET_KEY", "supersecret")
-app.config["CSS_CACHE_BUSTER"] = token_hex(8)
 app.config["PERMANENT_SESSION_LIFETIME"] = timedelta(days=30)
 app.config["SESSION_COOKIE_SAMESITE"] = "Lax"
 CORS(app)
@@ -56,6 +58,7 @@ app.register_blueprint(exchange_bp, url_prefix="/exchange")
 app.register_blueprint(fee_bp, url_prefix="/fee")
 app.register_blueprint(stats_bp, url_prefix="/stats")
 app.register_blueprint(treasury_bp, url_prefix="/treasuries")
+app.register_blueprint(assets_bp, url_prefix="/assets")
 
 
 @app.errorhandler(ApplicationError)
@@ -80,9 +83,17 @@ def handle_foo_exception(error):
     )
 
 
+@app.after_request
+def compress(response):
+    return compress_response(response, minimum_size=Config.COMPRESSION_MINIMUM_SIZE)
+
+
 @app.before_request
 def load_current_user_and_balance():
-    if re.match(r"^/auth|^/donate|^/static|^/style\.css", request.path):
+    if re.match(r"^/auth|^/donate|^/static|^/assets", request.path):
+        return
+    if request.endpoint == "index.index" and "token" in session:
+        # the landing page loads the entity and balances with its dashboard
         return
     if "token" in session:
         api = get_refinance_api_client()
@@ -119,14 +130,6 @@ def hx_entity_name(id):
         return jsonify({}), 404
 
 
-@app.route("/style.css")
-def serve_style():
-    response = render_template(
-        "style.css.jinja2", css_cache_buster=app.config["CSS_CACHE_BUSTER"]
-    )
-    return response, 200, {"Content-Type": "text/css; charset=utf-8"}
-
-
 def update_query_params(**kwargs):
     """
     Merges the current request query parameters with new parameters passed via kwargs.
@@ -222,7 +225,7 @@ def human_readable_date(date_string):
 
 app.jinja_env.globals["update_query_params"] = update_query_params
 app.jinja_env.globals["human_readable_date"] = human_readable_date
-app.jinja_env.globals["css_cache_buster"] = app.config["CSS_CACHE_BUSTER"]
+app.jinja_env.globals["asset_url"] = asset_url
 
 
 def format_billing_period(bp) -> str:
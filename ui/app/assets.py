@@ -0,0 +1,143 @@
+"""Content-hashed static assets.
+
+``python -m app.assets`` copies every file of ``app/static`` to ``dist/`` under
+a name carrying a hash of its content (``style.css`` -> ``style.1a2b3c4d5e6f.css``),
+writes gzip and brotli variants of text files next to them and records the
+names in ``dist/manifest.json``. References between stylesheets are rewritten
+to the hashed names first, so a changed ``base.css`` also renames ``style.css``.
+
+Templates link assets with ``asset_url("style.css")``. Without a build, as in
+development, it falls back to the plain ``/static`` URL.
+"""
+
+import gzip
+import hashlib
+import json
+import posixpath
+import re
+import shutil
+from functools import lru_cache
+from pathlib import Path
+
+import brotli
+from flask import url_for
+
+STATIC_DIR = Path(__file__).parent / "static"
+DIST_DIR = Path(__file__).parent.parent / "dist"
+MANIFEST_NAME = "manifest.json"
+
+# sent with hashed assets: their content never changes under the same name
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+_PRECOMPRESSED_SUFFIXES = {".css", ".js", ".svg", ".json", ".txt", ".html"}
+_CSS_URL = re.compile(r"""url\(\s*(['"]?)([^'")]+)\1\s*\)""")
+
+
+def _hashed_name(path: Path, content: bytes) -> Path:
+    digest = hashlib.sha256(content).hexdigest()[:12]
+    return path.with_name(f"{path.stem}.{digest}{path.suffix}")
+
+
+def _is_local_reference(reference: str) -> bool:
+    return not re.match(r"^([a-z][a-z0-9+.-]*:|//|/|#)", reference, re.I)
+
+
+def build(
+    static_dir: Path = STATIC_DIR,
+    dist_dir: Path = DIST_DIR,
+    minimum_size: int = 1024,
+) -> dict[str, str]:
+    """Fingerprint and precompress *static_dir* into *dist_dir*.
+
+    Returns the manifest, mapping each source path to its hashed path, both
+    relative to their directory. Text files of at least *minimum_size* bytes
+    also get ``.gz`` and ``.br`` variants when those are smaller.
+    """
+    sources = sorted(
+        path.relative_to(static_dir).as_posix()
+        for path in static_dir.rglob("*")
+        if path.is_file()
+    )
+    manifest: dict[str, str] = {}
+    in_progress: set[str] = set()
+
+    def fingerprint(name: str) -> str:
+        if name in manifest:
+            return manifest[name]
+        if name in in_progress:
+            raise ValueError(f"Circular asset reference to {name}")
+        in_progress.add(name)
+        source = Path(name)
+        content = (static_dir / source).read_bytes()
+        if source.suffix == ".css":
+            content = _rewrite_css_urls(content, source, sources, fingerprint)
+        target = _hashed_name(source, content)
+        output = dist_dir / target
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_bytes(content)
+        if source.suffix in _PRECOMPRESSED_SUFFIXES and len(content) >= minimum_size:
+            _write_precompressed(output, content)
+        in_progress.discard(name)
+        manifest[name] = target.as_posix()
+        return manifest[name]
+
+    if dist_dir.exists():
+        shutil.rmtree(dist_dir)
+    dist_dir.mkdir(parents=True)
+    for name in sources:
+        fingerprint(name)
+    (dist_dir / MANIFEST_NAME).write_text(
+        json.dumps(manifest, indent=2, sort_keys=True) + "\n"
+    )
+    return manifest
+
+
+def _rewrite_css_urls(
+    content: bytes, source: Path, sources: list[str], fingerprint
+) -> bytes:
+    def replace(match: re.Match) -> str:
+        quote, reference = match.groups()
+        if not _is_local_reference(reference):
+            return match.group(0)
+        path, rest = re.match(r"([^?#]*)(.*)", reference).groups()
+        name = posixpath.normpath(posixpath.join(source.parent.as_posix(), path))
+        if name not in sources:
+            return match.group(0)
+        hashed = posixpath.relpath(fingerprint(name), source.parent.as_posix())
+        return f"url({quote}{hashed}{rest}{quote})"
+
+    return _CSS_URL.sub(replace, content.decode()).encode()
+
+
+def _write_precompressed(output: Path, content: bytes) -> None:
+    for suffix, compressed in (
+        (".br", brotli.compress(content, quality=11)),
+        (".gz", gzip.compress(content, compresslevel=9, mtime=0)),
+    ):
+        if len(compressed) < len(content):
+            output.with_name(output.name + suffix).write_bytes(compressed)
+
+
+@lru_cache
+def load_manifest() -> dict[str, str]:
+    """The manifest of the last build, or an empty one when there is none."""
+    try:
+        return json.loads((DIST_DIR / MANIFEST_NAME).read_text())
+    except FileNotFoundError:
+        return {}
+
+
+def asset_url(filename: str) -> str:
+    """URL of a static file, content-hashed when the assets were built."""
+    filename = filename.lstrip("/")
+    hashed = load_manifest().get(filename)
+    if hashed is None:
+        return url_for("static", filename=filename)
+    return url_for("assets.serve", filename=hashed)
+
+
+if __name__ == "__main__":
+    from app.config import Config
+
+    built = build(minimum_size=Config.COMPRESSION_MINIMUM_SIZE)
+    print(f"Built {len(built)} assets into {DIST_DIR}")
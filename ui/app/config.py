@@ -12,6 +12,21 @@ def _decimal_env(name: str, default: str) -> Decimal:
 
 class Config:
     REFINANCE_API_BASE_URL = getenv("REFINANCE_API_BASE_URL", "http://api:8000")
+    # keep-alive connections to the API kept per UI process
+    API_POOL_SIZE = int(getenv("REFINANCE_UI_API_POOL_SIZE", "16"))
+    # threads running RefinanceAPI.gather calls, per UI process
+    API_FANOUT_WORKERS = int(getenv("REFINANCE_UI_API_FANOUT_WORKERS", "8"))
+    # pages smaller than this many bytes are sent to browsers uncompressed
+    COMPRESSION_MINIMUM_SIZE = int(
+        getenv("REFINANCE_UI_COMPRESSION_MINIMUM_SIZE", "1024")
+    )
+    # seconds tags, entities and treasuries are reused before being revalidated
+    REFERENCE_CACHE_TTL = float(getenv("REFINANCE_UI_REFERENCE_CACHE_TTL", "30"))
+    REFERENCE_CACHE_SIZE = int(getenv("REFINANCE_UI_REFERENCE_CACHE_SIZE", "512"))
+    # browser event streams are relayed by a worker thread for at most this long
+    EVENTS_MAX_SECONDS = float(getenv("REFINANCE_UI_EVENTS_MAX_SECONDS", "60"))
+    # longest silence on an API event stream before it is given up
+    EVENTS_READ_TIMEOUT = float(getenv("REFINANCE_UI_EVENTS_READ_TIMEOUT", "30"))
     TELEGRAM_BOT_NAME = getenv("REFINANCE_TELEGRAM_BOT_NAME", "")
     DONATION_MIN_AMOUNT = _decimal_env("REFINANCE_DONATION_MIN_AMOUNT", "1")
     DONATION_MAX_AMOUNT = _decimal_env("REFINANCE_DONATION_MAX_AMOUNT", "3000")
@@ -0,0 +1,34 @@
+import mimetypes
+
+from app.assets import DIST_DIR, IMMUTABLE_CACHE_CONTROL
+from app.middlewares.compression import accepted_encoding
+from flask import Blueprint, abort, send_from_directory
+from werkzeug.security import safe_join
+
+assets_bp = Blueprint("assets", __name__, url_prefix="/assets")
+
+_ENCODING_SUFFIXES = {"br": ".br", "gzip": ".gz"}
+
+
+@assets_bp.route("/<path:filename>")
+def serve(filename):
+    """Serve a content-hashed asset, precompressed when the browser allows."""
+    path = safe_join(str(DIST_DIR), filename)
+    if path is None:
+        abort(404)
+
+    encoding = accepted_encoding()
+    suffix = _ENCODING_SUFFIXES.get(encoding, "")
+    if not suffix or not (DIST_DIR / (filename + suffix)).is_file():
+        encoding, suffix = None, ""
+
+    response = send_from_directory(
+        DIST_DIR,
+        filename + suffix,
+        mimetype=mimetypes.guess_type(filename)[0] or "application/octet-stream",
+    )
+    if encoding:
+        response.headers["Content-Encoding"] = encoding
+    response.vary.add("Accept-Encoding")
+    response.headers["Cache-Control"] = IMMUTABLE_CACHE_CONTROL
+    return response
@@ -1,3 +1,5 @@
+from decimal import Decimal
+
 from app.config import Config
 from app.exceptions.base import ApplicationError
 from app.external.refinance import get_refinance_api_client
@@ -12,8 +14,8 @@ from app.schemas import (
     Tag,
     Transaction,
 )
-from app.stats_helpers import fetch_stats_bundle
-from flask import Blueprint, flash, jsonify, redirect, render_template, request, url_for
+from app.stats_helpers import fetch_stats_bundle, stats_events_response
+from flask import Blueprint, flash, redirect, render_template, request, url_for
 from flask_wtf import FlaskForm
 from wtforms import (
     BooleanField,
@@ -118,93 +120,28 @@ def list():
         filters["tags_ids"] = selected_tag_id
     filters["active"] = "false" if show_inactive else "true"
 
-    api = get_refinance_api_client()
     if search_query:
-        normalized_search = search_query.lower()
-        matched_entities: list[Entity] = []
-        scan_limit = 200
-        scan_skip = 0
+        filters["q"] = search_query
 
-        while True:
-            scan_response = api.http(
-                "GET",
-                "entities",
-                params={
-                    "skip": scan_skip,
-                    "limit": scan_limit,
-                    "active": filters["active"],
-                },
-            ).json()
-            scan_items = scan_response.get("items", [])
-            if not scan_items:
-                break
-
-            page_entities = [Entity(**item) for item in scan_items]
-            for entity in page_entities:
-                name_text = (entity.name or "").lower()
-                comment_text = (entity.comment or "").lower()
-                if normalized_search in name_text or normalized_search in comment_text:
-                    matched_entities.append(entity)
-
-            scan_skip += len(scan_items)
-            if scan_skip >= scan_response.get("total", 0):
-                break
-
-        total = len(matched_entities)
-        entities = matched_entities[skip : skip + limit]
-    else:
-        response = api.http(
+    api = get_refinance_api_client()
+    response, tags_response, facets = api.gather(
+        lambda: api.http(
             "GET", "entities", params={"skip": skip, "limit": limit, **filters}
-        ).json()
-        entities = [Entity(**x) for x in response["items"]]
-        total = response["total"]
+        ).json(),
+        lambda: api.http("GET", "tags", params={"skip": 0, "limit": 200}).json(),
+        # Tag tabs count all entities in the current active/inactive view.
+        lambda: api.http(
+            "GET", "entities/facets", params={"active": filters["active"]}
+        ).json(),
+    )
+    entities = [Entity(**x) for x in response["items"]]
+    total = response["total"]
 
-    tags_response = api.http("GET", "tags", params={"skip": 0, "limit": 200}).json()
     all_tags = [Tag(**x) for x in tags_response["items"]]
-
-    all_tag_ids = {tag.id for tag in all_tags}
-
-    def _tag_id(tag: Tag | dict) -> int | None:
-        if isinstance(tag, dict):
-            return tag.get("id")
-        return getattr(tag, "id", None)
-
-    used_tag_ids: set[int] = set()
-    tag_entity_counts: dict[int, int] = {}
-
-    # Avoid per-tag API calls (N+1): walk entities in pages and collect tag usage stats.
-    scan_limit = 200
-    scan_skip = 0
-    while used_tag_ids != all_tag_ids:
-        scan_response = api.http(
-            "GET",
-            "entities",
-            params={
-                "skip": scan_skip,
-                "limit": scan_limit,
-                "active": filters["active"],
-            },
-        ).json()
-        scan_items = scan_response.get("items", [])
-        if not scan_items:
-            break
-
-        for item in scan_items:
-            entity_tag_ids = set()
-            for tag in item.get("tags", []):
-                tag_id = _tag_id(tag)
-                if tag_id is not None:
-                    entity_tag_ids.add(tag_id)
-                    used_tag_ids.add(tag_id)
-            for tag_id in entity_tag_ids:
-                tag_entity_counts[tag_id] = tag_entity_counts.get(tag_id, 0) + 1
-
-        scan_skip += len(scan_items)
-        if scan_skip >= scan_response.get("total", 0):
-            break
+    tag_entity_counts = {int(tag_id): count for tag_id, count in facets["tags"].items()}
 
     tags_with_entities = sorted(
-        (tag for tag in all_tags if tag.id in used_tag_ids),
+        (tag for tag in all_tags if tag.id in tag_entity_counts),
         key=lambda tag: (-tag_entity_counts.get(tag.id, 0), tag.name.lower()),
     )
 
@@ -449,63 +386,93 @@ def detail(id):
             "error",
         )
 
-    entity_data = api.http("GET", f"entities/{id}").json()
-    balance_data = api.http("GET", f"balances/{id}").json()
-    transactions_page = api.http(
-        "GET", "transactions", params={"skip": skip, "limit": limit, "entity_id": id}
-    ).json()
+    # Independent reads run in parallel: the page waits for the slowest one.
+    (
+        entity_data,
+        balance_data,
+        transactions_page,
+        invoices_page,
+        invoices_unpaid_page,
+        authorizations_resp,
+        cached_bundle,
+    ) = api.gather(
+        lambda: api.http("GET", f"entities/{id}").json(),
+        lambda: api.http("GET", f"balances/{id}").json(),
+        lambda: api.http(
+            "GET",
+            "transactions",
+            params={"skip": skip, "limit": limit, "entity_id": id},
+        ).json(),
+        lambda: api.http(
+            "GET",
+            "invoices",
+            params={
+                "skip": invoice_skip,
+                "limit": invoice_limit,
+                "from_entity_id": id,
+            },
+        ).json(),
+        lambda: api.http(
+            "GET",
+            "invoices",
+            params={"from_entity_id": id, "status": "pending", "skip": 0, "limit": 1},
+        ).json(),
+        lambda: (
+            api.http(
+                "GET",
+                "deposits/providers/stripe/authorizations",
+                params={"entity_id": id},
+            ).json()
+            if Config.STRIPE_CONFIGURED
+            else {}
+        ),
+        # Always try to preload from cache (fast on hit, no DB work on miss).
+        lambda: fetch_stats_bundle(
+            api,
+            "entity",
+            id,
+            months=stats_months,
+            limit=stats_limit,
+            cached_only=True,
+        ),
+    )
     total = transactions_page["total"]
 
-    invoices_page = api.http(
-        "GET",
-        "invoices",
-        params={
-            "skip": invoice_skip,
-            "limit": invoice_limit,
-            "from_entity_id": id,
-        },
-    ).json()
     invoices_total = invoices_page["total"]
     invoices = [Invoice(**item) for item in invoices_page["items"]]
     for invoice in invoices:
         invoice.display_amounts = invoice_display_amounts(invoice)
 
-    invoices_unpaid_count = (
-        api.http(
-            "GET",
-            "invoices",
-            params={"from_entity_id": id, "status": "pending", "skip": 0, "limit": 1},
-        )
-        .json()
-        .get("total", 0)
-    )
+    invoices_unpaid_count = invoices_unpaid_page.get("total", 0)
 
-    if Config.STRIPE_CONFIGURED:
-        authorizations_resp = api.http(
-            "GET",
-            "deposits/providers/stripe/authorizations",
-            params={"entity_id": id},
-        ).json()
-        stripe_authorizations = [
-            StripeAuthorization(**item) for item in authorizations_resp.get("items", [])
-        ]
-    else:
-        stripe_authorizations = []
+    stripe_authorizations = [
+        StripeAuthorization(**item) for item in authorizations_resp.get("items", [])
+    ]
 
     # For paid invoices, prefer the settled transaction amount/currency in compact UI.
+    paid_invoices = []
     for invoice in invoices[:6]:
         status = (
             invoice.status.value
             if isinstance(invoice.status, InvoiceStatus)
             else str(invoice.status).lower()
         )
-        if status != InvoiceStatus.PAID.value or not invoice.transaction_id:
-            continue
-
-        tx_data = api.http("GET", f"transactions/{invoice.transaction_id}").json()
-        tx = Transaction(**tx_data)
-        invoice.paid_amount = tx.amount
-        invoice.paid_currency = tx.currency.upper()
+        if status == InvoiceStatus.PAID.value and invoice.transaction_id:
+            paid_invoices.append(invoice)
+
+    paid_transactions = {
+        tx["id"]: tx
+        for tx in api.get_many(
+            "transactions",
+            [invoice.transaction_id for invoice in paid_invoices],
+            fields="amount,currency",
+        )
+    }
+    for invoice in paid_invoices:
+        tx = paid_transactions.get(invoice.transaction_id)
+        if tx is not None:
+            invoice.paid_amount = Decimal(tx["amount"])
+            invoice.paid_currency = tx["currency"].upper()
 
     def _apply_stats_bundle(bundle: dict):
         if not bundle or bundle.get("cached") is False:
@@ -538,16 +505,6 @@ def detail(id):
     incoming_by_tag_by_month = []
     outgoing_by_tag_by_month = []
 
-    # Always try to preload from cache (fast on hit, no DB work on miss).
-    cached_bundle = fetch_stats_bundle(
-        api,
-        "entity",
-        id,
-        months=stats_months,
-        limit=stats_limit,
-        cached_only=True,
-    )
-
     (
         stats_loaded,
         balance_changes,
@@ -595,19 +552,20 @@ def detail(id):
     )
 
 
-@entity_bp.route("/<int:id>/stats")
+@entity_bp.route("/<int:id>/events")
 @token_required
-def stats(id):
-    """Calculate entity statistics without delaying the entity page response."""
+def events(id):
+    """Tell the entity page when its statistics are ready, as Server-Sent Events."""
 
     stats_months = request.args.get("stats_months", 6, type=int)
     stats_limit = request.args.get("stats_limit", 6, type=int)
     stats_months = max(1, stats_months)
     stats_limit = max(1, stats_limit)
 
-    api = get_refinance_api_client()
-    stats_bundle = fetch_stats_bundle(
-        api, "entity", id, months=stats_months, limit=stats_limit
+    return stats_events_response(
+        get_refinance_api_client(),
+        "entity",
+        id,
+        months=stats_months,
+        limit=stats_limit,
     )
-
-    return jsonify({"loaded": stats_bundle.get("cached", True)})
@@ -2,42 +2,47 @@ from collections import defaultdict
 from decimal import Decimal
 
 from app.config import Config
+from app.exceptions.base import ApplicationError
 from app.external.refinance import get_refinance_api_client
 from app.invoice_amounts import invoice_display_amounts
 from app.middlewares.auth import token_required
 from app.schemas import Invoice, StripeAuthorization
-from flask import Blueprint, g, render_template
+from flask import Blueprint, g, redirect, render_template, session, url_for
 
 index_bp = Blueprint("index", __name__)
 
+# API error codes of a missing or invalid X-Token
+_TOKEN_ERROR_CODES = {3001, 3002}
+
+
+def _token_rejected(error: ApplicationError) -> bool:
+    detail = error.args[0] if error.args else None
+    if not isinstance(detail, dict):
+        return False
+    return (
+        detail.get("error_code") in _TOKEN_ERROR_CODES
+        or detail.get("status_code") == 401
+    )
+
 
 @index_bp.route("/")
 @token_required
 def index():
     api = get_refinance_api_client()
-    actor_entity_id = g.actor_entity["id"]
-
-    unpaid_response = api.http(
-        "GET",
-        "invoices",
-        params={
-            "status": "pending",
-            "from_entity_id": actor_entity_id,
-            "skip": 0,
-            "limit": 500,
-        },
-    ).json()
-
-    unpaid_invoices = unpaid_response.get("items", [])
+    try:
+        dashboard = api.http("GET", "dashboard/me").json()
+    except ApplicationError as e:
+        # other failures go to the error page; logging out would not fix them
+        if not _token_rejected(e):
+            raise
+        session.pop("token", None)
+        return redirect(url_for("auth.login"))
+    # the dashboard replaces the lookups load_current_user_and_balance skips here
+    g.actor_entity = dashboard["entity"]
+    g.actor_entity_balance = dashboard["balances"]
 
-    recent_invoices_resp = api.http(
-        "GET",
-        "invoices",
-        params={"from_entity_id": actor_entity_id, "skip": 0, "limit": 6},
-    ).json()
-    recent_invoices = [
-        Invoice(**item) for item in recent_invoices_resp.get("items", [])
-    ]
+    unpaid_invoices = dashboard["pending_invoices"]["items"]
+    recent_invoices = [Invoice(**item) for item in dashboard["recent_invoices"]]
     for invoice in recent_invoices:
         invoice.display_amounts = invoice_display_amounts(invoice)
 
@@ -66,18 +71,9 @@ def index():
         if total > 0
     ]
 
-    # Fetch stripe authorizations to check if user has a card linked
-    try:
-        auth_resp = api.http(
-            "GET",
-            "deposits/providers/stripe/authorizations",
-            params={"entity_id": actor_entity_id},
-        ).json()
-        stripe_authorizations = [
-            StripeAuthorization(**item) for item in auth_resp.get("items", [])
-        ]
-    except Exception:
-        stripe_authorizations = []
+    stripe_authorizations = [
+        StripeAuthorization(**item) for item in dashboard["stripe_authorizations"]
+    ]
 
     active_stripe_card = next(
         (a for a in stripe_authorizations if a.active and a.mode == "entity_dynamic"),
@@ -86,11 +82,12 @@ def index():
 
     return render_template(
         "index.jinja2",
-        unpaid_fee_count=len(unpaid_invoices),
+        unpaid_fee_count=dashboard["pending_invoices"]["total"],
         unpaid_fee_summary=unpaid_fee_summary,
         unpaid_invoice_cards=unpaid_invoice_cards,
         recent_invoices=recent_invoices,
         active_stripe_card=active_stripe_card,
+        recommended_deposit=dashboard["recommended_deposit"],
         stripe_configured=Config.STRIPE_CONFIGURED,
         currency_choices=Config.CURRENCY_CHOICES,
         preferred_currency=Config.PREFERRED_CURRENCY,
@@ -370,18 +370,27 @@ def add_multi():
 def detail(id):
     api = get_refinance_api_client()
     invoice = Invoice(**api.http("GET", f"invoices/{id}").json())
-    transaction = None
-    if invoice.transaction_id:
-        transaction = Transaction(
-            **api.http("GET", f"transactions/{invoice.transaction_id}").json()
+    # The invoice's own transaction and the per-item ones, in one request
+    transactions_by_id = {
+        tx["id"]: Transaction(**tx)
+        for tx in api.get_many(
+            "transactions",
+            [
+                tx_id
+                for tx_id in [
+                    invoice.transaction_id,
+                    *(item.transaction_id for item in invoice.items),
+                ]
+                if tx_id
+            ],
         )
-    # Fetch per-item transactions for multi-item invoices
-    item_transactions: dict[int, Transaction] = {}
-    for item in invoice.items:
-        if item.transaction_id:
-            item_transactions[item.id] = Transaction(
-                **api.http("GET", f"transactions/{item.transaction_id}").json()
-            )
+    }
+    transaction = transactions_by_id.get(invoice.transaction_id)
+    item_transactions: dict[int, Transaction] = {
+        item.id: transactions_by_id[item.transaction_id]
+        for item in invoice.items
+        if item.transaction_id in transactions_by_id
+    }
 
     item_entity_choices: dict[int, list[tuple[int, str]]] = {}
     form = None
@@ -702,8 +711,7 @@ def bulk_add():
                 all_created += result.get("created_count", 0)
                 all_skipped += result.get("skipped_count", 0)
             invoices = [
-                Invoice(**api.http("GET", f"invoices/{iid}").json())
-                for iid in all_invoice_ids
+                Invoice(**item) for item in api.get_many("invoices", all_invoice_ids)
             ]
             return render_template(
                 "invoice/bulk_add_result.jinja2",
@@ -731,8 +739,7 @@ def bulk_add():
             result = api.http("POST", "invoices/bulk", data=data).json()
             invoice_ids = result.get("invoice_ids", [])
             invoices = [
-                Invoice(**api.http("GET", f"invoices/{iid}").json())
-                for iid in invoice_ids
+                Invoice(**item) for item in api.get_many("invoices", invoice_ids)
             ]
             return render_template(
                 "invoice/bulk_add_result.jinja2",
@@ -778,9 +785,7 @@ def bulk_add_manual():
         }
         result = api.http("POST", "invoices/bulk", data=data).json()
         invoice_ids = result.get("invoice_ids", [])
-        invoices = [
-            Invoice(**api.http("GET", f"invoices/{iid}").json()) for iid in invoice_ids
-        ]
+        invoices = [Invoice(**item) for item in api.get_many("invoices", invoice_ids)]
         return render_template(
             "invoice/bulk_add_result.jinja2",
             result=result,
@@ -1,8 +1,8 @@
 from app.external.refinance import get_refinance_api_client
 from app.middlewares.auth import token_required
 from app.schemas import Transaction, Treasury
-from app.stats_helpers import fetch_stats_bundle
-from flask import Blueprint, jsonify, redirect, render_template, request, url_for
+from app.stats_helpers import fetch_stats_bundle, stats_events_response
+from flask import Blueprint, redirect, render_template, request, url_for
 from flask_wtf import FlaskForm
 from wtforms import BooleanField, StringField, SubmitField
 from wtforms.validators import DataRequired
@@ -105,15 +105,14 @@ def detail(id):
     )
 
 
-@treasury_bp.route("/<int:id>/stats")
+@treasury_bp.route("/<int:id>/events")
 @token_required
-def stats(id):
-    """Calculate treasury statistics without delaying the detail page response."""
+def events(id):
+    """Tell the treasury page when its statistics are ready, as Server-Sent Events."""
     stats_months = max(1, request.args.get("stats_months", 6, type=int))
-    stats_bundle = fetch_stats_bundle(
+    return stats_events_response(
         get_refinance_api_client(), "treasury", id, months=stats_months
     )
-    return jsonify({"loaded": stats_bundle.get("cached", True)})
 
 
 @treasury_bp.route("/<int:id>/edit", methods=["GET", "POST"])
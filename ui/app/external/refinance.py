@@ -1,12 +1,114 @@
 import logging
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Callable, TypeVar
 
 import requests
 from app.config import Config
 from app.exceptions.base import ApplicationError
 from flask import session
+from requests.adapters import HTTPAdapter
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+
+@lru_cache
+def _pooled_session() -> requests.Session:
+    """Keep-alive session shared by every request handled by this process."""
+    pooled = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=Config.API_POOL_SIZE)
+    pooled.mount("http://", adapter)
+    pooled.mount("https://", adapter)
+    return pooled
+
+
+@lru_cache
+def _fanout_executor() -> ThreadPoolExecutor:
+    return ThreadPoolExecutor(
+        max_workers=Config.API_FANOUT_WORKERS, thread_name_prefix="ui-api"
+    )
+
+
+# reference resources cached by the UI, each with the resources whose writes
+# make it stale; None stands for any write, as treasuries carry balances
+_REFERENCE_RESOURCES: dict[str, frozenset[str] | None] = {
+    "tags": frozenset({"tags"}),
+    "entities": frozenset({"entities", "tags"}),
+    "treasuries": None,
+}
+_REFERENCE_ENDPOINT = re.compile(r"^(tags|entities|treasuries)(/\d+)?$")
+
+# endpoint, token and params: responses may depend on who asks
+_CacheKey = tuple[str, str, tuple[tuple[str, str], ...]]
+
+
+class _ReferenceCache:
+    """Responses of reference endpoints shared by the threads of a UI process.
+
+    Entries are served as is for ``ttl`` seconds and then revalidated with
+    their ETag. Writes made through the UI drop the entries they make stale.
+    """
+
+    def __init__(self, ttl: float, maxsize: int) -> None:
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._entries: OrderedDict[_CacheKey, tuple[float, requests.Response]] = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+
+    def get(self, key: _CacheKey) -> tuple[bool, requests.Response | None]:
+        """The cached response of *key* and whether it is still fresh."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False, None
+            self._entries.move_to_end(key)
+        fetched_at, response = entry
+        return time.monotonic() - fetched_at < self.ttl, response
+
+    def put(self, key: _CacheKey, response: requests.Response) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic(), response)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, written: str) -> None:
+        stale = {
+            resource
+            for resource, sources in _REFERENCE_RESOURCES.items()
+            if sources is None or written in sources
+        }
+        with self._lock:
+            for key in [key for key in self._entries if key[0].split("/")[0] in stale]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+@lru_cache
+def _reference_cache() -> _ReferenceCache:
+    return _ReferenceCache(Config.REFERENCE_CACHE_TTL, Config.REFERENCE_CACHE_SIZE)
+
+
+def _reference_key(
+    method: str, endpoint: str, params: dict, token: str | None
+) -> _CacheKey | None:
+    if method != "GET" or not token or Config.REFERENCE_CACHE_TTL <= 0:
+        return None
+    if not _REFERENCE_ENDPOINT.match(endpoint):
+        return None
+    return endpoint, token, tuple(sorted((str(k), str(v)) for k, v in params.items()))
+
 
 class RefinanceAPI:
     token: str | None = None
@@ -31,6 +133,16 @@ class RefinanceAPI:
         # Clean data by removing csrf_token and submit keys recursively
         data = data.copy()
         RefinanceAPI._clean_nested_dicts(data)
+        cache_key = _reference_key(method, endpoint, params, self.token)
+        cached = None
+        headers = {"X-Token": self.token} if self.token else {}
+        if cache_key is not None:
+            fresh, cached = _reference_cache().get(cache_key)
+            if fresh:
+                logger.info("UI<-cache %s %s params=%s", method, endpoint, params)
+                return cached
+            if cached is not None and cached.headers.get("ETag"):
+                headers["If-None-Match"] = cached.headers["ETag"]
         try:
             logger.info(
                 "UI->API %s %s params=%s data=%s token_present=%s",
@@ -46,7 +158,7 @@ class RefinanceAPI:
                 params=params,
                 json=data,
                 timeout=5,
-                headers={"X-Token": self.token} if self.token else {},
+                headers=headers,
             )
             logger.info(
                 "UI<-API %s %s status=%s body=%s",
@@ -55,19 +167,90 @@ class RefinanceAPI:
                 r.status_code,
                 r.text,
             )
+            if method != "GET":
+                _reference_cache().invalidate(endpoint.split("/")[0])
+            if r.status_code == 304 and cached is not None:
+                _reference_cache().put(cache_key, cached)
+                return cached
             if r.status_code != 200:
                 try:
                     e = r.json()
                 except Exception:
                     e = {"error": r.text, "status_code": r.status_code}
                 raise ApplicationError(e)
+            if cache_key is not None:
+                _reference_cache().put(cache_key, r)
             return r
         except requests.exceptions.RequestException as e:
             raise ApplicationError(f"Request to API failed: {e}")
 
+    def stream(self, endpoint: str, params: dict = {}) -> requests.Response:
+        """Open a streamed GET, e.g. an ``/events`` stream; the caller closes it.
+
+        The read timeout only bounds the gap between chunks, which the API's
+        keep-alive comments fill on idle streams.
+        """
+        try:
+            logger.info("UI->API STREAM %s params=%s", endpoint, params)
+            r = self._session.get(
+                f"{self.url}/{endpoint}",
+                params=params,
+                stream=True,
+                timeout=(5, Config.EVENTS_READ_TIMEOUT),
+                headers={"X-Token": self.token} if self.token else {},
+            )
+        except requests.exceptions.RequestException as e:
+            raise ApplicationError(f"Request to API failed: {e}")
+        if r.status_code != 200:
+            try:
+                e = r.json()
+            except Exception:
+                e = {"error": r.text, "status_code": r.status_code}
+            finally:
+                r.close()
+            raise ApplicationError(e)
+        return r
+
+    def get_many(self, endpoint: str, ids: list[int], **params) -> list[dict]:
+        """Fetch objects by id in one request, in the order of *ids*.
+
+        Unknown ids are left out of the result. Extra *params*, such as
+        ``fields``/``expand``, are passed to the list endpoint.
+        """
+        if not ids:
+            return []
+        ids = list(dict.fromkeys(ids))
+        return self.http(
+            "GET",
+            endpoint,
+            params={
+                "ids": ",".join(map(str, ids)),
+                "skip": 0,
+                "limit": len(ids),
+                **params,
+            },
+        ).json()["items"]
+
+    def gather(self, *calls: Callable[[], T]) -> list[T]:
+        """Run independent API calls in parallel and return their results in order.
+
+        Each call is a zero-argument callable, typically a lambda around
+        ``http``. All calls run to completion; the first failure (in argument
+        order) is then re-raised. Calls must not gather themselves: they share
+        one worker pool.
+        """
+        if len(calls) <= 1:
+            return [call() for call in calls]
+        futures = [_fanout_executor().submit(call) for call in calls]
+        errors = [future.exception() for future in futures]
+        for error in errors:
+            if error is not None:
+                raise error
+        return [future.result() for future in futures]
+
     def __init__(self, token: str | None) -> None:
         self.token = token
-        self._session = requests.Session()
+        self._session = _pooled_session()
 
 
 def get_refinance_api_client() -> RefinanceAPI:
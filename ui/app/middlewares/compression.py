@@ -0,0 +1,51 @@
+import gzip
+
+import brotli
+from flask import Response, request
+
+_COMPRESSIBLE_TYPES = ("text/", "application/json", "application/javascript")
+
+
+def accepted_encoding() -> str | None:
+    accepted = request.accept_encodings
+    for encoding in ("br", "gzip"):
+        if accepted[encoding] > 0:
+            return encoding
+    return None
+
+
+def compress_response(
+    response: Response,
+    minimum_size: int = 1024,
+    gzip_level: int = 6,
+    brotli_quality: int = 5,
+) -> Response:
+    """``after_request`` hook compressing pages sent to the browser.
+
+    Brotli is used when the browser accepts it, gzip otherwise; streamed and
+    small responses are sent as is.
+    """
+    if (
+        response.direct_passthrough
+        or response.is_streamed
+        or response.status_code < 200
+        or response.status_code in (204, 304)
+        or "Content-Encoding" in response.headers
+        or not (response.mimetype or "").startswith(_COMPRESSIBLE_TYPES)
+    ):
+        return response
+    encoding = accepted_encoding()
+    if encoding is None:
+        return response
+    body = response.get_data()
+    if len(body) < minimum_size:
+        return response
+
+    if encoding == "br":
+        body = brotli.compress(body, quality=brotli_quality)
+    else:
+        body = gzip.compress(body, compresslevel=gzip_level)
+    response.set_data(body)
+    response.headers["Content-Encoding"] = encoding
+    response.vary.add("Accept-Encoding")
+    return response
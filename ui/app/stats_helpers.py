@@ -1,4 +1,10 @@
 from datetime import date
+from typing import Iterator
+
+from app.config import Config
+from flask import Response
+
+STATS_READY_EVENT = "event: stats_ready\ndata: {}\n\n"
 
 
 def fetch_stats_bundle(
@@ -20,3 +26,58 @@ def fetch_stats_bundle(
     if cached_only:
         params["cached_only"] = 1
     return api.http("GET", f"stats/{subject_type}/{subject_id}", params=params).json()
+
+
+def stats_events_response(
+    api,
+    subject_type: str,
+    subject_id: int,
+    *,
+    months: int,
+    limit: int | None = None,
+) -> Response:
+    """``text/event-stream`` telling the browser when a stats bundle is ready.
+
+    The API stream is opened before the ``cached_only`` probe that starts the
+    computation, so its ``stats_ready`` event cannot be missed. Each stream
+    holds a worker thread, hence it ends after ``stats_ready`` or after
+    ``EVENTS_MAX_SECONDS``; ``EventSource`` reconnects on its own.
+    """
+    upstream = api.stream(
+        f"events/{subject_type}/{subject_id}",
+        params={"timeout": Config.EVENTS_MAX_SECONDS},
+    )
+    try:
+        bundle = fetch_stats_bundle(
+            api, subject_type, subject_id, months=months, limit=limit, cached_only=True
+        )
+    except Exception:
+        upstream.close()
+        raise
+    if bundle.get("cached") is not False:
+        upstream.close()
+        body: str | Iterator[str] = STATS_READY_EVENT
+    else:
+        body = _relay_until_stats_ready(upstream)
+    return Response(
+        body,
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+def _relay_until_stats_ready(upstream) -> Iterator[str]:
+    try:
+        block: list[str] = []
+        for line in upstream.iter_lines(decode_unicode=True):
+            if line:
+                block.append(line)
+                continue
+            if not block:
+                continue
+            yield "\n".join(block) + "\n\n"
+            if "event: stats_ready" in block:
+                return
+            block = []
+    finally:
+        upstream.close()
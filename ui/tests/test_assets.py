@@ -0,0 +1,72 @@
+import brotli
+import pytest
+from app import assets
+from app.controllers.assets import assets_bp
+from flask import Flask
+
+
+@pytest.fixture
+def static_dir(tmp_path):
+    static = tmp_path / "static"
+    (static / "js").mkdir(parents=True)
+    (static / "base.css").write_text("body { color: black; }\n" * 100)
+    (static / "style.css").write_text("@import url('base.css');\n")
+    (static / "js" / "menu.js").write_text("console.log('menu');\n")
+    return static
+
+
+def test_build_fingerprints_rewrites_and_precompresses(static_dir, tmp_path):
+    dist = tmp_path / "dist"
+    manifest = assets.build(static_dir, dist, minimum_size=1024)
+
+    assert set(manifest) == {"base.css", "style.css", "js/menu.js"}
+    assert manifest["js/menu.js"].startswith("js/menu.")
+    # the bundle points at the hashed stylesheet it imports
+    bundle = (dist / manifest["style.css"]).read_text()
+    assert bundle == f"@import url('{manifest['base.css']}');\n"
+    base = dist / manifest["base.css"]
+    assert brotli.decompress((dist / (manifest["base.css"] + ".br")).read_bytes()) == (
+        base.read_bytes()
+    )
+    assert (dist / (manifest["base.css"] + ".gz")).is_file()
+    # small files are not worth compressing
+    assert not (dist / (manifest["js/menu.js"] + ".br")).exists()
+
+    (static_dir / "base.css").write_text("body { color: red; }\n")
+    rebuilt = assets.build(static_dir, dist)
+    assert rebuilt["base.css"] != manifest["base.css"]
+    assert rebuilt["style.css"] != manifest["style.css"]
+    assert rebuilt["js/menu.js"] == manifest["js/menu.js"]
+
+
+def test_hashed_assets_are_served_immutable_and_precompressed(
+    static_dir, tmp_path, monkeypatch
+):
+    dist = tmp_path / "dist"
+    manifest = assets.build(static_dir, dist)
+    monkeypatch.setattr(assets, "DIST_DIR", dist)
+    monkeypatch.setattr("app.controllers.assets.DIST_DIR", dist)
+    assets.load_manifest.cache_clear()
+    app = Flask(__name__)
+    app.register_blueprint(assets_bp)
+    client = app.test_client()
+
+    with app.test_request_context():
+        url = assets.asset_url("base.css")
+        assert url == f"/assets/{manifest['base.css']}"
+        assert assets.asset_url("missing.css") == "/static/missing.css"
+    assets.load_manifest.cache_clear()
+
+    response = client.get(url, headers={"Accept-Encoding": "gzip, br"})
+    assert response.status_code == 200
+    assert response.headers["Content-Encoding"] == "br"
+    assert response.mimetype == "text/css"
+    assert response.headers["Cache-Control"] == "public, max-age=31536000, immutable"
+    assert (
+        brotli.decompress(response.data) == (dist / manifest["base.css"]).read_bytes()
+    )
+
+    response = client.get(url)
+    assert "Content-Encoding" not in response.headers
+    assert response.data == (dist / manifest["base.css"]).read_bytes()
+    assert client.get("/assets/../secret").status_code == 404
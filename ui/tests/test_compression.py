@@ -0,0 +1,45 @@
+import gzip
+
+import brotli
+import pytest
+from app.middlewares.compression import compress_response
+from flask import Flask
+
+
+@pytest.fixture
+def client():
+    app = Flask(__name__)
+    app.after_request(compress_response)
+
+    @app.route("/page")
+    def page():
+        return "<p>row</p>" * 500
+
+    @app.route("/small")
+    def small():
+        return "<p>row</p>"
+
+    return app.test_client()
+
+
+def test_pages_are_compressed_with_the_preferred_encoding(client):
+    response = client.get("/page", headers={"Accept-Encoding": "gzip, br"})
+    assert response.headers["Content-Encoding"] == "br"
+    assert brotli.decompress(response.data) == b"<p>row</p>" * 500
+    assert int(response.headers["Content-Length"]) == len(response.data)
+    assert "Accept-Encoding" in response.headers["Vary"]
+
+    response = client.get("/page", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert gzip.decompress(response.data) == b"<p>row</p>" * 500
+
+
+def test_small_or_unaccepted_responses_are_left_alone(client):
+    assert (
+        "Content-Encoding"
+        not in client.get("/small", headers={"Accept-Encoding": "br"}).headers
+    )
+    assert (
+        "Content-Encoding"
+        not in client.get("/page", headers={"Accept-Encoding": "identity"}).headers
+    )
@@ -0,0 +1,43 @@
+import pytest
+from app.app import app
+from app.exceptions.base import ApplicationError
+from app.external.refinance import RefinanceAPI
+
+
+@pytest.fixture
+def client():
+    app.config.update(TESTING=True, SECRET_KEY="test")
+    with app.test_client() as client:
+        with client.session_transaction() as session:
+            session["token"] = "token"
+        yield client
+
+
+def _dashboard_fails(monkeypatch, detail):
+    def _http(self, method, endpoint, params={}, data={}):
+        raise ApplicationError(detail)
+
+    monkeypatch.setattr(RefinanceAPI, "http", _http)
+
+
+def test_rejected_token_logs_out(client, monkeypatch):
+    _dashboard_fails(monkeypatch, {"error_code": 3001, "error": "Token is invalid"})
+
+    response = client.get("/")
+
+    assert response.status_code == 302
+    assert "/auth/login" in response.headers["Location"]
+    with client.session_transaction() as session:
+        assert "token" not in session
+
+
+def test_other_dashboard_errors_keep_the_session(client, monkeypatch):
+    _dashboard_fails(
+        monkeypatch, {"error": "Internal Server Error", "status_code": 500}
+    )
+
+    response = client.get("/")
+
+    assert response.status_code != 302
+    with client.session_transaction() as session:
+        assert session["token"] == "token"
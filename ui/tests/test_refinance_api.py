@@ -0,0 +1,166 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from app.exceptions.base import ApplicationError
+from app.external.refinance import RefinanceAPI, _reference_cache
+
+
+class _SlowHandler(BaseHTTPRequestHandler):
+    delay = 0.2
+
+    def do_GET(self):
+        time.sleep(self.delay)
+        status = 404 if self.path.startswith("/missing") else 200
+        body = b'{"path": "%s", "items": []}' % self.path.encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def api():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _SlowHandler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    client = RefinanceAPI("token")
+    client.url = f"http://127.0.0.1:{httpd.server_address[1]}"
+    yield client
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_gather_runs_calls_in_parallel_and_keeps_order(api):
+    started = time.perf_counter()
+    results = api.gather(
+        *(lambda n=n: api.http("GET", f"items/{n}").json() for n in range(4))
+    )
+    elapsed = time.perf_counter() - started
+
+    assert [r["path"] for r in results] == [f"/items/{n}" for n in range(4)]
+    # Four 0.2s calls take about as long as the slowest one, not their sum.
+    assert elapsed < 0.6
+    assert api.gather() == []
+
+
+def test_gather_reraises_first_failure(api):
+    with pytest.raises(ApplicationError):
+        api.gather(
+            lambda: api.http("GET", "items/1"),
+            lambda: api.http("GET", "missing"),
+        )
+
+
+def test_clients_share_one_pooled_session():
+    assert RefinanceAPI("a")._session is RefinanceAPI(None)._session
+
+
+def test_get_many_fetches_all_ids_in_one_request(api, monkeypatch):
+    sent = []
+    http = api.http
+    monkeypatch.setattr(
+        api,
+        "http",
+        lambda *args, **kwargs: sent.append(kwargs) or http(*args, **kwargs),
+    )
+
+    assert api.get_many("transactions", []) == []
+    assert sent == []
+    assert api.get_many("transactions", [3, 1, 3]) == []
+    assert sent == [{"params": {"ids": "3,1", "skip": 0, "limit": 2}}]
+
+
+class _ReferenceHandler(BaseHTTPRequestHandler):
+    requests: list[tuple[str, str, str | None]] = []
+
+    def _respond(self, status, body=b""):
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("ETag", '"v1"')
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        etag = self.headers.get("If-None-Match")
+        self.requests.append(("GET", self.path, etag))
+        if etag == '"v1"':
+            self._respond(304)
+        else:
+            self._respond(200, b'{"items": [{"id": 1}]}')
+
+    def do_POST(self):
+        self.requests.append(("POST", self.path, None))
+        self._respond(200, b"{}")
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def reference_api():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _ReferenceHandler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    _ReferenceHandler.requests = []
+    _reference_cache().clear()
+    client = RefinanceAPI("token")
+    client.url = f"http://127.0.0.1:{httpd.server_address[1]}"
+    yield client
+    _reference_cache().clear()
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_reference_data_is_cached_until_a_write(reference_api):
+    for _ in range(3):
+        assert reference_api.http("GET", "tags").json() == {"items": [{"id": 1}]}
+    reference_api.http("GET", "transactions")
+    reference_api.http("GET", "transactions")
+    assert [r[1] for r in _ReferenceHandler.requests] == [
+        "/tags",
+        "/transactions",
+        "/transactions",
+    ]
+
+    # a write to another resource keeps tags, a write to tags drops them
+    reference_api.http("POST", "splits", data={})
+    reference_api.http("GET", "tags")
+    reference_api.http("POST", "tags", data={"name": "new"})
+    reference_api.http("GET", "tags")
+    assert [r[:2] for r in _ReferenceHandler.requests[3:]] == [
+        ("POST", "/splits"),
+        ("POST", "/tags"),
+        ("GET", "/tags"),
+    ]
+
+
+def test_reference_data_is_cached_per_token(reference_api):
+    other = RefinanceAPI("other-token")
+    other.url = reference_api.url
+    anonymous = RefinanceAPI(None)
+    anonymous.url = reference_api.url
+
+    for client in (reference_api, other, anonymous, reference_api, other, anonymous):
+        client.http("GET", "entities/1")
+
+    assert [r[1] for r in _ReferenceHandler.requests] == ["/entities/1"] * 4
+
+
+def test_expired_reference_data_is_revalidated(reference_api, monkeypatch):
+    reference_api.http("GET", "treasuries", params={"limit": 5})
+    monkeypatch.setattr(_reference_cache(), "ttl", 0)
+
+    response = reference_api.http("GET", "treasuries", params={"limit": 5})
+
+    assert response.json() == {"items": [{"id": 1}]}
+    assert _ReferenceHandler.requests == [
+        ("GET", "/treasuries?limit=5", None),
+        ("GET", "/treasuries?limit=5", '"v1"'),
+    ]
@@ -0,0 +1,77 @@
+from app.stats_helpers import stats_events_response
+from flask import Flask
+
+
+class _Upstream:
+    def __init__(self, lines):
+        self.lines = lines
+        self.closed = False
+
+    def iter_lines(self, decode_unicode=False):
+        yield from self.lines
+
+    def close(self):
+        self.closed = True
+
+
+class _API:
+    def __init__(self, upstream, bundle):
+        self.upstream = upstream
+        self.bundle = bundle
+        self.calls = []
+
+    def stream(self, endpoint, params={}):
+        self.calls.append(("stream", endpoint))
+        return self.upstream
+
+    def http(self, method, endpoint, params={}, data={}):
+        self.calls.append(("http", endpoint))
+        bundle = self.bundle
+        return type("R", (), {"json": lambda self: bundle})()
+
+
+def _body(response):
+    with Flask(__name__).test_request_context():
+        return "".join(
+            chunk.decode() if isinstance(chunk, bytes) else chunk
+            for chunk in response.response
+        )
+
+
+def test_events_are_relayed_until_stats_ready():
+    upstream = _Upstream(
+        [
+            "retry: 3000",
+            "",
+            ": keep-alive",
+            "",
+            "event: balance_changed",
+            'data: {"subject": "entity:5"}',
+            "",
+            "event: stats_ready",
+            'data: {"subject": "entity:5"}',
+            "",
+            "event: balance_changed",
+            'data: {"subject": "entity:5"}',
+            "",
+        ]
+    )
+    api = _API(upstream, {"cached": False})
+    response = stats_events_response(api, "entity", 5, months=6)
+
+    # the stream is open before the probe that starts the computation
+    assert api.calls == [("stream", "events/entity/5"), ("http", "stats/entity/5")]
+    assert response.mimetype == "text/event-stream"
+    body = _body(response)
+    assert body.count("event: ") == 2
+    assert body.endswith('event: stats_ready\ndata: {"subject": "entity:5"}\n\n')
+    assert upstream.closed
+
+
+def test_cached_bundle_is_ready_at_once():
+    upstream = _Upstream([])
+    response = stats_events_response(
+        _API(upstream, {"cached": True}), "treasury", 2, months=3
+    )
+    assert upstream.closed
+    assert _body(response) == "event: stats_ready\ndata: {}\n\n"